@@ -0,0 +1,77 @@
+"""
+Admin API Router
+Operational endpoints for a running worker (profiling)
+
+All endpoints require the ``X-Admin-Token`` header to match ADMIN_TOKEN;
+when ADMIN_TOKEN is unset the admin API is disabled. Each request is
+served by one worker, so a profile covers only the worker that received it.
+"""
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from typing import Any, Dict, List, Optional
+import asyncio
+import os
+import secrets
+
+from middleware.profiler import ProfileBusy, profiler
+
+router = APIRouter()
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Reject requests without the configured admin token"""
+    token = os.getenv("ADMIN_TOKEN", "")
+    if not token:
+        raise HTTPException(status_code=403, detail="Admin API is disabled")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+def _collapsed_response(profile) -> PlainTextResponse:
+    return PlainTextResponse(profile.collapsed(), headers={
+        "X-Profile-Id": str(profile.profile_id),
+        "X-Profile-Samples": str(profile.samples),
+    })
+
+
+@router.post("/profile", dependencies=[Depends(require_admin)])
+async def run_profile(
+    seconds: float = Query(10.0, gt=0, le=120),
+    interval_ms: float = Query(5.0, ge=1, le=1000),
+    include_idle: bool = False,
+    wait: bool = True
+):
+    """
+    Sample this worker's stacks for ``seconds``
+
+    - **seconds**: Profile length
+    - **interval_ms**: Sampling interval
+    - **include_idle**: Keep samples of threads that are only waiting
+    - **wait**: Return the collapsed stacks when done; otherwise return the
+      profile id immediately and fetch it later from ``/profiles/{id}``
+
+    The response is collapsed-stack text, ready for flamegraph.pl or speedscope.
+    """
+    try:
+        profile = profiler.start(seconds, interval_ms / 1000, include_idle)
+    except ProfileBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if not wait:
+        return {"profile_id": profile.profile_id, "status": "running"}
+    await asyncio.to_thread(profile.done.wait)
+    return _collapsed_response(profile)
+
+
+@router.get("/profiles", response_model=List[Dict[str, Any]], dependencies=[Depends(require_admin)])
+async def list_profiles():
+    """Finished profiles on this worker, newest first (manual and slow-request triggered)"""
+    return profiler.list()
+
+
+@router.get("/profiles/{profile_id}", dependencies=[Depends(require_admin)])
+async def get_profile(profile_id: int):
+    """Collapsed stacks of a finished profile"""
+    profile = profiler.get(profile_id)
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return _collapsed_response(profile)
@@ -2,16 +2,36 @@
 Article Management API Router
 Provides REST endpoints for article CRUD operations and version control
 """
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Header, HTTPException, Query, Response
 from typing import List, Optional
+from api.conditional import etag_matches, if_match_etags
+from api.responses import FastJSONResponse
 from models.article import (
-    Article, ArticleCreate, ArticleUpdate, 
-    ArticleStatus, ArticleVersion, ArticleResponse
+    Article, ArticleCreate, ArticleUpdate, ArticlePatch,
+    ArticleStatus, ArticleVersion, ArticleResponse, ArticleSearchResults, TextMetrics,
+    DiffGranularity, VersionDiff
 )
-from services.article_service import article_service
+from services.article_service import (
+    article_service, article_etag, diff_etag, history_etag, version_etag,
+    PreconditionFailed, ARTICLE_CACHE_CONTROL, VERSION_CACHE_CONTROL
+)
+from services.text_ops import EditConflict, EditError
 
 router = APIRouter()
 
+# Fields of the list summary, read straight off stored articles
+_SUMMARY_FIELDS = tuple(ArticleResponse.model_fields)
+
+
+def _written(article: Article) -> FastJSONResponse:
+    """A written article with the ETag to send as If-Match on the next write"""
+    headers = {"ETag": article_etag(article), "Cache-Control": ARTICLE_CACHE_CONTROL}
+    return FastJSONResponse(article, headers=headers)
+
+
+def _precondition_failed(e: PreconditionFailed) -> HTTPException:
+    return HTTPException(status_code=412, detail=str(e), headers={"ETag": e.etag})
+
 
 @router.post("/", response_model=Article, status_code=201)
 async def create_article(article_data: ArticleCreate, author: str = "default_user"):
@@ -44,49 +64,118 @@ async def list_articles(
     - **limit**: Maximum number of articles to return
     """
     articles = await article_service.list_articles(status, skip, limit)
-    return [
-        ArticleResponse(
-            article_id=a.article_id,
-            title=a.title,
-            status=a.status,
-            current_version=a.current_version,
-            created_at=a.created_at,
-            updated_at=a.updated_at
-        )
+    return FastJSONResponse([
+        {field: getattr(a, field) for field in _SUMMARY_FIELDS}
         for a in articles
-    ]
+    ])
+
+
+@router.get("/search", response_model=ArticleSearchResults)
+async def search_articles(
+    q: str = Query(..., min_length=1, max_length=500),
+    status: Optional[ArticleStatus] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100)
+):
+    """
+    Ranked full-text search over article titles and content
+    
+    - **q**: Words to match (all of them); `or` separates alternatives,
+      `-word` excludes
+    - **status**: Filter by article status
+    - **skip** / **limit**: Pagination
+    
+    Each hit carries a snippet with matches wrapped in `<b></b>`.
+    """
+    results = await article_service.search_articles(q, status, limit, skip)
+    return FastJSONResponse(results)
 
 
 @router.get("/{article_id}", response_model=Article)
-async def get_article(article_id: str):
+async def get_article(article_id: str, if_none_match: Optional[str] = Header(None)):
     """
     Get a specific article by ID
     
-    Returns the complete article including all versions
+    Returns the complete article including all versions. The ETag changes
+    with every update; If-None-Match requests for an unchanged article get
+    304 Not Modified without the article content being loaded.
     """
+    summary = await article_service.get_article_summary(article_id)
+    if not summary:
+        raise HTTPException(status_code=404, detail="Article not found")
+    headers = {"ETag": article_etag(summary), "Cache-Control": ARTICLE_CACHE_CONTROL}
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    
     article = await article_service.get_article(article_id)
     if not article:
         raise HTTPException(status_code=404, detail="Article not found")
-    return article
+    # The article may have changed since the summary was read
+    headers["ETag"] = article_etag(article)
+    return FastJSONResponse(article, headers=headers)
 
 
 @router.put("/{article_id}", response_model=Article)
 async def update_article(
     article_id: str, 
     update_data: ArticleUpdate,
-    author: str = "default_user"
+    author: str = "default_user",
+    if_match: Optional[str] = Header(None)
 ):
     """
     Update an article
     
     NOTE: In production, replace the 'author' parameter with proper authentication.
     
-    If content is updated, a new version is automatically created
+    If content is updated, a new version is automatically created.
+    With ``expected_version`` in the body or an If-Match ETag, the update is
+    rejected with 412 Precondition Failed if the article changed meanwhile.
+    Content changes while another author's autosave is pending need If-Match
+    (409 Conflict otherwise).
     """
-    article = await article_service.update_article(article_id, update_data, author)
+    try:
+        article = await article_service.update_article(
+            article_id, update_data, author, if_match_etags(if_match)
+        )
+    except PreconditionFailed as e:
+        raise _precondition_failed(e)
+    except EditConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
     if not article:
         raise HTTPException(status_code=404, detail="Article not found")
-    return article
+    return _written(article)
+
+
+@router.patch("/{article_id}", response_model=Article)
+async def patch_article(
+    article_id: str,
+    patch: ArticlePatch,
+    author: str = "default_user",
+    if_match: Optional[str] = Header(None)
+):
+    """
+    Update article content with edit operations instead of the full text
+    
+    - **base_version**: Version the edits were made against
+    - **operations**: insert/delete/replace/set operations, applied in order
+    - **patch**: Alternatively, a unified diff against base_version
+    - **rebase**: Merge onto newer versions (default) or reject with 409
+    
+    Edits that overlap changes made since base_version are rejected with
+    409 Conflict; edits that do not apply to it with 422. An If-Match ETag
+    that is no longer current is rejected with 412.
+    """
+    try:
+        article = await article_service.patch_article(article_id, patch, author, if_match_etags(if_match))
+    except PreconditionFailed as e:
+        raise _precondition_failed(e)
+    except EditConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except EditError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if not article:
+        raise HTTPException(status_code=404, detail="Article or base version not found")
+    return _written(article)
 
 
 @router.delete("/{article_id}", status_code=204)
@@ -98,45 +187,141 @@ async def delete_article(article_id: str):
 
 
 @router.get("/{article_id}/versions", response_model=List[ArticleVersion])
-async def get_version_history(article_id: str):
+async def get_version_history(article_id: str, if_none_match: Optional[str] = Header(None)):
     """
     Get complete version history of an article
     
-    Returns all versions with their content and metadata
+    Returns all versions with their content and metadata. The ETag only
+    changes when a version is added.
     """
+    summary = await article_service.get_article_summary(article_id)
+    if not summary:
+        raise HTTPException(status_code=404, detail="Article not found")
+    headers = {"ETag": history_etag(article_id, summary.current_version), "Cache-Control": ARTICLE_CACHE_CONTROL}
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    
     versions = await article_service.get_version_history(article_id)
     if versions is None:
         raise HTTPException(status_code=404, detail="Article not found")
-    return versions
+    headers["ETag"] = history_etag(article_id, len(versions))
+    return FastJSONResponse(versions, headers=headers)
 
 
 @router.get("/{article_id}/versions/{version_number}", response_model=ArticleVersion)
-async def get_article_version(article_id: str, version_number: int):
-    """Get a specific version of an article"""
+async def get_article_version(
+    article_id: str,
+    version_number: int,
+    if_none_match: Optional[str] = Header(None)
+):
+    """
+    Get a specific version of an article
+    
+    Versions are immutable: responses carry a permanent ETag and
+    ``Cache-Control: immutable``, and revalidation never loads content.
+    """
+    summary = await article_service.get_article_summary(article_id)
+    # Version numbers run 1..current_version without gaps
+    if not summary or not 1 <= version_number <= summary.current_version:
+        raise HTTPException(
+            status_code=404, 
+            detail="Article or version not found"
+        )
+    headers = {"ETag": version_etag(article_id, version_number), "Cache-Control": VERSION_CACHE_CONTROL}
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    
     version = await article_service.get_article_version(article_id, version_number)
     if not version:
         raise HTTPException(
             status_code=404, 
             detail="Article or version not found"
         )
-    return version
+    return FastJSONResponse(version, headers=headers)
+
+
+@router.get("/{article_id}/versions/{from_version}/diff/{to_version}", response_model=VersionDiff)
+async def diff_versions(
+    article_id: str,
+    from_version: int,
+    to_version: int,
+    granularity: DiffGranularity = DiffGranularity.LINE,
+    context: int = Query(3, ge=0, le=20),
+    if_none_match: Optional[str] = Header(None)
+):
+    """
+    Changes between two versions
+    
+    - **granularity**: ``line`` returns unified-style hunks, ``word`` returns
+      replacements at character offsets
+    - **context**: Unchanged lines around each hunk (line granularity)
+    
+    Both versions are immutable, so the diff is cached server-side and
+    served with a permanent ETag and ``Cache-Control: immutable``.
+    """
+    summary = await article_service.get_article_summary(article_id)
+    if not summary or not (
+        1 <= from_version <= summary.current_version and 1 <= to_version <= summary.current_version
+    ):
+        raise HTTPException(
+            status_code=404, 
+            detail="Article or version not found"
+        )
+    headers = {
+        "ETag": diff_etag(article_id, from_version, to_version, granularity.value, context),
+        "Cache-Control": VERSION_CACHE_CONTROL
+    }
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    
+    diff = await article_service.diff_versions(article_id, from_version, to_version, granularity, context)
+    if not diff:
+        raise HTTPException(
+            status_code=404, 
+            detail="Article or version not found"
+        )
+    return FastJSONResponse(diff, headers=headers)
+
+
+@router.get("/{article_id}/versions/{version_number}/metrics", response_model=TextMetrics)
+async def get_version_metrics(article_id: str, version_number: int):
+    """
+    Get readability and style metrics for a version
+    
+    Metrics are computed when the version is written, so this is a lookup.
+    """
+    metrics = await article_service.get_version_metrics(article_id, version_number)
+    if metrics is None:
+        raise HTTPException(
+            status_code=404, 
+            detail="Article or version not found"
+        )
+    return metrics
 
 
 @router.post("/{article_id}/revert/{version_number}", response_model=Article)
 async def revert_to_version(
     article_id: str, 
     version_number: int,
-    author: str = "default_user"
+    author: str = "default_user",
+    expected_version: Optional[int] = None,
+    if_match: Optional[str] = Header(None)
 ):
     """
     Revert article to a previous version
     
-    Creates a new version with the content from the specified version
+    Creates a new version with the content from the specified version.
+    ``expected_version`` and If-Match work as for updates.
     """
-    article = await article_service.revert_to_version(article_id, version_number, author)
+    try:
+        article = await article_service.revert_to_version(
+            article_id, version_number, author, expected_version, if_match_etags(if_match)
+        )
+    except PreconditionFailed as e:
+        raise _precondition_failed(e)
     if not article:
         raise HTTPException(
             status_code=404, 
             detail="Article or version not found"
         )
-    return article
+    return _written(article)
@@ -0,0 +1,40 @@
+"""
+Conditional Requests
+ETag / If-None-Match / If-Match helpers shared by routers
+"""
+from typing import List, Optional
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Whether an If-None-Match header matches ``etag``
+
+    Uses the weak comparison RFC 9110 prescribes for If-None-Match, so
+    ``W/"x"`` matches ``"x"``; ``*`` matches any current representation.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def if_match_etags(if_match: Optional[str]) -> Optional[List[str]]:
+    """
+    ETags an If-Match header accepts, or None without the header
+
+    ``*`` gives ``["*"]``, which matches whenever the resource exists.
+    If-Match uses strong comparison, so weak tags are dropped: a header
+    listing only weak tags matches nothing.
+    """
+    if not if_match:
+        return None
+    if if_match.strip() == "*":
+        return ["*"]
+    return [tag for tag in (t.strip() for t in if_match.split(",")) if tag and not tag.startswith("W/")]
@@ -2,10 +2,18 @@
 Academic Editor API Router
 Provides endpoints for grammar checking, formatting, and LaTeX support
 """
-from fastapi import APIRouter, HTTPException
-from typing import List, Dict, Any
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, Header, Query, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from typing import List, Dict, Any, Optional
+from pydantic import BaseModel, ValidationError
+import asyncio
+from api.conditional import etag_matches
 from services.editor_service import editor_service, Suggestion, FormattingRule
+from models.article import EditOperation
+from services.live_session import live_sessions
+from services.template_registry import template_registry, RULES_CACHE_CONTROL
+from services.article_service import article_service
+from services.text_ops import EditError
 
 router = APIRouter()
 
@@ -21,11 +29,20 @@ class ParagraphRequest(BaseModel):
     paragraph: str
 
 
+class CitationValidationRequest(BaseModel):
+    """Request model for citation validation"""
+    text: str = ""
+    references: Optional[List[str]] = None
+    article_id: Optional[str] = None
+
+
 class ConversionRequest(BaseModel):
     """Request model for format conversion"""
-    text: str
+    text: str = ""
     from_format: str = "plain"
     to_format: str = "latex"
+    template: Optional[str] = None
+    article_id: Optional[str] = None
 
 
 @router.post("/check/grammar", response_model=List[Suggestion])
@@ -52,13 +69,39 @@ async def check_formatting(request: TextCheckRequest):
 
 
 @router.post("/convert/latex", response_model=Dict[str, str])
-async def convert_to_latex(request: ConversionRequest):
+async def convert_to_latex(request: ConversionRequest, stream: bool = Query(False)):
     """
-    Convert plain text to LaTeX format
+    Convert plain text or Markdown to LaTeX format
     
-    Returns the LaTeX formatted version of the text
+    Returns the LaTeX formatted version of the text.
+    
+    - **template**: Academic template (IEEEtran, elsarticle, acmart, ...)
+    - **article_id**: Export a stored article as a full manuscript, including
+      title, authors, abstract, keywords and references; ``text`` is ignored
+    - **stream**: Stream the raw LaTeX document back as a chunked
+      ``application/x-latex`` response instead of a JSON object
     """
-    latex = await editor_service.convert_to_latex(request.text)
+    if request.template is not None and template_registry.get(request.template) is None:
+        raise HTTPException(status_code=404, detail=f"Unknown template: {request.template}")
+    
+    if request.article_id:
+        article = await article_service.get_article(request.article_id)
+        if not article:
+            raise HTTPException(status_code=404, detail="Article not found")
+        if stream:
+            return StreamingResponse(
+                editor_service.iter_article_latex(article, request.template),
+                media_type="application/x-latex"
+            )
+        latex = await editor_service.convert_article_to_latex(article, request.template)
+        return {"latex": latex}
+    
+    if stream:
+        return StreamingResponse(
+            editor_service.iter_latex(request.text, request.template),
+            media_type="application/x-latex"
+        )
+    latex = await editor_service.convert_to_latex(request.text, request.template)
     return {"latex": latex}
 
 
@@ -74,27 +117,126 @@ async def suggest_improvements(request: ParagraphRequest):
 
 
 @router.get("/templates/{template}/rules", response_model=List[FormattingRule])
-async def get_formatting_rules(template: str):
+async def get_formatting_rules(template: str, if_none_match: Optional[str] = Header(None)):
     """
     Get formatting rules for a specific academic template
     
     - **template**: Template name (IEEE, Elsevier, ACM, etc.)
+    
+    Served from pre-serialized bytes with an ETag; repeat requests
+    carrying If-None-Match receive 304 Not Modified.
     """
-    rules = await editor_service.get_formatting_rules(template)
-    if not rules:
+    spec = template_registry.get(template)
+    if spec is None or not spec.rules:
         raise HTTPException(
             status_code=404, 
             detail=f"No formatting rules found for template: {template}"
         )
-    return rules
+    headers = {"ETag": spec.rules_etag, "Cache-Control": RULES_CACHE_CONTROL}
+    if etag_matches(if_none_match, spec.rules_etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=spec.rules_json, media_type="application/json", headers=headers)
 
 
 @router.post("/validate/citations", response_model=Dict[str, Any])
-async def validate_citations(request: TextCheckRequest):
+async def validate_citations(request: CitationValidationRequest):
     """
     Validate citation formatting
     
     Checks for proper citation format and consistency
+    
+    - **text**: Text to scan
+    - **references**: Reference list to cross-check against
+    - **article_id**: Validate a stored article's content against its references
     """
-    validation = await editor_service.validate_citations(request.text)
+    text, references = request.text, request.references
+    if request.article_id:
+        article = await article_service.get_article(request.article_id)
+        if not article:
+            raise HTTPException(status_code=404, detail="Article not found")
+        text = article.content
+        if references is None:
+            references = article.references
+    validation = await editor_service.validate_citations(text, references)
     return validation
+
+
+@router.websocket("/live")
+async def live_editing(websocket: WebSocket, template: str = "Generic"):
+    """
+    Live editing channel
+    
+    The server keeps the document and pushes suggestion diffs as it changes.
+    
+    Client messages:
+    - ``{"type": "edit", "ops": [{"op": "insert", "position": 0, "text": "..."}]}``
+      (ops: insert, delete, replace, set)
+    - ``{"type": "template", "template": "ACM"}``
+    - ``{"type": "ping"}``
+    
+    Server messages:
+    - ``{"type": "ready", "session_id": ..., "version": 0}``
+    - ``{"type": "suggestions", "version": n, "added": [...], "removed": [...]}``
+    - ``{"type": "error", "detail": ...}``
+    - ``{"type": "pong"}``
+    
+    Suggestions not listed as removed stay valid; their positions move with
+    the client's own edits. Idle connections are closed after
+    LIVE_IDLE_TIMEOUT seconds.
+    """
+    spec = template_registry.get(template)
+    await websocket.accept()
+    if spec is None:
+        await websocket.close(code=1008, reason=f"Unknown template: {template}")
+        return
+    
+    session = live_sessions.open(spec.name)
+    await websocket.send_json({"type": "ready", "session_id": session.session_id, "version": session.version})
+    try:
+        while True:
+            try:
+                message = await asyncio.wait_for(websocket.receive_json(), live_sessions.idle_timeout)
+            except asyncio.TimeoutError:
+                await websocket.close(code=1001, reason="Idle timeout")
+                return
+            except (ValueError, KeyError):
+                # Not JSON, or a binary frame; the frame is consumed, keep the session
+                await websocket.send_json({"type": "error", "detail": "Messages must be JSON text frames"})
+                continue
+            if live_sessions.get(session.session_id) is None:
+                # Evicted to make room for newer sessions
+                await websocket.close(code=1013, reason="Session evicted")
+                return
+            
+            kind = message.get("type") if isinstance(message, dict) else None
+            if kind == "ping":
+                await websocket.send_json({"type": "pong"})
+                continue
+            if kind == "template":
+                spec = template_registry.get(str(message.get("template")))
+                if spec is None:
+                    await websocket.send_json({"type": "error", "detail": f"Unknown template: {message.get('template')}"})
+                    continue
+                session.template = spec.name
+            elif kind == "edit":
+                try:
+                    operations = [EditOperation(**op) for op in message.get("ops", [])]
+                    session.apply(operations)
+                except (ValidationError, TypeError, EditError) as e:
+                    await websocket.send_json({"type": "error", "detail": str(e), "version": session.version})
+                    continue
+            else:
+                await websocket.send_json({"type": "error", "detail": f"Unknown message type: {kind}"})
+                continue
+            
+            added, removed = await session.check()
+            await websocket.send_json({
+                "type": "suggestions",
+                "version": session.version,
+                "added": [s.model_dump(mode="json") for s in added],
+                "removed": [s.model_dump(mode="json") for s in removed],
+            })
+    except WebSocketDisconnect:
+        pass
+    finally:
+        live_sessions.close(session.session_id)
@@ -2,15 +2,23 @@
 Recommendation API Router
 Provides endpoints for AI-powered literature recommendations and language optimization
 """
-from fastapi import APIRouter, Query
-from typing import List, Dict, Optional, Any
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, List, Dict, Optional, Any
 from pydantic import BaseModel
+import json
+
+from api.responses import FastJSONResponse
+from middleware.metrics import stage
+from services.article_service import article_service
 from services.recommendation_service import (
     recommendation_service, 
     Paper, 
     LanguageOptimization,
     RecommendationType
 )
+from services.citation_formatter import CitationStyle
+from services.phrase_rewriter import BASE_DISCIPLINE, available_disciplines
 
 router = APIRouter()
 
@@ -31,11 +39,25 @@ class RecommendationRequest(BaseModel):
 class SentenceOptimizationRequest(BaseModel):
     """Request model for sentence optimization"""
     sentence: str
+    discipline: str = BASE_DISCIPLINE
 
 
 class ParagraphOptimizationRequest(BaseModel):
     """Request model for paragraph optimization"""
     paragraph: str
+    discipline: str = BASE_DISCIPLINE
+
+
+class DocumentOptimizationRequest(BaseModel):
+    """Request model for whole-document optimization"""
+    text: str = ""
+    article_id: Optional[str] = None
+    discipline: str = BASE_DISCIPLINE
+
+
+def _check_discipline(discipline: str):
+    if discipline not in available_disciplines():
+        raise HTTPException(status_code=404, detail=f"Unknown discipline: {discipline}")
 
 
 class CitationRequest(BaseModel):
@@ -43,6 +65,13 @@ class CitationRequest(BaseModel):
     topic: str
 
 
+class BibliographyRequest(BaseModel):
+    """Request model for bulk bibliography export"""
+    paper_ids: List[str] = []
+    dois: List[str] = []
+    style: CitationStyle = CitationStyle.IEEE
+
+
 @router.post("/search", response_model=List[Paper])
 async def search_papers(request: SearchRequest):
     """
@@ -57,7 +86,8 @@ async def search_papers(request: SearchRequest):
         request.limit,
         request.recommendation_type
     )
-    return papers
+    with stage("recommendation", "search_papers", "serialization"):
+        return FastJSONResponse(papers)
 
 
 @router.post("/recommend", response_model=List[Paper])
@@ -83,8 +113,11 @@ async def optimize_sentence(request: SentenceOptimizationRequest):
     Optimize a sentence for academic writing
     
     Provides more formal phrasing and improved clarity
+    
+    - **discipline**: Phrase table (general, computer_science, biomedical, ...)
     """
-    optimization = await recommendation_service.optimize_sentence(request.sentence)
+    _check_discipline(request.discipline)
+    optimization = await recommendation_service.optimize_sentence(request.sentence, request.discipline)
     return optimization
 
 
@@ -98,10 +131,60 @@ async def optimize_paragraph(request: ParagraphOptimizationRequest):
     - Sentence-level improvements
     - Formality and clarity scores
     """
-    result = await recommendation_service.optimize_paragraph(request.paragraph)
+    _check_discipline(request.discipline)
+    result = await recommendation_service.optimize_paragraph(request.paragraph, request.discipline)
     return result
 
 
+async def _ndjson(events: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+    async for event in events:
+        yield json.dumps(event) + "\n"
+
+
+async def _sse(events: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+    async for event in events:
+        yield f"event: {event['event']}\ndata: {json.dumps(event)}\n\n"
+
+
+@router.post("/optimize/document")
+async def optimize_document(
+    request: DocumentOptimizationRequest,
+    format: str = Query("ndjson", pattern="^(ndjson|sse)$")
+):
+    """
+    Optimize a whole document, streaming one result per paragraph
+    
+    Paragraphs (separated by blank lines) are processed concurrently and each
+    result is sent as soon as it is ready, tagged with its ``index``; the
+    stream ends with a ``done`` event carrying document-level scores.
+    
+    - **text**: Full document text
+    - **article_id**: Optimize a stored article's content; ``text`` is ignored
+    - **discipline**: Phrase table (general, computer_science, biomedical, ...)
+    - **format**: ``ndjson`` (application/x-ndjson) or ``sse`` (text/event-stream)
+    """
+    _check_discipline(request.discipline)
+    text = request.text
+    if request.article_id:
+        article = await article_service.get_article(request.article_id)
+        if not article:
+            raise HTTPException(status_code=404, detail="Article not found")
+        text = article.content
+    
+    events = recommendation_service.optimize_document(text, request.discipline)
+    if format == "sse":
+        return StreamingResponse(
+            _sse(events),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+    return StreamingResponse(
+        _ndjson(events),
+        media_type="application/x-ndjson",
+        headers={"X-Accel-Buffering": "no"}
+    )
+
+
 @router.post("/citations", response_model=List[str])
 async def get_citation_suggestions(request: CitationRequest):
     """
@@ -113,6 +196,22 @@ async def get_citation_suggestions(request: CitationRequest):
     return citations
 
 
+@router.post("/bibliography", response_model=Dict[str, Any])
+async def format_bibliography(request: BibliographyRequest):
+    """
+    Format a bibliography for many papers at once
+    
+    - **paper_ids**: Paper IDs to include
+    - **dois**: DOIs to include
+    - **style**: IEEE, APA, ACM, Nature or BibTeX
+    """
+    return await recommendation_service.format_bibliography(
+        request.paper_ids,
+        request.dois,
+        request.style
+    )
+
+
 @router.get("/papers/high-impact", response_model=List[Paper])
 async def get_high_impact_papers(
     field: Optional[str] = None,
@@ -0,0 +1,37 @@
+"""
+Fast JSON Responses
+Serialize service data straight to bytes with orjson
+
+Returning a ``FastJSONResponse`` from a route bypasses FastAPI's
+``response_model`` handling, which re-validates every model and walks the
+result through ``jsonable_encoder`` before ``json.dumps``. Service data is
+already validated, so it is encoded as-is: orjson serializes dicts, lists,
+datetimes and enums natively and reads pydantic models through their
+field ``__dict__``. Output is byte-identical to ``model_dump_json``.
+
+Keep ``response_model`` on the route for the OpenAPI schema. Models with
+aliases, computed fields or custom serializers must not use this path.
+"""
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+import orjson
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.__dict__
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode validated service data to JSON bytes"""
+    return orjson.dumps(content, default=_default)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson, without response_model re-validation"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
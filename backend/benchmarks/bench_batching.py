@@ -0,0 +1,77 @@
+"""
+Micro-batching Benchmark
+Compares per-request and micro-batched inference on a CPU-only dummy model
+
+Usage:
+    python -m benchmarks.bench_batching --requests 2000 --batch-size 32 --latency-ms 5
+"""
+import argparse
+import asyncio
+import time
+
+import numpy as np
+
+from middleware.batching import MicroBatcher
+
+
+class DummyEmbeddingModel:
+    """
+    CPU-only stand-in for a sentence embedding model
+
+    Each forward pass has a fixed overhead plus a matrix multiply over the
+    whole batch, which is the cost profile that makes batching worthwhile.
+    """
+
+    def __init__(self, dim: int = 384, vocab: int = 4096, overhead_ms: float = 2.0, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        self.dim = dim
+        self.vocab = vocab
+        self.overhead = overhead_ms / 1000.0
+        self.weights = rng.standard_normal((vocab, dim)).astype(np.float32)
+
+    def encode(self, texts):
+        time.sleep(self.overhead)
+        counts = np.zeros((len(texts), self.vocab), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in text.split():
+                counts[row, hash(token) % self.vocab] += 1.0
+        vectors = counts @ self.weights
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return list(vectors / np.maximum(norms, 1e-9))
+
+
+async def run(total: int, batch_size: int, latency_ms: float):
+    model = DummyEmbeddingModel()
+    texts = [f"sample sentence number {i} about neural networks" for i in range(total)]
+
+    # Baseline: one forward pass per request
+    unbatched = MicroBatcher(model.encode, max_batch_size=1, name="unbatched")
+    started = time.perf_counter()
+    await asyncio.gather(*(unbatched.submit(t) for t in texts))
+    baseline = time.perf_counter() - started
+    await unbatched.close()
+
+    batcher = MicroBatcher(model.encode, max_batch_size=batch_size, max_latency_ms=latency_ms, name="batched")
+    started = time.perf_counter()
+    results = await asyncio.gather(*(batcher.submit(t) for t in texts))
+    batched = time.perf_counter() - started
+    await batcher.close()
+
+    expected = model.encode(texts[:1])[0]
+    assert np.allclose(results[0], expected), "batched output differs from direct call"
+
+    print(f"requests:          {total}")
+    print(f"unbatched:         {baseline:.3f}s ({total / baseline:.0f} req/s)")
+    print(f"batched:           {batched:.3f}s ({total / batched:.0f} req/s)")
+    print(f"speedup:           {baseline / batched:.1f}x")
+    for key, value in batcher.stats.as_dict().items():
+        print(f"{key + ':':<19}{value:.2f}" if isinstance(value, float) else f"{key + ':':<19}{value}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Micro-batching benchmark")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.batch_size, args.latency_ms))
@@ -0,0 +1,54 @@
+"""
+LLM Client Throughput Benchmark
+Drives LLMClient against the local stub server, no network access required
+
+Usage:
+    python -m benchmarks.bench_llm_client --requests 500 --unique 100 --concurrency 8
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.llm_stub_server import start_stub_server
+from middleware.llm_client import LLMClient, ProviderConfig
+
+
+async def run(total: int, unique: int, concurrency: int, latency: float, error_rate: float):
+    """Fire ``total`` prompts drawn from ``unique`` distinct texts"""
+    runner, base_url = await start_stub_server(latency=latency, error_rate=error_rate)
+    client = LLMClient(backoff_base=0.01)
+    client.register_provider(ProviderConfig(
+        name="openai",
+        base_url=base_url,
+        max_concurrency=concurrency
+    ))
+
+    try:
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *(client.complete(f"prompt {i % unique}") for i in range(total)),
+            return_exceptions=True
+        )
+        elapsed = time.perf_counter() - started
+    finally:
+        await client.close()
+        await runner.cleanup()
+
+    failures = sum(1 for r in results if isinstance(r, Exception))
+    print(f"requests:        {total}")
+    print(f"elapsed:         {elapsed:.3f}s")
+    print(f"throughput:      {total / elapsed:.1f} req/s")
+    print(f"failures:        {failures}")
+    for key, value in client.stats.items():
+        print(f"{key + ':':<17}{value}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="LLM client throughput benchmark")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--unique", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.unique, args.concurrency, args.latency, args.error_rate))
@@ -0,0 +1,96 @@
+"""
+Response Serialization Benchmarks
+Standard ``response_model`` path versus the orjson fast path on large payloads
+
+``standard`` reproduces what FastAPI does when a route returns models and
+declares ``response_model``: validate against the response field, run
+``jsonable_encoder`` and render with ``JSONResponse``. ``fast`` is the
+``FastJSONResponse`` path the article routes now use.
+
+Usage:
+    python -m benchmarks.bench_responses --items 1000 --repeat 20
+"""
+from typing import Any, Callable, Dict, List
+import argparse
+import asyncio
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from api.responses import FastJSONResponse
+from benchmarks import corpus
+from benchmarks.bench_services import measure
+from benchmarks.report import print_table
+from middleware.cpu_executor import cpu_executor
+from models.article import ArticleCreate, ArticleResponse, ArticleUpdate, ArticleVersion
+from services.article_service import ArticleService
+
+
+async def _standard(response_type: Any, content: Any) -> bytes:
+    field = create_response_field(name="response", type_=response_type, mode="serialization")
+    return JSONResponse(await serialize_response(field=field, response_content=content)).body
+
+
+def _paths(response_type: Any, content: Callable[[], Any], fast: Callable[[], Any]) -> Dict[str, Callable]:
+    async def standard(i):
+        return await _standard(response_type, content())
+
+    async def fast_path(i):
+        return FastJSONResponse(fast()).body
+
+    return {"standard": standard, "fast": fast_path}
+
+
+async def _build(items: int):
+    service = ArticleService()
+    text = corpus.document(corpus.SIZES["small"], seed=1)
+    for i in range(items):
+        await service.create_article(ArticleCreate(title=f"Article {i}", content=text), "bench")
+    article = next(iter(service.articles.values()))
+    for i in range(items - 1):
+        await service.update_article(article.article_id, ArticleUpdate(content=f"{text} Revision {i}."), "bench")
+    return service, article.article_id
+
+
+async def run(items: int = 1000, repeat: int = 20) -> Dict[str, Dict[str, float]]:
+    """Results keyed ``"<payload>/<path>[<items>]"``"""
+    service, article_id = await _build(items)
+    articles = await service.list_articles(limit=items)
+    versions = await service.get_version_history(article_id)
+    summary_fields = tuple(ArticleResponse.model_fields)
+
+    cases = {
+        "list_articles": _paths(
+            List[ArticleResponse],
+            # The old route built an ArticleResponse per article before validation
+            lambda: [ArticleResponse(**{f: getattr(a, f) for f in summary_fields}) for a in articles],
+            lambda: [{f: getattr(a, f) for f in summary_fields} for a in articles],
+        ),
+        "version_history": _paths(List[ArticleVersion], lambda: versions, lambda: versions),
+    }
+
+    results = {}
+    for payload, paths in cases.items():
+        # Both paths must produce the same bytes for the comparison to mean anything
+        assert await paths["standard"](0) == await paths["fast"](0), payload
+        for path, case in paths.items():
+            results[f"{payload}/{path}[{items}]"] = await measure(case, repeat)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Response serialization benchmarks")
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    try:
+        results = asyncio.run(run(args.items, args.repeat))
+    finally:
+        cpu_executor.shutdown()
+    print_table("case", results, ("p50_ms", "p95_ms", "p99_ms", "ops_per_s"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Service Micro-benchmarks
+Times each service method on generated corpora of increasing size
+
+Usage:
+    python -m benchmarks.bench_services --sizes small,medium,large --repeat 20
+"""
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+import argparse
+import asyncio
+import time
+
+from benchmarks import corpus
+from benchmarks.report import print_table, summarize
+from middleware.ai_middleware import AIMiddleware
+from middleware.cpu_executor import cpu_executor
+from models.article import ArticleCreate, ArticleUpdate
+from services.article_service import ArticleService
+from services.citation_formatter import CitationStyle
+from services.editor_service import EditorService
+from services.recommendation_service import RecommendationService
+
+
+Case = Tuple[str, Callable[[int], Awaitable]]
+
+
+async def measure(case: Callable[[int], Awaitable], repeat: int, warmup: int = 2) -> Dict[str, float]:
+    """Run ``case(i)`` sequentially and summarize per-call latency"""
+    for i in range(warmup):
+        await case(-1 - i)
+    latencies = []
+    started = time.perf_counter()
+    for i in range(repeat):
+        call_started = time.perf_counter()
+        await case(i)
+        latencies.append(time.perf_counter() - call_started)
+    summary = summarize(latencies, time.perf_counter() - started)
+    summary["ops_per_s"] = summary.pop("rps")
+    return summary
+
+
+async def _drain(events):
+    async for _ in events:
+        pass
+
+
+def article_cases(text: str) -> List[Case]:
+    service = ArticleService()
+    created = []
+
+    async def create(i):
+        article = await service.create_article(
+            ArticleCreate(title=f"Benchmark {i}", content=text, template="IEEE"), "bench"
+        )
+        created.append(article.article_id)
+
+    async def update(i):
+        # Distinct content each call, so a new version (and its metrics) is written
+        await service.update_article(created[0], ArticleUpdate(content=f"{text} Revision {i}."), "bench")
+
+    async def list_articles(i):
+        await service.list_articles(limit=100)
+
+    async def history(i):
+        await service.get_version_history(created[0])
+
+    return [
+        ("article.create_article", create),
+        ("article.update_article", update),
+        ("article.list_articles", list_articles),
+        ("article.get_version_history", history),
+    ]
+
+
+def editor_cases(text: str) -> List[Case]:
+    service = EditorService()
+    references = corpus.references(6)
+    return [
+        ("editor.check_grammar", lambda i: service.check_grammar(text)),
+        ("editor.check_formatting", lambda i: service.check_formatting(text, "IEEE")),
+        ("editor.convert_to_latex", lambda i: service.convert_to_latex(text, "IEEE")),
+        ("editor.validate_citations", lambda i: service.validate_citations(text, references)),
+        ("editor.suggest_improvements", lambda i: service.suggest_improvements(text)),
+    ]
+
+
+def recommendation_cases(text: str) -> List[Case]:
+    service = RecommendationService()
+    paper_ids = [p.paper_id for p in service.papers_db]
+    # Query length scales with corpus size, as scoring cost does
+    query = " ".join(text.split()[:max(3, len(text) // 200)])
+    return [
+        ("recommendation.search_papers", lambda i: service.search_papers(query, 10)),
+        ("recommendation.optimize_paragraph", lambda i: service.optimize_paragraph(text)),
+        ("recommendation.optimize_document", lambda i: _drain(service.optimize_document(text))),
+        ("recommendation.format_bibliography",
+         lambda i: service.format_bibliography(paper_ids, [], CitationStyle.APA)),
+    ]
+
+
+def ai_cases(text: str) -> List[Case]:
+    ai = AIMiddleware()
+    return [
+        # Vary the text so metric memoization does not hide the compute cost
+        ("ai.analyze_semantic", lambda i: ai.analyze_semantic(f"{text} Run {i}.")),
+        ("ai.generate_abstract", lambda i: ai.generate_abstract(text)),
+        ("ai.optimize_language", lambda i: ai.optimize_language(text)),
+    ]
+
+
+SUITES = {
+    "article": article_cases,
+    "editor": editor_cases,
+    "recommendation": recommendation_cases,
+    "ai": ai_cases,
+}
+
+
+async def run(sizes: List[str], repeat: int, suites: Optional[List[str]] = None) -> Dict[str, Dict[str, float]]:
+    """Micro-benchmark results keyed ``"<service.method>[<size>]"``"""
+    results: Dict[str, Dict[str, float]] = {}
+    for size in sizes:
+        text = corpus.document(corpus.SIZES[size], seed=1)
+        for suite in suites or SUITES:
+            for name, case in SUITES[suite](text):
+                results[f"{name}[{size}]"] = await measure(case, repeat)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Service micro-benchmarks")
+    parser.add_argument("--sizes", default="small,medium,large")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--suites", default=",".join(SUITES))
+    args = parser.parse_args()
+
+    try:
+        results = asyncio.run(run(args.sizes.split(","), args.repeat, args.suites.split(",")))
+    finally:
+        cpu_executor.shutdown()
+    print_table("case", results, ("p50_ms", "p95_ms", "p99_ms", "ops_per_s"))
+
+
+if __name__ == "__main__":
+    main()
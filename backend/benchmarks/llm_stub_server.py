@@ -0,0 +1,82 @@
+"""
+LLM Stub Server
+Local OpenAI-compatible chat-completion endpoint for offline benchmarking
+
+Usage:
+    python -m benchmarks.llm_stub_server --port 8089 --latency 0.05
+    OPENAI_BASE_URL=http://127.0.0.1:8089/v1 uvicorn main:app
+"""
+import argparse
+import asyncio
+import random
+
+from aiohttp import web
+
+
+def create_app(latency: float = 0.05, error_rate: float = 0.0) -> web.Application:
+    """
+    Build the stub application
+
+    Args:
+        latency: Simulated upstream latency in seconds
+        error_rate: Fraction of requests answered with HTTP 503
+    """
+    stats = {"requests": 0, "errors": 0}
+
+    async def chat_completions(request: web.Request) -> web.Response:
+        body = await request.json()
+        stats["requests"] += 1
+        await asyncio.sleep(latency)
+        if error_rate and random.random() < error_rate:
+            stats["errors"] += 1
+            return web.json_response({"error": "stub overload"}, status=503)
+        prompt = body["messages"][-1]["content"]
+        return web.json_response({
+            "id": f"stub-{stats['requests']}",
+            "object": "chat.completion",
+            "model": body.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": prompt},
+                "finish_reason": "stop"
+            }]
+        })
+
+    async def get_stats(request: web.Request) -> web.Response:
+        return web.json_response(stats)
+
+    app = web.Application()
+    app["stats"] = stats
+    app.router.add_post("/v1/chat/completions", chat_completions)
+    app.router.add_get("/stats", get_stats)
+    return app
+
+
+async def start_stub_server(
+    host: str = "127.0.0.1",
+    port: int = 0,
+    latency: float = 0.05,
+    error_rate: float = 0.0
+):
+    """
+    Start the stub in the running event loop
+
+    Returns:
+        (runner, base_url) - call ``await runner.cleanup()`` to stop it
+    """
+    runner = web.AppRunner(create_app(latency, error_rate))
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    bound_port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://{host}:{bound_port}/v1"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="OpenAI-compatible stub server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    web.run_app(create_app(args.latency, args.error_rate), host=args.host, port=args.port)
@@ -0,0 +1,137 @@
+"""
+In-process Load Generator
+Drives the FastAPI app over ASGI at a target concurrency
+
+No server or network is involved: requests go through ``httpx.ASGITransport``
+straight into the application, so the numbers reflect routing, validation,
+service work and serialization only.
+
+Usage:
+    python -m benchmarks.load --concurrency 32 --requests 5000
+"""
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+import argparse
+import asyncio
+import random
+import time
+
+import httpx
+
+from benchmarks import corpus
+from benchmarks.report import print_table, summarize
+
+
+class Scenario(NamedTuple):
+    """One request shape in the traffic mix"""
+    name: str
+    method: str
+    path: str
+    body: Optional[Callable[[random.Random], Any]] = None
+    weight: int = 1
+
+
+def default_scenarios(article_ids: List[str]) -> List[Scenario]:
+    paragraph = corpus.paragraph(random.Random(2), 6)
+    page = corpus.document(corpus.SIZES["small"], seed=3)
+    return [
+        Scenario("GET /articles", "GET", "/api/articles/?limit=100", weight=3),
+        Scenario("GET /articles/{id}", "GET", "/api/articles/{article_id}", weight=4),
+        Scenario("GET /articles/{id}/versions", "GET", "/api/articles/{article_id}/versions", weight=2),
+        Scenario("POST /articles", "POST", "/api/articles/", lambda rng: {
+            "title": f"Load test {rng.random():.6f}", "content": page, "template": "IEEE"
+        }),
+        Scenario("POST /editor/check/grammar", "POST", "/api/editor/check/grammar",
+                 lambda rng: {"text": page}, weight=3),
+        Scenario("POST /editor/check/formatting", "POST", "/api/editor/check/formatting",
+                 lambda rng: {"text": page, "template": "IEEE"}, weight=2),
+        Scenario("POST /editor/convert/latex", "POST", "/api/editor/convert/latex",
+                 lambda rng: {"text": page, "template": "IEEE"}),
+        Scenario("POST /recommendations/search", "POST", "/api/recommendations/search",
+                 lambda rng: {"query": "neural networks attention", "limit": 10}, weight=2),
+        Scenario("POST /recommendations/optimize/paragraph", "POST", "/api/recommendations/optimize/paragraph",
+                 lambda rng: {"paragraph": paragraph}, weight=3),
+    ]
+
+
+async def _seed_articles(client: httpx.AsyncClient, count: int) -> List[str]:
+    ids = []
+    for i in range(count):
+        response = await client.post("/api/articles/", json={
+            "title": f"Seed article {i}",
+            "content": corpus.document(corpus.SIZES["small"], seed=100 + i),
+            "template": "IEEE",
+        })
+        response.raise_for_status()
+        ids.append(response.json()["article_id"])
+    return ids
+
+
+async def run_load(
+    app,
+    concurrency: int = 16,
+    total_requests: int = 2000,
+    seed_articles: int = 50,
+    scenarios: Optional[List[Scenario]] = None,
+    seed: int = 0
+) -> Dict[str, Dict[str, float]]:
+    """
+    Fire ``total_requests`` requests from ``concurrency`` workers
+
+    Returns latency summaries per scenario plus an ``overall`` entry.
+    Non-2xx responses are counted as errors and excluded from latencies.
+    """
+    transport = httpx.ASGITransport(app=app)
+    await app.router.startup()
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            article_ids = await _seed_articles(client, seed_articles)
+            scenarios = scenarios or default_scenarios(article_ids)
+            weights = [s.weight for s in scenarios]
+            latencies: Dict[str, List[float]] = {s.name: [] for s in scenarios}
+            errors: Dict[str, int] = {s.name: 0 for s in scenarios}
+            remaining = iter(range(total_requests))
+
+            async def worker(worker_id: int):
+                rng = random.Random(seed * 1000 + worker_id)
+                for _ in remaining:
+                    scenario = rng.choices(scenarios, weights)[0]
+                    path = scenario.path.format(article_id=rng.choice(article_ids))
+                    body = scenario.body(rng) if scenario.body else None
+                    started = time.perf_counter()
+                    response = await client.request(scenario.method, path, json=body)
+                    elapsed = time.perf_counter() - started
+                    if response.status_code < 400:
+                        latencies[scenario.name].append(elapsed)
+                    else:
+                        errors[scenario.name] += 1
+
+            started = time.perf_counter()
+            await asyncio.gather(*(worker(i) for i in range(concurrency)))
+            elapsed = time.perf_counter() - started
+    finally:
+        await app.router.shutdown()
+
+    results = {}
+    for scenario in scenarios:
+        results[scenario.name] = summarize(latencies[scenario.name], elapsed)
+        results[scenario.name]["errors"] = errors[scenario.name]
+    overall = [value for values in latencies.values() for value in values]
+    results["overall"] = summarize(overall, elapsed)
+    results["overall"]["errors"] = sum(errors.values())
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="In-process ASGI load generator")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--seed-articles", type=int, default=50)
+    args = parser.parse_args()
+
+    from main import app
+    results = asyncio.run(run_load(app, args.concurrency, args.requests, args.seed_articles))
+    print_table("scenario", results, ("p50_ms", "p95_ms", "p99_ms", "rps", "errors"))
+
+
+if __name__ == "__main__":
+    main()
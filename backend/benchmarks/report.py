@@ -0,0 +1,118 @@
+"""
+Benchmark Reporting
+Latency summaries, saved baselines and regression checks
+
+Results are nested dicts ``{group: {case: {metric: value}}}``. Metrics
+ending in ``_ms`` are lower-is-better; ``rps`` and ``ops_per_s`` are
+higher-is-better. Baselines are machine-specific: save and compare them on
+the same hardware.
+"""
+from typing import Dict, List, NamedTuple, Sequence
+from pathlib import Path
+import json
+import math
+import platform
+import time
+
+
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+DEFAULT_BASELINE = BASELINE_DIR / "baseline.json"
+
+HIGHER_IS_BETTER = ("rps", "ops_per_s")
+
+Results = Dict[str, Dict[str, Dict[str, float]]]
+
+
+class Regression(NamedTuple):
+    group: str
+    case: str
+    metric: str
+    baseline: float
+    current: float
+    change: float
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def summarize(latencies: Sequence[float], elapsed: float) -> Dict[str, float]:
+    """p50/p95/p99/max latency in milliseconds plus throughput"""
+    values = sorted(latencies)
+    return {
+        "count": len(values),
+        "mean_ms": 1000 * sum(values) / len(values) if values else 0.0,
+        "p50_ms": 1000 * percentile(values, 50),
+        "p95_ms": 1000 * percentile(values, 95),
+        "p99_ms": 1000 * percentile(values, 99),
+        "max_ms": 1000 * values[-1] if values else 0.0,
+        "rps": len(values) / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def save_baseline(results: Results, path: Path = DEFAULT_BASELINE):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": platform.platform(),
+        "python": platform.python_version(),
+        "results": results,
+    }
+    path.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
+
+
+def load_baseline(path: Path = DEFAULT_BASELINE) -> Results:
+    return json.loads(path.read_text(encoding="utf-8"))["results"]
+
+
+def compare(
+    current: Results,
+    baseline: Results,
+    tolerance: float = 0.2,
+    metrics: Sequence[str] = ("p50_ms", "p95_ms", "rps", "ops_per_s"),
+    min_ms: float = 0.1
+) -> List[Regression]:
+    """
+    Cases whose metrics got worse than the baseline by more than ``tolerance``
+
+    Only cases and metrics present in both result sets are compared. Cases
+    whose median stays below ``min_ms`` are skipped: at that scale timer
+    noise dominates any relative change.
+    """
+    regressions = []
+    for group, cases in current.items():
+        for case, values in cases.items():
+            reference = baseline.get(group, {}).get(case)
+            if not reference:
+                continue
+            if max(reference.get("p50_ms", min_ms), values.get("p50_ms", min_ms)) < min_ms:
+                continue
+            for metric in metrics:
+                if metric not in values or not reference.get(metric):
+                    continue
+                before, after = reference[metric], values[metric]
+                change = (after - before) / before
+                worse = -change if metric in HIGHER_IS_BETTER else change
+                if worse > tolerance:
+                    regressions.append(Regression(group, case, metric, before, after, change))
+    return regressions
+
+
+def print_table(title: str, cases: Dict[str, Dict[str, float]], columns: Sequence[str]):
+    width = max([len(title)] + [len(c) for c in cases]) + 2
+    print(f"\n{title:<{width}}" + "".join(f"{c:>12}" for c in columns))
+    for case, values in cases.items():
+        print(f"{case:<{width}}" + "".join(f"{values.get(c, 0.0):>12.2f}" for c in columns))
+
+
+def print_regressions(regressions: List[Regression], tolerance: float):
+    if not regressions:
+        print(f"\nNo regressions beyond {tolerance:.0%} of baseline")
+        return
+    print(f"\nREGRESSIONS (beyond {tolerance:.0%} of baseline):")
+    for r in regressions:
+        print(f"  {r.group}/{r.case} {r.metric}: {r.baseline:.2f} -> {r.current:.2f} ({r.change:+.0%})")
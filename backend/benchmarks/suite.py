@@ -0,0 +1,83 @@
+"""
+Benchmark Suite
+Service micro-benchmarks, response serialization and in-process load test,
+checked against a baseline
+
+Usage:
+    # Record a baseline on this machine
+    python -m benchmarks.suite --save-baseline
+
+    # Later: run again and flag anything more than 20% worse
+    python -m benchmarks.suite --tolerance 0.2
+
+Exits with status 1 when a regression is found, so it can gate CI jobs that
+run on fixed hardware.
+"""
+from pathlib import Path
+import argparse
+import asyncio
+import sys
+
+from benchmarks import bench_responses, bench_services, load
+from benchmarks.report import (
+    DEFAULT_BASELINE, compare, load_baseline, print_regressions, print_table, save_baseline
+)
+from middleware.cpu_executor import cpu_executor
+
+
+async def run(args) -> dict:
+    results = {}
+    if not args.skip_micro:
+        results["micro"] = await bench_services.run(args.sizes.split(","), args.repeat)
+    if not args.skip_responses:
+        results["responses"] = await bench_responses.run(args.items, args.repeat)
+    if not args.skip_load:
+        from main import app
+        results["load"] = await load.run_load(app, args.concurrency, args.requests, args.seed_articles)
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="BeyondAcademic benchmark suite")
+    parser.add_argument("--sizes", default="small,medium,large", help="Corpus sizes for micro-benchmarks")
+    parser.add_argument("--repeat", type=int, default=20, help="Calls per micro-benchmark case")
+    parser.add_argument("--concurrency", type=int, default=16, help="Load generator workers")
+    parser.add_argument("--requests", type=int, default=2000, help="Total load-test requests")
+    parser.add_argument("--seed-articles", type=int, default=50)
+    parser.add_argument("--items", type=int, default=1000, help="Articles/versions per response benchmark")
+    parser.add_argument("--skip-micro", action="store_true")
+    parser.add_argument("--skip-responses", action="store_true")
+    parser.add_argument("--skip-load", action="store_true")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown before flagging")
+    parser.add_argument("--min-ms", type=float, default=0.1, help="Ignore cases faster than this")
+    args = parser.parse_args()
+
+    try:
+        results = asyncio.run(run(args))
+    finally:
+        cpu_executor.shutdown()
+
+    if "micro" in results:
+        print_table("micro-benchmark", results["micro"], ("p50_ms", "p95_ms", "p99_ms", "ops_per_s"))
+    if "responses" in results:
+        print_table("response", results["responses"], ("p50_ms", "p95_ms", "p99_ms", "ops_per_s"))
+    if "load" in results:
+        print_table("load scenario", results["load"], ("p50_ms", "p95_ms", "p99_ms", "rps", "errors"))
+
+    if args.save_baseline:
+        save_baseline(results, args.baseline)
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline first")
+        return 0
+
+    regressions = compare(results, load_baseline(args.baseline), args.tolerance, min_ms=args.min_ms)
+    print_regressions(regressions, args.tolerance)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,6 @@
 import multiprocessing
 import os
+import shutil
 
 # 绑定地址 / Bind address
 bind = "0.0.0.0:8000"
@@ -31,5 +32,25 @@ proc_name = "beyondacademic"
 # 预加载应用 / Preload app
 preload_app = True
 
+# Prometheus 多进程指标目录 / Shared Prometheus metrics directory
+# Must be set before the app is (pre)loaded; stale files from a previous run are removed
+metrics_dir = os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/beyondacademic-metrics")
+shutil.rmtree(metrics_dir, ignore_errors=True)
+os.makedirs(metrics_dir, exist_ok=True)
+
 # 优雅重启超时 / Graceful timeout
 graceful_timeout = 30
+
+# 预加载模型 (写时复制共享) / Preload models in the master (shared copy-on-write)
+# e.g. MODEL_PRELOAD=sentence_embedder,spacy
+def when_ready(server):
+    from middleware.model_registry import model_registry, models_from_env
+    names = models_from_env("MODEL_PRELOAD")
+    if names:
+        model_registry.preload(names)
+        server.log.info("Preloaded models: %s", model_registry.status())
+
+# 清理退出进程的指标 / Drop live gauges of exited workers
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
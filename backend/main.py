@@ -2,9 +2,19 @@
 BeyondAcademic - Main Application Entry Point
 A modular academic writing system with AI-powered assistance
 """
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from api import article_router, editor_router, recommendation_router
+from api import admin_router, article_router, editor_router, recommendation_router
+from middleware import metrics
+from middleware.ai_middleware import ai_middleware
+from middleware.cpu_executor import cpu_executor
+from middleware.llm_client import llm_client
+from middleware.model_registry import model_registry
+from middleware.profiler import profiler
+from services.article_service import article_service, autosave_flusher
+from services.citation_formatter import citation_formatter
+from services.live_session import live_sessions
+from services.text_metrics import metrics_cache
 
 app = FastAPI(
     title="BeyondAcademic",
@@ -21,10 +31,49 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-route latency, in-flight and payload-size metrics
+app.add_middleware(metrics.MetricsMiddleware, router=app.router)
+
+# Runtime stats exported on /metrics
+metrics.register_source("cpu_executor", cpu_executor.stats)
+metrics.register_source("batcher", ai_middleware.batch_stats)
+metrics.register_source("llm_client", lambda: llm_client.stats)
+metrics.register_source("live_sessions", live_sessions.stats)
+metrics.register_source("autosave", article_service.autosave_stats)
+metrics.register_cache("metrics_cache", lambda: (metrics_cache.hits, metrics_cache.misses))
+metrics.register_cache("citation_cache", lambda: (citation_formatter.hits, citation_formatter.misses))
+metrics.register_cache("diff_cache", lambda: (
+    article_service.diff_cache.hits, article_service.diff_cache.misses
+))
+metrics.register_cache("llm_cache", lambda: (
+    llm_client.stats["cache_hits"], llm_client.stats["requests"] - llm_client.stats["cache_hits"]
+))
+
 # Include routers
 app.include_router(article_router.router, prefix="/api/articles", tags=["articles"])
 app.include_router(editor_router.router, prefix="/api/editor", tags=["editor"])
 app.include_router(recommendation_router.router, prefix="/api/recommendations", tags=["recommendations"])
+app.include_router(admin_router.router, prefix="/api/admin", tags=["admin"])
+
+@app.on_event("startup")
+async def startup():
+    """Initialize AI middleware and shared clients"""
+    await ai_middleware.initialize()
+    await article_service.search_index.connect()
+    metrics.stats_refresher.start()
+    autosave_flusher.start()
+    profiler.start_watchdog()
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Release pooled connections and worker pools"""
+    profiler.stop_watchdog()
+    await metrics.stats_refresher.stop()
+    # Pending autosaves are written before the worker pools go away
+    await autosave_flusher.stop()
+    await article_service.search_index.disconnect()
+    await ai_middleware.shutdown()
+    cpu_executor.shutdown()
 
 @app.get("/")
 async def root():
@@ -43,7 +92,18 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy", "service": "BeyondAcademic"}
+    return {
+        "status": "healthy",
+        "service": "BeyondAcademic",
+        "models": model_registry.status(),
+        "executor": cpu_executor.stats()
+    }
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus metrics, aggregated across workers when PROMETHEUS_MULTIPROC_DIR is set"""
+    body, content_type = metrics.render_latest()
+    return Response(content=body, media_type=content_type)
 
 if __name__ == "__main__":
     import uvicorn
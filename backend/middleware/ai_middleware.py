@@ -6,6 +6,15 @@ from typing import List, Dict, Optional, Any
 from pydantic import BaseModel
 import asyncio
 
+from middleware.batching import MicroBatcher
+from middleware.cpu_executor import cpu_executor
+from middleware.llm_client import LLMClient, LLMError, llm_client, provider_from_env
+from middleware.metrics import timed
+from middleware.model_registry import ModelRegistry, model_registry, models_from_env
+from services.sentence_segmenter import iter_sentences
+from services.template_registry import template_registry
+from services.text_metrics import compute_metrics, metrics_cache
+
 
 class SemanticAnalysis(BaseModel):
     """Result of semantic analysis"""
@@ -16,6 +25,60 @@ class SemanticAnalysis(BaseModel):
     complexity_score: float
 
 
+def _analyze_semantic(text: str, grade_level: float = 0.0) -> SemanticAnalysis:
+    """Keyword-based analysis behind AIMiddleware.analyze_semantic"""
+    # Simple analysis (replace with actual NLP in production)
+    words = text.lower().split()
+    
+    # Detect intent
+    intent = "research"
+    if any(word in words for word in ["propose", "present", "introduce"]):
+        intent = "methodology"
+    elif any(word in words for word in ["compare", "evaluate", "analyze"]):
+        intent = "evaluation"
+    elif any(word in words for word in ["review", "survey", "overview"]):
+        intent = "survey"
+    
+    # Extract entities (simplified)
+    entities = []
+    technical_terms = ["neural", "network", "algorithm", "model", "learning", "deep", "machine"]
+    for term in technical_terms:
+        if term in words:
+            entities.append({
+                "text": term,
+                "type": "TECHNICAL_TERM"
+            })
+    
+    # Extract topics
+    topics = []
+    if "learning" in words:
+        topics.append("Machine Learning")
+    if "neural" in words or "network" in words:
+        topics.append("Neural Networks")
+    if "image" in words:
+        topics.append("Computer Vision")
+    if "language" in words or "nlp" in words:
+        topics.append("Natural Language Processing")
+    
+    # Sentiment analysis
+    sentiment = "neutral"
+    if any(word in words for word in ["excellent", "superior", "outstanding"]):
+        sentiment = "positive"
+    elif any(word in words for word in ["poor", "inadequate", "limited"]):
+        sentiment = "negative"
+    
+    # Complexity score from the Flesch-Kincaid grade (grade 20+ is maximal)
+    complexity_score = min(max(grade_level, 0.0) / 20.0, 1.0)
+    
+    return SemanticAnalysis(
+        intent=intent,
+        entities=entities,
+        topics=topics if topics else ["General"],
+        sentiment=sentiment,
+        complexity_score=complexity_score
+    )
+
+
 class AIMiddleware:
     """
     Central middleware for AI capabilities
@@ -27,73 +90,102 @@ class AIMiddleware:
     - Context analysis
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        llm: Optional[LLMClient] = None,
+        models: Optional[ModelRegistry] = None
+    ):
         self.initialized = False
+        self.llm = llm or llm_client
+        self.models = models or model_registry
+        self.batchers: Dict[str, MicroBatcher] = {}
     
     async def initialize(self):
         """Initialize AI models and connections"""
         # In production, initialize actual AI models here
         # e.g., load transformers, connect to external APIs
+        provider = provider_from_env()
+        if provider is not None:
+            self.llm.register_provider(provider)
+        
+        # Models load on first use; MODEL_WARMUP loads them in the background
+        # so startup (and /health) never waits on torch/transformers imports
+        self.register_batch_model("embed", self._embed_batch)
+        warmup = models_from_env("MODEL_WARMUP")
+        if warmup:
+            self.models.start_warmup(warmup)
         self.initialized = True
     
+    async def shutdown(self):
+        """Release pooled connections held by the LLM client"""
+        await self.llm.close()
+        for batcher in self.batchers.values():
+            await batcher.close()
+        await self.models.close()
+        self.initialized = False
+    
+    @property
+    def llm_enabled(self) -> bool:
+        """Whether an LLM provider is configured"""
+        return "openai" in self.llm.providers
+    
+    def register_batch_model(
+        self,
+        name: str,
+        model_fn,
+        max_batch_size: int = 32,
+        max_latency_ms: float = 10.0
+    ) -> MicroBatcher:
+        """
+        Register a batched inference function (embedding, classification, ...)
+        
+        Args:
+            name: Model name used with infer()
+            model_fn: Callable mapping a list of inputs to a list of outputs
+            max_batch_size: Maximum items per forward pass
+            max_latency_ms: Maximum time an item waits for its batch to fill
+        """
+        batcher = MicroBatcher(model_fn, max_batch_size, max_latency_ms, name=name)
+        self.batchers[name] = batcher
+        return batcher
+    
+    @timed("ai")
+    async def infer(self, name: str, item: Any) -> Any:
+        """Run one input through a registered model via its micro-batcher"""
+        batcher = self.batchers.get(name)
+        if batcher is None:
+            raise KeyError(f"No batch model registered as '{name}'")
+        return await batcher.submit(item)
+    
+    def _embed_batch(self, texts: List[str]) -> List[Any]:
+        """Batched sentence embedding, run in the batcher's worker thread"""
+        embedder = self.models.get_sync("sentence_embedder")
+        return list(embedder.encode(texts, batch_size=len(texts), convert_to_numpy=True))
+    
+    async def embed(self, text: str) -> Any:
+        """Embed a single text; concurrent calls share one forward pass"""
+        return await self.infer("embed", text)
+    
+    def batch_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Metrics for every registered micro-batcher"""
+        return {name: batcher.stats.as_dict() for name, batcher in self.batchers.items()}
+    
+    @timed("ai")
     async def analyze_semantic(self, text: str) -> SemanticAnalysis:
         """
         Perform semantic analysis on text
         
         Analyzes research intent, entities, topics, and complexity
         """
-        # Simple analysis (replace with actual NLP in production)
-        words = text.lower().split()
-        
-        # Detect intent
-        intent = "research"
-        if any(word in words for word in ["propose", "present", "introduce"]):
-            intent = "methodology"
-        elif any(word in words for word in ["compare", "evaluate", "analyze"]):
-            intent = "evaluation"
-        elif any(word in words for word in ["review", "survey", "overview"]):
-            intent = "survey"
-        
-        # Extract entities (simplified)
-        entities = []
-        technical_terms = ["neural", "network", "algorithm", "model", "learning", "deep", "machine"]
-        for term in technical_terms:
-            if term in words:
-                entities.append({
-                    "text": term,
-                    "type": "TECHNICAL_TERM"
-                })
-        
-        # Extract topics
-        topics = []
-        if "learning" in words:
-            topics.append("Machine Learning")
-        if "neural" in words or "network" in words:
-            topics.append("Neural Networks")
-        if "image" in words:
-            topics.append("Computer Vision")
-        if "language" in words or "nlp" in words:
-            topics.append("Natural Language Processing")
-        
-        # Sentiment analysis
-        sentiment = "neutral"
-        if any(word in words for word in ["excellent", "superior", "outstanding"]):
-            sentiment = "positive"
-        elif any(word in words for word in ["poor", "inadequate", "limited"]):
-            sentiment = "negative"
-        
-        # Complexity score based on sentence structure and vocabulary
-        avg_word_length = sum(len(word) for word in words) / max(len(words), 1)
-        complexity_score = min(avg_word_length / 10.0, 1.0)
-        
-        return SemanticAnalysis(
-            intent=intent,
-            entities=entities,
-            topics=topics if topics else ["General"],
-            sentiment=sentiment,
-            complexity_score=complexity_score
+        metrics = metrics_cache.get(text)
+        if metrics is None:
+            metrics = await cpu_executor.run(compute_metrics, text, size=len(text))
+            metrics_cache.put(text, metrics)
+        return await cpu_executor.run(
+            _analyze_semantic, text, metrics.flesch_kincaid_grade, size=len(text)
         )
     
+    @timed("ai")
     async def retrieve_literature(
         self, 
         query: str, 
@@ -121,6 +213,7 @@ class AIMiddleware:
         
         return results
     
+    @timed("ai")
     async def optimize_language(
         self, 
         text: str, 
@@ -141,12 +234,29 @@ class AIMiddleware:
         # Generate optimizations based on style
         optimizations = {
             "original": text,
-            "optimized": text,  # Would be actually optimized in production
+            "optimized": text,
             "changes": [],
             "style_score": 0.8,
             "recommendations": []
         }
         
+        if self.llm_enabled:
+            try:
+                optimized = await self.llm.complete(
+                    text,
+                    system=(
+                        f"Rewrite the user's text to meet {target_style} academic publishing "
+                        "standards. Preserve meaning and citations. Return only the rewritten text."
+                    ),
+                    temperature=0
+                )
+                optimizations["optimized"] = optimized.strip()
+                if optimizations["optimized"] != text:
+                    optimizations["changes"].append(f"Rewritten for {target_style} style")
+            except LLMError:
+                # Fall back to rule-based recommendations only
+                pass
+        
         # SCI-specific recommendations
         if target_style == "SCI":
             optimizations["recommendations"].extend([
@@ -160,6 +270,7 @@ class AIMiddleware:
         
         return optimizations
     
+    @timed("ai")
     async def extract_keywords(self, text: str, max_keywords: int = 10) -> List[str]:
         """
         Extract key terms and concepts from text
@@ -183,6 +294,7 @@ class AIMiddleware:
         
         return [word for word, freq in sorted_keywords[:max_keywords]]
     
+    @timed("ai")
     async def generate_abstract(self, full_text: str, max_words: int = 250) -> str:
         """
         Generate abstract from full text
@@ -190,17 +302,25 @@ class AIMiddleware:
         Uses extractive summarization
         """
         # Simple extraction (use advanced summarization in production)
-        sentences = full_text.split('.')
+        # Take the first few sentences as abstract, within the word budget
+        abstract_sentences = []
+        words = 0
+        for sentence in iter_sentences(full_text):
+            sentence_words = len(sentence.text.split())
+            if abstract_sentences and words + sentence_words > max_words:
+                break
+            abstract_sentences.append(sentence.text)
+            words += sentence_words
+            if len(abstract_sentences) == 3:
+                break
+        abstract = ' '.join(abstract_sentences)
         
-        # Take first few sentences as abstract
-        abstract_sentences = sentences[:3]
-        abstract = '. '.join([s.strip() for s in abstract_sentences if s.strip()])
-        
-        if abstract and not abstract.endswith('.'):
+        if abstract and not abstract.endswith(('.', '!', '?')):
             abstract += '.'
         
         return abstract
     
+    @timed("ai")
     async def check_plagiarism(self, text: str) -> Dict[str, Any]:
         """
         Check for potential plagiarism
@@ -215,59 +335,15 @@ class AIMiddleware:
             "confidence": 0.95
         }
     
+    @timed("ai")
     async def suggest_structure(self, topic: str, template: str) -> Dict[str, Any]:
         """
         Suggest paper structure based on topic and template
         
         Provides recommended sections and organization
         """
-        structures = {
-            "IEEE": {
-                "sections": [
-                    "Abstract",
-                    "I. Introduction",
-                    "II. Related Work",
-                    "III. Methodology",
-                    "IV. Experimental Results",
-                    "V. Discussion",
-                    "VI. Conclusion",
-                    "References"
-                ],
-                "guidelines": [
-                    "Abstract: 150-200 words",
-                    "Introduction: Motivate the problem and state contributions",
-                    "Related Work: Compare with existing approaches",
-                    "Methodology: Describe approach in detail",
-                    "Results: Present experimental findings",
-                    "Discussion: Interpret results and limitations",
-                    "Conclusion: Summarize and future work"
-                ]
-            },
-            "Elsevier": {
-                "sections": [
-                    "Abstract",
-                    "Keywords",
-                    "1. Introduction",
-                    "2. Literature Review",
-                    "3. Materials and Methods",
-                    "4. Results",
-                    "5. Discussion",
-                    "6. Conclusion",
-                    "References"
-                ],
-                "guidelines": [
-                    "Abstract: 150-250 words",
-                    "Keywords: 4-6 keywords",
-                    "Introduction: Background and objectives",
-                    "Methods: Reproducible methodology",
-                    "Results: Present findings objectively",
-                    "Discussion: Interpret in context of literature",
-                    "Conclusion: Main findings and implications"
-                ]
-            }
-        }
-        
-        return structures.get(template, structures["IEEE"])
+        spec = template_registry.get(template) or template_registry["IEEE"]
+        return spec.structure()
 
 
 # Global middleware instance
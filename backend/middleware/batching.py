@@ -0,0 +1,157 @@
+"""
+Micro-batching Scheduler
+Groups concurrent model inference calls into batched forward passes
+
+Concurrent callers await ``submit(item)``. Items are collected until either
+``max_batch_size`` items are queued or ``max_latency_ms`` has elapsed since
+the first queued item, then the whole batch runs as one call to the model
+function in a worker thread and each caller receives its own result.
+"""
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from concurrent.futures import Executor, ThreadPoolExecutor
+import asyncio
+import time
+
+
+class BatcherStats:
+    """Running metrics for a micro-batcher"""
+
+    def __init__(self):
+        self.items = 0
+        self.batches = 0
+        self.errors = 0
+        self.max_batch_size_seen = 0
+        self.total_queue_wait = 0.0
+        self.max_queue_wait = 0.0
+        self.total_inference_time = 0.0
+
+    def record(self, size: int, waits: Sequence[float], inference_time: float):
+        self.items += size
+        self.batches += 1
+        self.max_batch_size_seen = max(self.max_batch_size_seen, size)
+        self.total_queue_wait += sum(waits)
+        self.max_queue_wait = max(self.max_queue_wait, max(waits))
+        self.total_inference_time += inference_time
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "items": self.items,
+            "batches": self.batches,
+            "errors": self.errors,
+            "avg_batch_size": self.items / self.batches if self.batches else 0.0,
+            "max_batch_size": self.max_batch_size_seen,
+            "avg_queue_wait_ms": 1000 * self.total_queue_wait / self.items if self.items else 0.0,
+            "max_queue_wait_ms": 1000 * self.max_queue_wait,
+            "avg_inference_ms": 1000 * self.total_inference_time / self.batches if self.batches else 0.0,
+        }
+
+
+class MicroBatcher:
+    """
+    Async micro-batcher around a batched model function
+
+    Args:
+        model_fn: Callable taking a list of inputs and returning a list of
+            outputs of the same length (e.g. ``model.encode``)
+        max_batch_size: Flush as soon as this many items are queued
+        max_latency_ms: Flush at most this long after the first queued item
+        executor: Executor running ``model_fn``; defaults to a single worker
+            thread so batches never compete with each other for the CPU
+    """
+
+    def __init__(
+        self,
+        model_fn: Callable[[List[Any]], Sequence[Any]],
+        max_batch_size: int = 32,
+        max_latency_ms: float = 10.0,
+        executor: Optional[Executor] = None,
+        name: str = "model"
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.model_fn = model_fn
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency_ms / 1000.0
+        self.name = name
+        self.stats = BatcherStats()
+
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._queue: List[Tuple[Any, asyncio.Future, float]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"batch-{self.name}")
+        return self._executor
+
+    async def submit(self, item: Any) -> Any:
+        """Queue one input and wait for its output"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.append((item, future, time.perf_counter()))
+
+        if len(self._queue) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_latency, self._flush)
+
+        return await future
+
+    async def submit_many(self, items: Sequence[Any]) -> List[Any]:
+        """Queue several inputs at once; they may be split across batches"""
+        return list(await asyncio.gather(*(self.submit(item) for item in items)))
+
+    def _flush(self):
+        """Hand the queued items to a worker as one batch"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        while self._queue:
+            batch = self._queue[:self.max_batch_size]
+            del self._queue[:self.max_batch_size]
+            task = asyncio.get_running_loop().create_task(self._run_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def _timed_call(self, inputs: List[Any]) -> Tuple[Sequence[Any], float, float]:
+        """Run the model in the worker, returning outputs and start/duration"""
+        started = time.perf_counter()
+        outputs = self.model_fn(inputs)
+        return outputs, started, time.perf_counter() - started
+
+    async def _run_batch(self, batch: List[Tuple[Any, asyncio.Future, float]]):
+        inputs = [item for item, _, _ in batch]
+        loop = asyncio.get_running_loop()
+
+        try:
+            outputs, started, inference_time = await loop.run_in_executor(
+                self._get_executor(), self._timed_call, inputs
+            )
+            if len(outputs) != len(inputs):
+                raise RuntimeError(
+                    f"{self.name} returned {len(outputs)} outputs for {len(inputs)} inputs"
+                )
+        except Exception as exc:
+            self.stats.errors += 1
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        waits = [started - queued_at for _, _, queued_at in batch]
+        self.stats.record(len(batch), waits, inference_time)
+        for (_, future, _), output in zip(batch, outputs):
+            if not future.done():
+                future.set_result(output)
+
+    async def close(self):
+        """Flush pending items, wait for running batches and stop the worker"""
+        if self._queue:
+            self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
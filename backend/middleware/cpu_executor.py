@@ -0,0 +1,160 @@
+"""
+CPU Executor
+Keeps CPU-bound analysis off the asyncio event loop
+
+Small inputs run inline (a pool round-trip would cost more than the work).
+Inputs at or above the configured size threshold are sent to a process pool,
+or to a thread pool for code that releases the GIL (NumPy, tokenizers).
+Functions sent to the process pool must be module-level and picklable.
+"""
+from typing import Any, Callable, Dict, Optional
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+import asyncio
+import multiprocessing
+import os
+import time
+
+
+class PoolKind:
+    """Where offloaded work runs"""
+    PROCESS = "process"
+    THREAD = "thread"
+
+
+def _timed(fn: Callable, args: tuple, kwargs: dict):
+    """Worker-side wrapper reporting when execution actually started"""
+    started = time.time()
+    result = fn(*args, **kwargs)
+    return result, started, time.time() - started
+
+
+class _PoolStats:
+    """Queue depth and latency counters for one pool"""
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.in_flight = 0
+        self.completed = 0
+        self.errors = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.total_run = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "in_flight": self.in_flight,
+            "queue_depth": max(0, self.in_flight - self.workers),
+            "completed": self.completed,
+            "errors": self.errors,
+            "avg_wait_ms": 1000 * self.total_wait / self.completed if self.completed else 0.0,
+            "max_wait_ms": 1000 * self.max_wait,
+            "avg_run_ms": 1000 * self.total_run / self.completed if self.completed else 0.0,
+        }
+
+
+class CPUExecutor:
+    """
+    Size-aware dispatcher for CPU-bound work
+
+    Args:
+        threshold: Input size (characters, items, ...) at which work is offloaded
+        process_workers: Process pool size
+        thread_workers: Thread pool size
+    """
+
+    def __init__(
+        self,
+        threshold: int = 20000,
+        process_workers: int = 2,
+        thread_workers: int = 4
+    ):
+        self.threshold = threshold
+        self.process_workers = process_workers
+        self.thread_workers = thread_workers
+        self._pools: Dict[str, Optional[Executor]] = {PoolKind.PROCESS: None, PoolKind.THREAD: None}
+        self._stats = {
+            PoolKind.PROCESS: _PoolStats(process_workers),
+            PoolKind.THREAD: _PoolStats(thread_workers),
+        }
+        self.inline_calls = 0
+
+    def _pool(self, kind: str) -> Executor:
+        # Pools are created lazily so nothing is spawned in the gunicorn master
+        pool = self._pools[kind]
+        if pool is None:
+            if kind == PoolKind.PROCESS:
+                pool = ProcessPoolExecutor(
+                    max_workers=self.process_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            else:
+                pool = ThreadPoolExecutor(max_workers=self.thread_workers, thread_name_prefix="cpu")
+            self._pools[kind] = pool
+        return pool
+
+    async def run(
+        self,
+        fn: Callable,
+        *args,
+        size: int = 0,
+        kind: str = PoolKind.PROCESS,
+        offload: bool = False,
+        **kwargs
+    ) -> Any:
+        """
+        Run ``fn(*args, **kwargs)``, offloading it when ``size`` reaches the threshold
+
+        Args:
+            fn: Synchronous function (module-level for the process pool)
+            size: Size of the input driving the cost, usually ``len(text)``
+            kind: PoolKind.PROCESS or PoolKind.THREAD
+            offload: Offload whatever the size, e.g. for calls meant to run in parallel
+        """
+        if size < self.threshold and not offload:
+            self.inline_calls += 1
+            return fn(*args, **kwargs)
+
+        stats = self._stats[kind]
+        loop = asyncio.get_running_loop()
+        submitted = time.time()
+        stats.in_flight += 1
+        try:
+            result, started, run_time = await loop.run_in_executor(
+                self._pool(kind), _timed, fn, args, kwargs
+            )
+        except Exception:
+            stats.errors += 1
+            raise
+        finally:
+            stats.in_flight -= 1
+
+        wait = max(0.0, started - submitted)
+        stats.completed += 1
+        stats.total_wait += wait
+        stats.max_wait = max(stats.max_wait, wait)
+        stats.total_run += run_time
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue-depth and wait-time metrics per pool"""
+        return {
+            "threshold": self.threshold,
+            "inline_calls": self.inline_calls,
+            PoolKind.PROCESS: self._stats[PoolKind.PROCESS].as_dict(),
+            PoolKind.THREAD: self._stats[PoolKind.THREAD].as_dict(),
+        }
+
+    def shutdown(self):
+        for kind, pool in self._pools.items():
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+                self._pools[kind] = None
+
+
+# Global executor instance
+cpu_executor = CPUExecutor(
+    threshold=int(os.getenv("CPU_OFFLOAD_THRESHOLD", 20000)),
+    process_workers=int(os.getenv("CPU_POOL_WORKERS", 2)),
+    thread_workers=int(os.getenv("CPU_THREAD_WORKERS", 4)),
+)
@@ -0,0 +1,295 @@
+"""
+LLM Client
+Shared async client for chat-completion providers (OpenAI and compatible APIs)
+
+Provides:
+- One pooled aiohttp session shared by every provider
+- Bounded concurrency per provider
+- In-flight deduplication of identical prompts
+- Result caching by prompt hash
+- Timeouts and retries with jittered exponential backoff
+"""
+from typing import Dict, List, Optional, Any
+from collections import OrderedDict
+from dataclasses import dataclass
+import asyncio
+import hashlib
+import json
+import os
+import random
+
+import aiohttp
+
+
+class LLMError(Exception):
+    """Raised when a provider call fails after all retries"""
+
+
+class _RetryableError(Exception):
+    """Internal marker for responses that should be retried"""
+
+
+@dataclass
+class ProviderConfig:
+    """Connection settings for a single LLM provider"""
+    name: str
+    base_url: str
+    api_key: str = ""
+    model: str = "gpt-3.5-turbo"
+    max_concurrency: int = 8
+    timeout: float = 30.0
+    max_retries: int = 3
+
+
+class _InFlight:
+    """One upstream call shared by every caller waiting for the same prompt"""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+# Status codes worth retrying: rate limiting and transient server errors
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+class LLMClient:
+    """
+    Pooled async client for LLM providers
+
+    Identical requests (same provider, model and messages) that are in flight
+    at the same time share one upstream call, and completed results are cached
+    by prompt hash so repeated prompts never leave the process.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 100,
+        cache_size: int = 1024,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0
+    ):
+        self.pool_size = pool_size
+        self.cache_size = cache_size
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self.providers: Dict[str, ProviderConfig] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._in_flight: Dict[str, _InFlight] = {}
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+
+        self.stats = {
+            "requests": 0,
+            "upstream_calls": 0,
+            "cache_hits": 0,
+            "coalesced": 0,
+            "retries": 0,
+            "failures": 0,
+        }
+
+    def register_provider(self, config: ProviderConfig):
+        """Register (or replace) a provider and its concurrency limit"""
+        self.providers[config.name] = config
+        self._semaphores[config.name] = asyncio.Semaphore(config.max_concurrency)
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Lazily create the shared pooled session"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=30)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def close(self):
+        """Close the shared session and drop pooled connections"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    @staticmethod
+    def prompt_key(provider: str, model: str, messages: List[Dict[str, str]], **params) -> str:
+        """Stable hash identifying a prompt for caching and deduplication"""
+        payload = json.dumps(
+            {"provider": provider, "model": model, "messages": messages, "params": params},
+            sort_keys=True,
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def complete(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        provider: str = "openai",
+        **params
+    ) -> str:
+        """Convenience wrapper around chat() for a single user prompt"""
+        messages = []
+        if system:
+            messages.append({"role": "system", "content": system})
+        messages.append({"role": "user", "content": prompt})
+        return await self.chat(messages, provider=provider, **params)
+
+    async def chat(
+        self,
+        messages: List[Dict[str, str]],
+        provider: str = "openai",
+        use_cache: bool = True,
+        **params
+    ) -> str:
+        """
+        Run a chat completion and return the assistant message text
+
+        Args:
+            messages: Chat messages in OpenAI format
+            provider: Name of a registered provider
+            use_cache: Serve and store results in the prompt cache
+            **params: Extra request parameters (temperature, max_tokens, ...)
+        """
+        config = self.providers.get(provider)
+        if config is None:
+            raise LLMError(f"Unknown LLM provider: {provider}")
+
+        self.stats["requests"] += 1
+        key = self.prompt_key(provider, config.model, messages, **params)
+
+        if use_cache and key in self._cache:
+            self._cache.move_to_end(key)
+            self.stats["cache_hits"] += 1
+            return self._cache[key]
+
+        shared = self._in_flight.get(key)
+        if shared is None:
+            task = asyncio.ensure_future(self._fetch(key, config, messages, params, use_cache))
+            shared = self._in_flight[key] = _InFlight(task)
+            task.add_done_callback(lambda _: self._forget(key, shared))
+        else:
+            self.stats["coalesced"] += 1
+
+        # The upstream call belongs to no single caller: one being cancelled
+        # leaves it running for the others, and only the last one stops it
+        shared.waiters += 1
+        try:
+            return await asyncio.shield(shared.task)
+        finally:
+            shared.waiters -= 1
+            if not shared.waiters and not shared.task.done():
+                shared.task.cancel()
+
+    async def _fetch(
+        self,
+        key: str,
+        config: ProviderConfig,
+        messages: List[Dict[str, str]],
+        params: Dict[str, Any],
+        use_cache: bool
+    ) -> str:
+        """Upstream call shared by coalesced callers"""
+        result = await self._call_with_retries(config, messages, params)
+        if use_cache:
+            self._remember(key, result)
+        return result
+
+    def _forget(self, key: str, shared: _InFlight):
+        """Drop a finished call so later requests start a new one"""
+        if self._in_flight.get(key) is shared:
+            del self._in_flight[key]
+
+    def _remember(self, key: str, value: str):
+        """Store a result in the bounded LRU cache"""
+        self._cache[key] = value
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff delay for the given attempt"""
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    async def _call_with_retries(
+        self,
+        config: ProviderConfig,
+        messages: List[Dict[str, str]],
+        params: Dict[str, Any]
+    ) -> str:
+        """Call the provider, retrying transient failures"""
+        last_error: Optional[Exception] = None
+        for attempt in range(config.max_retries + 1):
+            if attempt:
+                self.stats["retries"] += 1
+                await asyncio.sleep(self._backoff(attempt - 1))
+            try:
+                async with self._semaphores[config.name]:
+                    return await self._post(config, messages, params)
+            except _RetryableError as exc:
+                last_error = exc
+            except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError) as exc:
+                last_error = exc
+
+        self.stats["failures"] += 1
+        raise LLMError(f"{config.name} request failed after {config.max_retries + 1} attempts: {last_error}")
+
+    async def _post(
+        self,
+        config: ProviderConfig,
+        messages: List[Dict[str, str]],
+        params: Dict[str, Any]
+    ) -> str:
+        """Send one chat-completion request"""
+        session = await self._get_session()
+        headers = {"Content-Type": "application/json"}
+        if config.api_key:
+            headers["Authorization"] = f"Bearer {config.api_key}"
+        body = {"model": config.model, "messages": messages, **params}
+
+        self.stats["upstream_calls"] += 1
+        async with session.post(
+            f"{config.base_url.rstrip('/')}/chat/completions",
+            json=body,
+            headers=headers,
+            timeout=aiohttp.ClientTimeout(total=config.timeout)
+        ) as response:
+            if response.status in RETRYABLE_STATUS:
+                raise _RetryableError(f"HTTP {response.status}")
+            if response.status >= 400:
+                text = await response.text()
+                raise LLMError(f"{config.name} returned HTTP {response.status}: {text[:200]}")
+            try:
+                data = await response.json()
+            except (aiohttp.ContentTypeError, ValueError) as exc:
+                raise LLMError(f"{config.name} returned a response that is not JSON: {exc}")
+
+        try:
+            return data["choices"][0]["message"]["content"]
+        except (KeyError, IndexError, TypeError):
+            raise LLMError(f"{config.name} returned an unexpected response shape")
+
+
+def provider_from_env() -> Optional[ProviderConfig]:
+    """
+    Build the default OpenAI provider from environment variables
+
+    OPENAI_BASE_URL can point at any OpenAI-compatible endpoint, including a
+    local stub server for offline benchmarking.
+    """
+    api_key = os.getenv("OPENAI_API_KEY", "")
+    base_url = os.getenv("OPENAI_BASE_URL", "")
+    if not base_url and (not api_key or api_key.startswith("your-")):
+        return None
+    return ProviderConfig(
+        name="openai",
+        base_url=base_url or "https://api.openai.com/v1",
+        api_key=api_key,
+        model=os.getenv("OPENAI_MODEL", "gpt-3.5-turbo"),
+        max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", 8)),
+        timeout=float(os.getenv("LLM_TIMEOUT", 30)),
+        max_retries=int(os.getenv("LLM_MAX_RETRIES", 3)),
+    )
+
+
+# Global client instance
+llm_client = LLMClient()
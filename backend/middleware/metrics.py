@@ -0,0 +1,301 @@
+"""
+Metrics
+Request, service and runtime instrumentation exported in Prometheus format
+
+- MetricsMiddleware records per-route latency histograms, in-flight counts
+  and request/response payload sizes
+- ``timed`` / ``stage`` record internal service timings
+- Runtime stats (cache hit ratios, pool queues, batchers, live sessions)
+  come from registered sources and are refreshed periodically
+
+Under gunicorn every worker writes to PROMETHEUS_MULTIPROC_DIR and
+``render_latest`` aggregates all workers at scrape time. Without that
+variable the default in-process registry is used.
+"""
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from contextlib import contextmanager
+from types import CodeType, FrameType
+import asyncio
+import functools
+import inspect
+import os
+import sys
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+)
+from prometheus_client import multiprocess
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+NAMESPACE = "beyondacademic"
+UNMATCHED_ROUTE = "<unmatched>"
+
+_SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+_SERVICE_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+REQUESTS = Counter(
+    "http_requests", "HTTP requests by route and status",
+    ["method", "route", "status"], namespace=NAMESPACE
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency until the response is complete",
+    ["method", "route"], namespace=NAMESPACE
+)
+IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served",
+    ["method", "route"], namespace=NAMESPACE, multiprocess_mode="livesum"
+)
+REQUEST_SIZE = Histogram(
+    "http_request_size_bytes", "HTTP request body size",
+    ["method", "route"], buckets=_SIZE_BUCKETS, namespace=NAMESPACE
+)
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes", "HTTP response body size",
+    ["method", "route"], buckets=_SIZE_BUCKETS, namespace=NAMESPACE
+)
+SERVICE_LATENCY = Histogram(
+    "service_duration_seconds", "Time spent in service methods, split by stage",
+    ["service", "method", "stage"], buckets=_SERVICE_BUCKETS, namespace=NAMESPACE
+)
+RUNTIME_STAT = Gauge(
+    "runtime_stat", "Cache, pool and queue statistics per worker",
+    ["source", "stat"], namespace=NAMESPACE, multiprocess_mode="liveall"
+)
+CACHE_HIT_RATIO = Gauge(
+    "cache_hit_ratio", "Cache hit ratio per worker",
+    ["cache"], namespace=NAMESPACE, multiprocess_mode="liveall"
+)
+
+
+# Requests being served, keyed by their MetricsMiddleware.__call__ frame:
+# (method, route, time.perf_counter() at start)
+_active_requests: Dict[FrameType, Tuple[str, str, float]] = {}
+
+# id() of each @timed wrapper's code object -> (code, wrapped function's
+# qualified name), so the profiler can attribute samples without reading
+# frame locals. Keyed by identity: equal code objects compare equal.
+TIMED_CODES: Dict[int, Tuple[CodeType, str]] = {}
+
+
+def timed_name(code: CodeType) -> Optional[str]:
+    """Qualified name of the function a @timed wrapper code object wraps"""
+    entry = TIMED_CODES.get(id(code))
+    return entry[1] if entry is not None and entry[0] is code else None
+
+
+def active_requests() -> Tuple[Tuple[str, str, float], ...]:
+    """(method, route, start) of every request in flight; safe from any thread"""
+    return tuple(_active_requests.values())
+
+
+def request_for_frame(frame: FrameType) -> Optional[Tuple[str, str, float]]:
+    """The request a MetricsMiddleware.__call__ frame is serving"""
+    return _active_requests.get(frame)
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording per-route request metrics
+
+    Routes are labelled with their path template (``/api/articles/{article_id}``),
+    never the raw path, so label cardinality stays bounded. Streaming
+    responses are timed until the last body chunk is sent.
+
+    Args:
+        app: Wrapped ASGI application
+        router: Router whose routes define the ``route`` label
+    """
+
+    def __init__(self, app: ASGIApp, router):
+        self.app = app
+        self.router = router
+
+    def _route(self, scope: Scope) -> str:
+        for route in self.router.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route.path
+        return UNMATCHED_ROUTE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = self._route(scope)
+        request_bytes = 0
+        response_bytes = 0
+        status = 500
+
+        async def receive_wrapper() -> Message:
+            nonlocal request_bytes
+            message = await receive()
+            if message["type"] == "http.request":
+                request_bytes += len(message.get("body", b""))
+            return message
+
+        async def send_wrapper(message: Message):
+            nonlocal status, response_bytes
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        in_flight = IN_FLIGHT.labels(method, route)
+        in_flight.inc()
+        started = time.perf_counter()
+        frame = sys._getframe()
+        _active_requests[frame] = (method, route, started)
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            del _active_requests[frame]
+            in_flight.dec()
+            elapsed = time.perf_counter() - started
+            REQUEST_LATENCY.labels(method, route).observe(elapsed)
+            REQUESTS.labels(method, route, str(status)).inc()
+            REQUEST_SIZE.labels(method, route).observe(request_bytes)
+            RESPONSE_SIZE.labels(method, route).observe(response_bytes)
+
+
+def timed(service: str, method: Optional[str] = None):
+    """
+    Record the duration of a service method as stage ``total``
+
+    Works on coroutine functions, async generators (timed until exhausted
+    or closed) and plain functions.
+    """
+    def decorator(fn: Callable) -> Callable:
+        histogram = SERVICE_LATENCY.labels(service, method or fn.__name__, "total")
+
+        def register(wrapper: Callable) -> Callable:
+            # A code object of its own, named after fn, identifies this wrapper
+            wrapper.__code__ = wrapper.__code__.replace(co_qualname=fn.__qualname__)
+            TIMED_CODES[id(wrapper.__code__)] = (wrapper.__code__, fn.__qualname__)
+            return wrapper
+
+        if inspect.isasyncgenfunction(fn):
+            @functools.wraps(fn)
+            async def asyncgen_wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    async for item in fn(*args, **kwargs):
+                        yield item
+                finally:
+                    histogram.observe(time.perf_counter() - started)
+            return register(asyncgen_wrapper)
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    histogram.observe(time.perf_counter() - started)
+            return register(async_wrapper)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - started)
+        return register(wrapper)
+
+    return decorator
+
+
+@contextmanager
+def stage(service: str, method: str, name: str):
+    """Time one stage of a service method, e.g. scoring vs serialization"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        SERVICE_LATENCY.labels(service, method, name).observe(time.perf_counter() - started)
+
+
+# Runtime stat sources: name -> callable returning a (nested) dict of numbers
+_sources: Dict[str, Callable[[], Dict[str, Any]]] = {}
+# Caches: name -> callable returning (hits, misses)
+_caches: Dict[str, Callable[[], Tuple[int, int]]] = {}
+
+
+def register_source(name: str, stats: Callable[[], Dict[str, Any]]):
+    _sources[name] = stats
+
+
+def register_cache(name: str, counts: Callable[[], Tuple[int, int]]):
+    _caches[name] = counts
+
+
+def _flatten(stats: Dict[str, Any], prefix: str = "") -> Iterable[Tuple[str, float]]:
+    for key, value in stats.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            yield from _flatten(value, f"{name}_")
+        elif isinstance(value, bool):
+            yield name, float(value)
+        elif isinstance(value, (int, float)):
+            yield name, float(value)
+
+
+def refresh_runtime_stats():
+    """Copy registered runtime stats into gauges for this worker"""
+    for source, stats in _sources.items():
+        for stat, value in _flatten(stats()):
+            RUNTIME_STAT.labels(source, stat).set(value)
+    for cache, counts in _caches.items():
+        hits, misses = counts()
+        RUNTIME_STAT.labels(cache, "hits").set(hits)
+        RUNTIME_STAT.labels(cache, "misses").set(misses)
+        CACHE_HIT_RATIO.labels(cache).set(hits / (hits + misses) if hits + misses else 0.0)
+
+
+class StatsRefresher:
+    """Periodically refreshes runtime gauges so every worker's values are current"""
+
+    def __init__(self, interval: float = 5.0):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        while True:
+            refresh_runtime_stats()
+            await asyncio.sleep(self.interval)
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+def render_latest() -> Tuple[bytes, str]:
+    """Prometheus exposition for all workers (multiprocess) or this process"""
+    refresh_runtime_stats()
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+# Global refresher instance
+stats_refresher = StatsRefresher(interval=float(os.getenv("METRICS_REFRESH_INTERVAL", 5)))
@@ -0,0 +1,179 @@
+"""
+Model Registry
+Lazy, deferred loading of heavy AI models (torch, transformers,
+sentence-transformers, spaCy)
+
+Nothing heavy is imported when this module is imported. Each model is
+described by a loader callable that performs its own imports; the model is
+built on first use, by a background warm-up task, or ahead of fork in the
+gunicorn master so workers share the read-only weights copy-on-write.
+"""
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import gc
+import os
+import threading
+import time
+
+
+class ModelState:
+    """Load state constants"""
+    REGISTERED = "registered"
+    LOADING = "loading"
+    READY = "ready"
+    FAILED = "failed"
+
+
+class _ModelEntry:
+    """Book-keeping for one registered model"""
+
+    def __init__(self, name: str, loader: Callable[[], Any]):
+        self.name = name
+        self.loader = loader
+        self.model: Any = None
+        self.state = ModelState.REGISTERED
+        self.load_seconds: Optional[float] = None
+        self.loaded_at: Optional[float] = None
+        self.error: Optional[str] = None
+        self.preforked = False
+        self.lock = threading.Lock()
+
+
+class ModelRegistry:
+    """
+    Registry of lazily loaded models
+
+    Loading is thread-safe and happens at most once per model per process;
+    concurrent callers wait for the in-progress load instead of starting
+    another one.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, _ModelEntry] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._warmup_task: Optional[asyncio.Task] = None
+
+    def register(self, name: str, loader: Callable[[], Any]):
+        """Register a model loader; the loader must do its own heavy imports"""
+        self._entries[name] = _ModelEntry(name, loader)
+
+    def names(self) -> List[str]:
+        return list(self._entries)
+
+    def is_loaded(self, name: str) -> bool:
+        entry = self._entries.get(name)
+        return entry is not None and entry.state == ModelState.READY
+
+    def _entry(self, name: str) -> _ModelEntry:
+        entry = self._entries.get(name)
+        if entry is None:
+            raise KeyError(f"Unknown model: {name}")
+        return entry
+
+    def get_sync(self, name: str) -> Any:
+        """Return the model, loading it in the calling thread if needed"""
+        entry = self._entry(name)
+        if entry.state == ModelState.READY:
+            return entry.model
+        with entry.lock:
+            if entry.state != ModelState.READY:
+                entry.state = ModelState.LOADING
+                started = time.perf_counter()
+                try:
+                    entry.model = entry.loader()
+                except Exception as exc:
+                    entry.state = ModelState.FAILED
+                    entry.error = f"{type(exc).__name__}: {exc}"
+                    raise
+                entry.load_seconds = time.perf_counter() - started
+                entry.loaded_at = time.time()
+                entry.error = None
+                entry.state = ModelState.READY
+        return entry.model
+
+    async def get(self, name: str) -> Any:
+        """Return the model, loading it off the event loop if needed"""
+        entry = self._entry(name)
+        if entry.state == ModelState.READY:
+            return entry.model
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="model-load")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.get_sync, name)
+
+    def start_warmup(self, names: Optional[Iterable[str]] = None) -> asyncio.Task:
+        """
+        Load models in the background without delaying startup
+
+        Failures are recorded in status() rather than raised.
+        """
+        targets = list(names) if names is not None else self.names()
+
+        async def _warm():
+            for name in targets:
+                try:
+                    await self.get(name)
+                except Exception:
+                    pass
+
+        self._warmup_task = asyncio.get_running_loop().create_task(_warm())
+        return self._warmup_task
+
+    def preload(self, names: Iterable[str], freeze: bool = True):
+        """
+        Load models synchronously before workers are forked
+
+        Called from the gunicorn master (``preload_app = True``). Freezing the
+        GC afterwards moves the loaded objects to the permanent generation so
+        worker collections do not touch, and therefore copy, their pages.
+        """
+        for name in names:
+            try:
+                self.get_sync(name)
+                self._entries[name].preforked = True
+            except Exception:
+                pass
+        if freeze:
+            gc.collect()
+            gc.freeze()
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """Load state and timings for every registered model"""
+        return {
+            name: {
+                "state": entry.state,
+                "load_seconds": round(entry.load_seconds, 3) if entry.load_seconds is not None else None,
+                "preforked": entry.preforked,
+                "error": entry.error,
+            }
+            for name, entry in self._entries.items()
+        }
+
+    async def close(self):
+        if self._warmup_task is not None and not self._warmup_task.done():
+            self._warmup_task.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+def _load_sentence_embedder():
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2"), device="cpu")
+
+
+def _load_spacy():
+    import spacy
+    return spacy.load(os.getenv("SPACY_MODEL", "en_core_web_sm"))
+
+
+def models_from_env(variable: str) -> List[str]:
+    """Parse a comma-separated model list such as MODEL_PRELOAD"""
+    return [name.strip() for name in os.getenv(variable, "").split(",") if name.strip()]
+
+
+# Global registry instance
+model_registry = ModelRegistry()
+model_registry.register("sentence_embedder", _load_sentence_embedder)
+model_registry.register("spacy", _load_spacy)
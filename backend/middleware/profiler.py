@@ -0,0 +1,249 @@
+"""
+Sampling Profiler
+Low-overhead stack sampling of a running worker, no restart required
+
+A background thread reads ``sys._current_frames()`` at a fixed interval and
+counts each distinct stack. Output is in collapsed-stack format
+(``frame;frame;frame count``), which flamegraph.pl, speedscope and
+inferno read directly.
+
+Stacks are attributed to the HTTP route being served through the request
+MetricsMiddleware registered for the enclosing ``MetricsMiddleware.__call__``
+frame, and to the service method through the code objects of ``@timed``
+wrappers, so a flame graph is rooted at
+``route:<template>;service:<Class.method>;...``. Frame locals of other
+threads are never read. Samples from threads that are only waiting (idle
+event loop, idle pool workers) are dropped by default.
+
+Profiles can also start automatically: a watchdog thread starts one as soon
+as an in-flight request has been running longer than PROFILE_SLOW_REQUEST_MS,
+so the slow request itself is sampled, subject to a cooldown.
+"""
+from typing import Any, Dict, List, Optional
+from collections import Counter, deque
+import itertools
+import os
+import sys
+import threading
+import time
+
+from middleware import metrics
+
+
+# Leaf frames meaning "blocked, not working": (filename suffix, function name)
+_IDLE_FRAMES = (
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("concurrent/futures/thread.py", "_worker"),
+    ("multiprocessing/connection.py", "_poll"),
+)
+
+_MIDDLEWARE_CODE = metrics.MetricsMiddleware.__call__.__code__
+
+
+class ProfileBusy(RuntimeError):
+    """Raised when a profile is requested while another one is running"""
+    pass
+
+
+def _is_idle(frame) -> bool:
+    filename = frame.f_code.co_filename.replace("\\", "/")
+    name = frame.f_code.co_name
+    return any(filename.endswith(suffix) and name == fn for suffix, fn in _IDLE_FRAMES)
+
+
+def _frame_label(frame) -> str:
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{frame.f_code.co_qualname}"
+
+
+def _collapse(frame, thread_name: str) -> str:
+    """Root-first ``;``-joined stack with route and service prefixes"""
+    labels: List[str] = []
+    route = None
+    services: List[str] = []
+    while frame is not None:
+        code = frame.f_code
+        if code is _MIDDLEWARE_CODE:
+            request = metrics.request_for_frame(frame)
+            if request is not None:
+                route = request[1]
+        else:
+            service = metrics.timed_name(code)
+            if service is not None:
+                services.append(service)
+            else:
+                labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    services.reverse()
+    prefix = [f"route:{route}" if route else f"thread:{thread_name}"]
+    prefix.extend(f"service:{s}" for s in services)
+    return ";".join(prefix + labels)
+
+
+class Profile:
+    """Result of one sampling run"""
+
+    def __init__(self, profile_id: int, interval: float, reason: str):
+        self.profile_id = profile_id
+        self.interval = interval
+        self.reason = reason
+        self.started_at = time.time()
+        self.duration = 0.0
+        self.samples = 0
+        self.stacks: Counter = Counter()
+        self.done = threading.Event()
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "profile_id": self.profile_id,
+            "reason": self.reason,
+            "started_at": self.started_at,
+            "duration_s": round(self.duration, 3),
+            "interval_ms": self.interval * 1000,
+            "samples": self.samples,
+            "distinct_stacks": len(self.stacks),
+        }
+
+
+class SamplingProfiler:
+    """
+    One profile at a time per worker; finished profiles are kept in a ring
+
+    Args:
+        max_profiles: Finished profiles retained for later download
+        slow_request_ms: Auto-profile once a request in flight has run longer (0 disables)
+        auto_seconds: Length of an automatically triggered profile
+        auto_cooldown: Minimum seconds between automatic profiles
+    """
+
+    def __init__(
+        self,
+        max_profiles: int = 10,
+        slow_request_ms: float = 0.0,
+        auto_seconds: float = 10.0,
+        auto_cooldown: float = 300.0
+    ):
+        self.slow_request_ms = slow_request_ms
+        self.auto_seconds = auto_seconds
+        self.auto_cooldown = auto_cooldown
+        self.exclude_prefix = "/api/admin"
+        self._profiles: "deque[Profile]" = deque(maxlen=max_profiles)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._running: Optional[Profile] = None
+        self._last_auto = 0.0
+        self._watchdog: Optional[threading.Thread] = None
+        self._watchdog_stop = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._running is not None
+
+    def start(
+        self,
+        seconds: float,
+        interval: float = 0.005,
+        include_idle: bool = False,
+        reason: str = "manual"
+    ) -> Profile:
+        """
+        Sample all threads for ``seconds`` in a daemon thread
+
+        Returns the profile at once; its ``done`` event is set and it is
+        stored for ``get`` when sampling finishes.
+
+        Raises:
+            ProfileBusy: if another profile is still running
+        """
+        with self._lock:
+            if self._running is not None:
+                raise ProfileBusy("A profile is already running on this worker")
+            profile = Profile(next(self._ids), interval, reason)
+            self._running = profile
+        threading.Thread(
+            target=self._sample, args=(profile, seconds, include_idle),
+            name="sampling-profiler", daemon=True
+        ).start()
+        return profile
+
+    def _sample(self, profile: Profile, seconds: float, include_idle: bool):
+        own_id = threading.get_ident()
+        started = time.perf_counter()
+        deadline = started + seconds
+        try:
+            while time.perf_counter() < deadline:
+                names = {t.ident: t.name for t in threading.enumerate()}
+                for thread_id, frame in sys._current_frames().items():
+                    if thread_id == own_id or (not include_idle and _is_idle(frame)):
+                        continue
+                    profile.stacks[_collapse(frame, names.get(thread_id, str(thread_id)))] += 1
+                profile.samples += 1
+                time.sleep(profile.interval)
+        finally:
+            profile.duration = time.perf_counter() - started
+            with self._lock:
+                self._profiles.append(profile)
+                self._running = None
+            profile.done.set()
+
+    def get(self, profile_id: int) -> Optional[Profile]:
+        for profile in self._profiles:
+            if profile.profile_id == profile_id:
+                return profile
+        return None
+
+    def list(self) -> List[Dict[str, Any]]:
+        return [p.summary() for p in reversed(self._profiles)]
+
+    def start_watchdog(self):
+        """Watch in-flight requests in a daemon thread; no-op if auto-profiling is off"""
+        if not self.slow_request_ms or self._watchdog is not None:
+            return
+        self._watchdog_stop.clear()
+        self._watchdog = threading.Thread(target=self._watch, name="profiler-watchdog", daemon=True)
+        self._watchdog.start()
+
+    def stop_watchdog(self):
+        if self._watchdog is not None:
+            self._watchdog_stop.set()
+            self._watchdog.join()
+            self._watchdog = None
+
+    def _watch(self):
+        # A thread, not a task: the slow request may be blocking the event loop
+        poll = max(0.01, self.slow_request_ms / 4000)
+        while not self._watchdog_stop.wait(poll):
+            self.check_requests()
+
+    def check_requests(self) -> Optional[Profile]:
+        """Start an automatic profile if a request in flight is over the threshold"""
+        now = time.perf_counter()
+        for method, route, started in metrics.active_requests():
+            age_ms = (now - started) * 1000
+            # Profiling requests are slow by design
+            if age_ms < self.slow_request_ms or route.startswith(self.exclude_prefix):
+                continue
+            if self._running is not None or time.monotonic() - self._last_auto < self.auto_cooldown:
+                return None
+            self._last_auto = time.monotonic()
+            try:
+                return self.start(self.auto_seconds, reason=f"slow {method} {route} (running {age_ms:.0f} ms)")
+            except ProfileBusy:
+                return None
+        return None
+
+
+# Global profiler instance
+profiler = SamplingProfiler(
+    max_profiles=int(os.getenv("PROFILE_MAX_STORED", 10)),
+    slow_request_ms=float(os.getenv("PROFILE_SLOW_REQUEST_MS", 0)),
+    auto_seconds=float(os.getenv("PROFILE_AUTO_SECONDS", 10)),
+    auto_cooldown=float(os.getenv("PROFILE_AUTO_COOLDOWN", 300)),
+)
@@ -0,0 +1,12 @@
+-- 版本增量 / Version deltas
+-- 创建时间 / Created: 2026-10-19
+
+-- PATCH更新保存编辑操作 / PATCH updates store their edit operations
+ALTER TABLE article_versions ADD COLUMN IF NOT EXISTS base_version INTEGER;
+ALTER TABLE article_versions ADD COLUMN IF NOT EXISTS delta JSONB;
+
+ALTER TABLE article_versions ADD CONSTRAINT delta_has_base
+    CHECK (delta IS NULL OR base_version IS NOT NULL);
+
+-- 完成 / Done
+SELECT 'Version delta columns added' AS status;
@@ -3,7 +3,7 @@ Article Model - Database schema for articles
 Manages the lifecycle of academic articles including version control
 """
 from datetime import datetime
-from typing import Optional, List
+from typing import Dict, Literal, Optional, List
 from pydantic import BaseModel, Field
 from enum import Enum
 
@@ -28,6 +28,47 @@ class TemplateType(str, Enum):
     GENERIC = "Generic"
 
 
+class TextMetrics(BaseModel):
+    """Readability and style statistics for a piece of text"""
+    word_count: int = 0
+    sentence_count: int = 0
+    syllable_count: int = 0
+    avg_word_length: float = 0.0
+    avg_sentence_length: float = 0.0
+    sentence_length_std: float = 0.0
+    sentence_length_percentiles: Dict[str, float] = Field(
+        default_factory=dict, description="p25/p50/p75/p90 sentence length in words"
+    )
+    sentence_length_histogram: Dict[str, int] = Field(
+        default_factory=dict, description="Sentence counts per length bucket (words)"
+    )
+    flesch_reading_ease: float = 0.0
+    flesch_kincaid_grade: float = 0.0
+    gunning_fog: float = 0.0
+    passive_ratio: float = Field(0.0, description="Share of sentences with a passive construction")
+    lexical_density: float = Field(0.0, description="Share of content (non-function) words")
+    type_token_ratio: float = 0.0
+    long_word_ratio: float = Field(0.0, description="Share of words with three or more syllables")
+    contraction_ratio: float = 0.0
+    formality_score: float = 0.0
+    clarity_score: float = 0.0
+
+
+class EditOperation(BaseModel):
+    """
+    One text edit
+
+    - insert: insert ``text`` at ``position``
+    - delete: remove ``length`` characters at ``position``
+    - replace: replace ``length`` characters at ``position`` with ``text``
+    - set: replace the whole document with ``text``
+    """
+    op: Literal["insert", "delete", "replace", "set"]
+    position: int = 0
+    length: int = 0
+    text: str = ""
+
+
 class ArticleVersion(BaseModel):
     """Version control for article revisions"""
     version_id: str = Field(..., description="Unique version identifier")
@@ -36,6 +77,11 @@ class ArticleVersion(BaseModel):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     changes_summary: Optional[str] = Field(None, description="Summary of changes in this version")
     author: str = Field(..., description="Author of this version")
+    metrics: Optional[TextMetrics] = Field(None, description="Text metrics computed when the version was written")
+    base_version: Optional[int] = Field(None, description="Version the delta applies to")
+    delta: Optional[List[EditOperation]] = Field(
+        None, description="Edit operations turning base_version into this version (patch updates only)"
+    )
 
 
 class Article(BaseModel):
@@ -87,6 +133,58 @@ class ArticleUpdate(BaseModel):
     keywords: Optional[List[str]] = None
     references: Optional[List[str]] = None
     changes_summary: Optional[str] = Field(None, description="Summary of changes for version control")
+    checkpoint: bool = Field(False, description="Write a version now instead of coalescing with recent autosaves")
+    expected_version: Optional[int] = Field(None, description="Reject the update unless this is the current version")
+
+
+class DiffGranularity(str, Enum):
+    """Token unit of a version diff"""
+    LINE = "line"
+    WORD = "word"
+
+
+class DiffHunk(BaseModel):
+    """Unified-style hunk; each line starts with ' ' (context), '-' or '+'"""
+    old_start: int
+    old_lines: int
+    new_start: int
+    new_lines: int
+    lines: List[str]
+
+
+class DiffChange(BaseModel):
+    """Word-level replacement at character offsets"""
+    old_offset: int
+    old_text: str
+    new_offset: int
+    new_text: str
+
+
+class VersionDiff(BaseModel):
+    """Changes between two versions of an article"""
+    article_id: str
+    from_version: int
+    to_version: int
+    granularity: DiffGranularity
+    added: int = Field(0, description="Lines (or words) added")
+    removed: int = Field(0, description="Lines (or words) removed")
+    hunks: List[DiffHunk] = Field(default_factory=list, description="Line granularity only")
+    changes: List[DiffChange] = Field(default_factory=list, description="Word granularity only")
+
+
+class ArticlePatch(BaseModel):
+    """
+    Schema for a partial content update
+
+    Send either ``operations`` (applied in order) or ``patch`` (a unified
+    diff), both relative to ``base_version``.
+    """
+    base_version: int = Field(..., ge=1, description="Version the edits were made against")
+    operations: List[EditOperation] = Field(default_factory=list)
+    patch: Optional[str] = Field(None, description="Unified diff against base_version")
+    rebase: bool = Field(True, description="Merge onto newer versions instead of rejecting a stale base")
+    changes_summary: Optional[str] = Field(None, description="Summary of changes for version control")
+    checkpoint: bool = Field(False, description="Write a version now instead of coalescing with recent autosaves")
 
 
 class ArticleResponse(BaseModel):
@@ -97,3 +195,20 @@ class ArticleResponse(BaseModel):
     current_version: int
     created_at: datetime
     updated_at: datetime
+
+
+class ArticleSearchHit(BaseModel):
+    """One ranked full-text search result"""
+    article_id: str
+    title: str
+    status: ArticleStatus
+    updated_at: datetime
+    rank: float = Field(..., description="Relevance; higher is better, comparable within one query only")
+    snippet: str = Field("", description="Content excerpt with matches wrapped in <b></b> (HTML-escaped)")
+
+
+class ArticleSearchResults(BaseModel):
+    """A page of full-text search results"""
+    query: str
+    total: int = Field(..., description="Matching articles across all pages")
+    hits: List[ArticleSearchHit] = Field(default_factory=list)
@@ -0,0 +1,376 @@
+"""
+Article Search
+Ranked full-text search over articles, with highlighted snippets
+
+Two backends sit behind ``ArticleSearchBackend``:
+
+- ``PostgresArticleSearch`` queries the ``articles`` table with
+  ``websearch_to_tsquery``, ranks with ``ts_rank`` (title weighted above
+  content) and highlights with ``ts_headline``. Its WHERE clause repeats
+  the ``to_tsvector('english', ...)`` expressions of the GIN indexes in
+  ``migrations/001_init.sql`` so the planner can use them.
+- ``InMemoryArticleSearch`` keeps an inverted index over the dict-backed
+  article store, ranks with BM25 (title terms count extra) and builds the
+  same kind of snippet. Writes only mark an article dirty; it is
+  re-tokenized on the next search, so frequent autosaves stay cheap.
+
+Both accept the same query syntax, a subset of ``websearch_to_tsquery``:
+words are ANDed, ``or`` separates alternatives and ``-word`` excludes.
+Quoted phrases are matched as their words, not as adjacent words, in memory.
+"""
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import html
+import math
+import os
+import re
+
+from models.article import Article, ArticleSearchHit, ArticleSearchResults, ArticleStatus
+
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Highlight markers and snippet length, as ts_headline's defaults
+START_SEL, STOP_SEL = "<b>", "</b>"
+# Placeholders ts_headline emits instead, swapped for the tags after escaping
+_START_MARK, _STOP_MARK = "\x02", "\x03"
+HEADLINE_MAX_WORDS = 35
+
+_STOP_WORDS = frozenset("""
+a about above after again against all am an and any are as at be because been before being below
+between both but by can did do does doing down during each few for from further had has have having
+he her here hers herself him himself his how i if in into is it its itself just me more most my myself
+no nor not now of off on once only or other our ours ourselves out over own same she should so some
+such than that the their theirs them themselves then there these they this those through to too under
+until up very was we were what when where which while who whom why will with you your yours yourself
+""".split())
+
+# Longest first; a suffix is stripped only if at least three letters remain
+_SUFFIXES = (
+    "ational", "ization", "fulness", "iveness", "ations", "ingly", "ation",
+    "ments", "ness", "ment", "ings", "edly", "ing", "ies", "ed", "es", "ly", "s",
+)
+
+
+def stem(word: str) -> str:
+    """
+    Light suffix-stripping stemmer for lower-case English words
+
+    A rough stand-in for the Snowball stemmer behind Postgres' ``english``
+    configuration: enough to match plurals and common inflections.
+    """
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            if suffix == "s" and word[-2] in "siu":
+                # class, analysis, status
+                return word
+            return word[:-len(suffix)] + ("y" if suffix == "ies" else "")
+    return word
+
+
+def _stems(text: str) -> Iterable[str]:
+    for word in _TOKEN_RE.findall(text.lower()):
+        if word not in _STOP_WORDS:
+            yield stem(word)
+
+
+def parse_query(query: str) -> Tuple[List[List[str]], Set[str]]:
+    """
+    Alternatives of required stems, and excluded stems
+
+    ``climate models or "sea level" -ice`` gives
+    ``([["climate", "model"], ["sea", "level"]], {"ice"})``.
+    """
+    groups: List[List[str]] = [[]]
+    excluded: Set[str] = set()
+    for part in query.replace('"', " ").split():
+        if part.lower() == "or":
+            if groups[-1]:
+                groups.append([])
+            continue
+        if part.startswith("-"):
+            excluded.update(_stems(part[1:]))
+        else:
+            groups[-1].extend(_stems(part))
+    return [group for group in groups if group], excluded
+
+
+def headline(text: str, stems: Set[str], max_words: int = HEADLINE_MAX_WORDS) -> str:
+    """
+    Excerpt of ``text`` around the densest run of matching words, matches highlighted
+
+    The result is HTML: the text is escaped and only the highlight tags are
+    markup. Starts at the beginning of the text if nothing matches.
+    """
+    words = list(_TOKEN_RE.finditer(text))
+    if not words:
+        return ""
+    matches = [i for i, word in enumerate(words) if stem(word.group().lower()) in stems]
+
+    start = 0
+    if matches:
+        # Window of max_words words holding the most matches
+        best, best_count, first = matches[0], 0, 0
+        for i, last in enumerate(matches):
+            while matches[first] <= last - max_words:
+                first += 1
+            if i - first + 1 > best_count:
+                best, best_count = matches[first], i - first + 1
+        start = max(0, min(best - 2, len(words) - max_words))
+    end = min(len(words), start + max_words)
+
+    matched = set(matches)
+    parts = []
+    position = words[start].start()
+    for i in range(start, end):
+        word = words[i]
+        parts.append(html.escape(text[position:word.start()]))
+        if i in matched:
+            parts.append(f"{START_SEL}{html.escape(word.group())}{STOP_SEL}")
+        else:
+            parts.append(html.escape(word.group()))
+        position = word.end()
+    return "".join(parts)
+
+
+class ArticleSearchBackend(ABC):
+    """Full-text search over articles; the article service reports every write"""
+
+    async def connect(self):
+        """Open connections; called at startup"""
+
+    async def disconnect(self):
+        """Close connections; called at shutdown"""
+
+    @abstractmethod
+    def index(self, article: Article):
+        """Article was created or changed"""
+
+    @abstractmethod
+    def remove(self, article_id: str):
+        """Article was deleted"""
+
+    @abstractmethod
+    async def search(
+        self,
+        query: str,
+        status: Optional[ArticleStatus] = None,
+        limit: int = 20,
+        offset: int = 0
+    ) -> ArticleSearchResults:
+        """Matching articles, best first"""
+
+
+class InMemoryArticleSearch(ArticleSearchBackend):
+    """
+    Inverted index over the in-process article store
+
+    Args:
+        title_weight: How many content occurrences one title occurrence is worth
+        k1, b: BM25 term-frequency saturation and length normalization
+    """
+
+    def __init__(self, title_weight: float = 3.0, k1: float = 1.2, b: float = 0.75):
+        self.title_weight = title_weight
+        self.k1 = k1
+        self.b = b
+        self._articles: Dict[str, Article] = {}
+        self._dirty: Set[str] = set()
+        # stem -> {article_id: weighted term frequency}
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._terms: Dict[str, Tuple[str, ...]] = {}
+        self._lengths: Dict[str, float] = {}
+        self._total_length = 0.0
+
+    def index(self, article: Article):
+        self._articles[article.article_id] = article
+        self._dirty.add(article.article_id)
+
+    def remove(self, article_id: str):
+        self._articles.pop(article_id, None)
+        self._dirty.discard(article_id)
+        self._unindex(article_id)
+
+    def _unindex(self, article_id: str):
+        for term in self._terms.pop(article_id, ()):
+            postings = self._postings[term]
+            del postings[article_id]
+            if not postings:
+                del self._postings[term]
+        self._total_length -= self._lengths.pop(article_id, 0.0)
+
+    def _refresh(self):
+        """Re-tokenize articles written since the last search"""
+        for article_id in self._dirty:
+            self._unindex(article_id)
+            article = self._articles[article_id]
+            counts: Counter = Counter(_stems(article.content))
+            for term in _stems(article.title):
+                counts[term] += self.title_weight
+            for term, count in counts.items():
+                self._postings.setdefault(term, {})[article_id] = count
+            self._terms[article_id] = tuple(counts)
+            self._lengths[article_id] = length = float(sum(counts.values()))
+            self._total_length += length
+        self._dirty.clear()
+
+    def _scores(self, groups: List[List[str]]) -> Dict[str, float]:
+        """BM25 score of every article matching at least one group"""
+        count = len(self._lengths)
+        average_length = self._total_length / count if count else 1.0
+        scores: Dict[str, float] = {}
+        for group in groups:
+            postings = [self._postings.get(term, {}) for term in set(group)]
+            postings.sort(key=len)
+            if not postings[0]:
+                continue
+            # Intersect starting from the rarest term
+            candidates = set(postings[0]).intersection(*postings[1:])
+            weights = [math.log(1 + (count - len(p) + 0.5) / (len(p) + 0.5)) for p in postings]
+            for article_id in candidates:
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[article_id] / average_length)
+                score = sum(
+                    weight * p[article_id] * (self.k1 + 1) / (p[article_id] + norm)
+                    for weight, p in zip(weights, postings)
+                )
+                scores[article_id] = max(score, scores.get(article_id, 0.0))
+        return scores
+
+    async def search(
+        self,
+        query: str,
+        status: Optional[ArticleStatus] = None,
+        limit: int = 20,
+        offset: int = 0
+    ) -> ArticleSearchResults:
+        self._refresh()
+        groups, excluded = parse_query(query)
+        scores = self._scores(groups) if groups else {}
+        for term in excluded:
+            for article_id in self._postings.get(term, ()):
+                scores.pop(article_id, None)
+        if status is not None:
+            scores = {a: s for a, s in scores.items() if self._articles[a].status == status}
+
+        ranked = sorted(
+            scores.items(),
+            key=lambda item: (-item[1], -self._articles[item[0]].updated_at.timestamp())
+        )
+        stems = {term for group in groups for term in group}
+        hits = []
+        for article_id, score in ranked[offset:offset + limit]:
+            article = self._articles[article_id]
+            hits.append(ArticleSearchHit(
+                article_id=article_id,
+                title=article.title,
+                status=article.status,
+                updated_at=article.updated_at,
+                rank=round(score, 6),
+                snippet=headline(article.content, stems)
+            ))
+        return ArticleSearchResults(query=query, total=len(ranked), hits=hits)
+
+
+# Snippets are built only for the page, after ranking and LIMIT. ts_headline
+# marks matches with placeholders (stripped from the content first) so the
+# snippet can be HTML-escaped before the real tags go in.
+_SEARCH_SQL = """
+SELECT article_id, title, status, updated_at, rank, total,
+       ts_headline('english', translate(content, :marks, ''), query, :headline_options) AS snippet
+FROM (
+    SELECT a.article_id::text AS article_id, a.title, a.status, a.updated_at, a.content, q.query,
+           ts_rank(setweight(to_tsvector('english', a.title), 'A') ||
+                   setweight(to_tsvector('english', a.content), 'D'), q.query) AS rank,
+           count(*) OVER () AS total
+    FROM articles a, websearch_to_tsquery('english', :query) AS q(query)
+    WHERE (to_tsvector('english', a.title) @@ q.query OR to_tsvector('english', a.content) @@ q.query)
+    {status_filter}
+    ORDER BY rank DESC, a.updated_at DESC
+    LIMIT :limit OFFSET :offset
+) AS page
+ORDER BY rank DESC, updated_at DESC
+"""
+
+
+def _escape_headline(snippet: str) -> str:
+    """HTML-escape a ts_headline snippet and turn its placeholders into tags"""
+    return html.escape(snippet).replace(_START_MARK, START_SEL).replace(_STOP_MARK, STOP_SEL)
+
+
+class PostgresArticleSearch(ArticleSearchBackend):
+    """
+    Search the ``articles`` table with the GIN tsvector indexes
+
+    The table's indexes are maintained by Postgres, so ``index`` and
+    ``remove`` have nothing to do.
+    """
+
+    def __init__(self, database_url: str):
+        self.database_url = database_url
+        self._database = None
+
+    async def connect(self):
+        from databases import Database
+        self._database = Database(self.database_url)
+        await self._database.connect()
+
+    async def disconnect(self):
+        if self._database is not None:
+            await self._database.disconnect()
+            self._database = None
+
+    def index(self, article: Article):
+        pass
+
+    def remove(self, article_id: str):
+        pass
+
+    async def search(
+        self,
+        query: str,
+        status: Optional[ArticleStatus] = None,
+        limit: int = 20,
+        offset: int = 0
+    ) -> ArticleSearchResults:
+        if self._database is None:
+            raise RuntimeError("PostgresArticleSearch is not connected")
+        values = {
+            "query": query,
+            "limit": limit,
+            "offset": offset,
+            "marks": _START_MARK + _STOP_MARK,
+            "headline_options": (
+                f'StartSel="{_START_MARK}", StopSel="{_STOP_MARK}", '
+                f"MaxWords={HEADLINE_MAX_WORDS}, MinWords=15"
+            ),
+        }
+        status_filter = ""
+        if status is not None:
+            status_filter = "AND a.status = :status"
+            values["status"] = ArticleStatus(status).value
+        rows = await self._database.fetch_all(_SEARCH_SQL.format(status_filter=status_filter), values)
+        hits = [
+            ArticleSearchHit(
+                article_id=row["article_id"],
+                title=row["title"],
+                status=row["status"],
+                updated_at=row["updated_at"],
+                rank=row["rank"],
+                snippet=_escape_headline(row["snippet"] or "")
+            )
+            for row in rows
+        ]
+        return ArticleSearchResults(query=query, total=rows[0]["total"] if rows else 0, hits=hits)
+
+
+def search_backend_from_env() -> ArticleSearchBackend:
+    """
+    Backend selected by ARTICLE_SEARCH_BACKEND
+
+    ``postgres`` searches the articles table at DATABASE_URL; anything else
+    (default ``memory``) indexes the in-process article store.
+    """
+    if os.getenv("ARTICLE_SEARCH_BACKEND", "memory").strip().lower() == "postgres":
+        return PostgresArticleSearch(os.getenv("DATABASE_URL", ""))
+    return InMemoryArticleSearch()
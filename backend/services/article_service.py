@@ -3,21 +3,190 @@ Article Management Service
 Handles article CRUD operations, version control, and document organization
 """
 from typing import List, Optional, Dict
+from collections import OrderedDict
 from datetime import datetime
+import asyncio
+import hashlib
+import os
+import threading
+import time
 import uuid
 from models.article import (
-    Article, ArticleCreate, ArticleUpdate, 
-    ArticleVersion, ArticleStatus, ArticleResponse
+    Article, ArticleCreate, ArticleUpdate, ArticlePatch,
+    ArticleVersion, ArticleStatus, ArticleResponse, ArticleSearchResults, TextMetrics, EditOperation,
+    DiffChange, DiffGranularity, DiffHunk, VersionDiff
 )
+from middleware.cpu_executor import cpu_executor
+from middleware.metrics import timed
+from services.article_search import ArticleSearchBackend, InMemoryArticleSearch, search_backend_from_env
+from services.text_diff import diff_lines, diff_words
+from services.text_metrics import compute_metrics, metrics_cache
+from services.text_ops import EditConflict, apply_operations, operations_from_patch, rebase
+
+
+# Versions never change once written, so caches may keep them indefinitely
+VERSION_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Articles change; clients must revalidate with If-None-Match
+ARTICLE_CACHE_CONTROL = "no-cache"
+
+
+def _etag(*parts) -> str:
+    digest = hashlib.blake2b(":".join(map(str, parts)).encode("utf-8"), digest_size=16)
+    return '"' + digest.hexdigest() + '"'
+
+
+def article_etag(article) -> str:
+    """Strong ETag of an article, from metadata only (Article or ArticleResponse)"""
+    return _etag(article.article_id, article.current_version, article.updated_at.isoformat())
+
+
+def history_etag(article_id: str, version_count: int) -> str:
+    """ETag of the version list, which only changes when a version is added"""
+    return _etag(article_id, "versions", version_count)
+
+
+def version_etag(article_id: str, version_number: int) -> str:
+    """Immutable ETag of one version"""
+    return _etag(article_id, "version", version_number)
+
+
+def diff_etag(article_id: str, from_version: int, to_version: int, granularity: str, context: int) -> str:
+    """Immutable ETag of a diff between two (immutable) versions"""
+    return _etag(article_id, "diff", from_version, to_version, granularity, context)
+
+
+class DiffCache:
+    """LRU of version diffs; versions never change, so entries never go stale"""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, VersionDiff]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple) -> Optional[VersionDiff]:
+        with self._lock:
+            diff = self._entries.get(key)
+            if diff is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+            return diff
+
+    def put(self, key: tuple, diff: VersionDiff):
+        with self._lock:
+            self._entries[key] = diff
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard_article(self, article_id: str):
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == article_id]:
+                del self._entries[key]
+
+
+class LockStripes:
+    """
+    Fixed pool of asyncio locks shared by key hash
+    
+    Writes to one article are serialized while different articles mostly
+    proceed in parallel, without keeping a lock per article alive. Never
+    hold two stripes at once: two keys may share one.
+    """
+
+    def __init__(self, stripes: int = 64):
+        self._locks = [asyncio.Lock() for _ in range(max(1, stripes))]
+
+    def __call__(self, key: str) -> asyncio.Lock:
+        return self._locks[hash(key) % len(self._locks)]
+
+
+class PreconditionFailed(Exception):
+    """A write's expected version or ETag does not match the article"""
+
+    def __init__(self, message: str, etag: str):
+        super().__init__(message)
+        self.etag = etag
+
+
+class PendingSave:
+    """Content changes held back so a burst of autosaves becomes one version"""
+
+    __slots__ = ("author", "base_version", "delta", "changes_summary", "started_at", "saves")
+
+    def __init__(self, author: str, base_version: int):
+        self.author = author
+        self.base_version = base_version
+        # Operations since base_version; None once a full-content write is absorbed
+        self.delta: Optional[List[EditOperation]] = []
+        self.changes_summary: Optional[str] = None
+        self.started_at = time.monotonic()
+        self.saves = 0
 
 
 class ArticleService:
-    """Service for managing articles with version control"""
+    """
+    Service for managing articles with version control
+    
+    Args:
+        autosave_window: Seconds during which content changes by the same
+            author are coalesced into one version (0 writes every change)
+        search_index: Full-text search backend (in-memory index by default)
+    """
     
-    def __init__(self):
+    def __init__(self, autosave_window: float = 0.0, search_index: Optional[ArticleSearchBackend] = None):
         # In-memory storage (replace with database in production)
         self.articles: Dict[str, Article] = {}
+        self.diff_cache = DiffCache(int(os.getenv("DIFF_CACHE_SIZE", 256)))
+        # Held by every write; reads never wait
+        self.locks = LockStripes(int(os.getenv("ARTICLE_LOCK_STRIPES", 64)))
+        self.autosave_window = autosave_window
+        self.pending: Dict[str, PendingSave] = {}
+        self.coalesced_saves = 0
+        self.flushed_versions = 0
+        self.search_index = search_index or InMemoryArticleSearch()
     
+    def autosave_stats(self) -> Dict[str, int]:
+        return {
+            "pending": len(self.pending),
+            "coalesced_saves": self.coalesced_saves,
+            "flushed_versions": self.flushed_versions,
+        }
+    
+    @staticmethod
+    def _check_preconditions(
+        article: Article,
+        expected_version: Optional[int],
+        expected_etags: Optional[List[str]]
+    ):
+        """
+        Check a write's preconditions against the article
+        
+        Raises:
+            PreconditionFailed: if ``expected_version`` is not the current
+                version or no ``expected_etags`` entry is the current ETag
+                (``"*"``, from ``If-Match: *``, matches any)
+        """
+        etag = article_etag(article)
+        if expected_version is not None and expected_version != article.current_version:
+            raise PreconditionFailed(
+                f"Expected version {expected_version}, current version is {article.current_version}", etag
+            )
+        if expected_etags is not None and "*" not in expected_etags and etag not in expected_etags:
+            raise PreconditionFailed("Article has changed since it was read", etag)
+    
+    async def _measure(self, content: str) -> TextMetrics:
+        """Text metrics for a version being written, reusing cached results"""
+        metrics = metrics_cache.get(content)
+        if metrics is None:
+            metrics = await cpu_executor.run(compute_metrics, content, size=len(content))
+            metrics_cache.put(content, metrics)
+        return metrics
+    
+    @timed("article")
     async def create_article(self, article_data: ArticleCreate, author: str) -> Article:
         """
         Create a new article with initial version
@@ -37,7 +206,8 @@ class ArticleService:
             version_number=1,
             content=article_data.content,
             author=author,
-            changes_summary="Initial version"
+            changes_summary="Initial version",
+            metrics=await self._measure(article_data.content)
         )
         
         article = Article(
@@ -53,12 +223,35 @@ class ArticleService:
         )
         
         self.articles[article_id] = article
+        self.search_index.index(article)
         return article
     
+    @timed("article")
     async def get_article(self, article_id: str) -> Optional[Article]:
         """Retrieve an article by ID"""
         return self.articles.get(article_id)
     
+    @timed("article")
+    async def get_article_summary(self, article_id: str) -> Optional[ArticleResponse]:
+        """
+        Article metadata without content or versions
+        
+        Enough to compute ETags and answer conditional requests; with a
+        database this is a metadata-only query.
+        """
+        article = self.articles.get(article_id)
+        if not article:
+            return None
+        return ArticleResponse.model_construct(
+            article_id=article.article_id,
+            title=article.title,
+            status=article.status,
+            current_version=article.current_version,
+            created_at=article.created_at,
+            updated_at=article.updated_at
+        )
+    
+    @timed("article")
     async def list_articles(
         self, 
         status: Optional[ArticleStatus] = None,
@@ -86,80 +279,302 @@ class ArticleService:
         
         return articles[skip:skip + limit]
     
+    @timed("article")
+    async def search_articles(
+        self,
+        query: str,
+        status: Optional[ArticleStatus] = None,
+        limit: int = 20,
+        offset: int = 0
+    ) -> ArticleSearchResults:
+        """
+        Ranked full-text search over titles and content
+        
+        Args:
+            query: Words to match (all of them); ``or`` separates
+                alternatives and ``-word`` excludes
+            status: Only articles with this status
+        """
+        return await self.search_index.search(query, status, limit, offset)
+    
+    @timed("article")
     async def update_article(
         self, 
         article_id: str, 
         update_data: ArticleUpdate,
-        author: str
+        author: str,
+        expected_etags: Optional[List[str]] = None
     ) -> Optional[Article]:
         """
         Update an article and create a new version if content changed
         
         Args:
             article_id: ID of article to update
-            update_data: Update data
+            update_data: Update data, including its ``expected_version`` precondition
             author: Author making the update
+            expected_etags: If-Match ETags, one of which must be current
             
         Returns:
             Updated article or None if not found
+            
+        Raises:
+            PreconditionFailed: if the article is not at the expected version or ETag
+            EditConflict: if another author's changes are pending and no ETag was given
         """
-        article = self.articles.get(article_id)
-        if not article:
-            return None
+        async with self.locks(article_id):
+            article = self.articles.get(article_id)
+            if not article:
+                return None
+            self._check_preconditions(article, update_data.expected_version, expected_etags)
+            
+            # Track if content changed for version control
+            content_changed = False
+            if update_data.content is not None and update_data.content != article.content:
+                await self._flush_other_author(article_id, author, expected_etags)
+            
+            # Update fields
+            if update_data.title is not None:
+                article.title = update_data.title
+            if update_data.abstract is not None:
+                article.abstract = update_data.abstract
+            if update_data.content is not None and update_data.content != article.content:
+                content_changed = True
+                article.content = update_data.content
+            if update_data.status is not None:
+                article.status = update_data.status
+            if update_data.template is not None:
+                article.template = update_data.template
+            if update_data.authors is not None:
+                article.authors = update_data.authors
+            if update_data.keywords is not None:
+                article.keywords = update_data.keywords
+            if update_data.references is not None:
+                article.references = update_data.references
+            
+            article.updated_at = datetime.utcnow()
+            self.search_index.index(article)
+            
+            # Create new version if content changed
+            if content_changed:
+                await self._record_change(article, author, update_data.changes_summary, None, update_data.checkpoint)
+            elif update_data.checkpoint:
+                await self._flush(article_id)
+            
+            # Update status-specific timestamps
+            if update_data.status == ArticleStatus.SUBMITTED and not article.submitted_at:
+                article.submitted_at = datetime.utcnow()
+            elif update_data.status == ArticleStatus.PUBLISHED and not article.published_at:
+                article.published_at = datetime.utcnow()
+            
+            return article
+    
+    @timed("article")
+    async def patch_article(
+        self,
+        article_id: str,
+        patch: ArticlePatch,
+        author: str,
+        expected_etags: Optional[List[str]] = None
+    ) -> Optional[Article]:
+        """
+        Apply text operations (or a unified diff) made against ``base_version``
         
-        # Track if content changed for version control
-        content_changed = False
-        
-        # Update fields
-        if update_data.title is not None:
-            article.title = update_data.title
-        if update_data.abstract is not None:
-            article.abstract = update_data.abstract
-        if update_data.content is not None and update_data.content != article.content:
-            content_changed = True
-            old_content = article.content
-            article.content = update_data.content
-        if update_data.status is not None:
-            article.status = update_data.status
-        if update_data.template is not None:
-            article.template = update_data.template
-        if update_data.authors is not None:
-            article.authors = update_data.authors
-        if update_data.keywords is not None:
-            article.keywords = update_data.keywords
-        if update_data.references is not None:
-            article.references = update_data.references
-        
-        # Create new version if content changed
-        if content_changed:
-            new_version_number = article.current_version + 1
-            new_version = ArticleVersion(
-                version_id=str(uuid.uuid4()),
-                version_number=new_version_number,
-                content=article.content,
-                author=author,
-                changes_summary=update_data.changes_summary or f"Version {new_version_number} update"
-            )
-            article.versions.append(new_version)
-            article.current_version = new_version_number
+        The new content is built from the edit, and the operations turning
+        the previous version into the new one are stored as the version's
+        delta. If the article has moved past the base version the edit is
+        merged onto the current content, unless ``patch.rebase`` is false.
+        An edit that changes nothing creates no version.
+        
+        Args:
+            article_id: ID of article to patch
+            patch: Operations or unified diff relative to ``patch.base_version``
+            author: Author making the update
+            expected_etags: If-Match ETags, one of which must be current
+            
+        Returns:
+            Updated article or None if the article or base version is not found
+            
+        Raises:
+            PreconditionFailed: if the article is not at an expected ETag
+            EditConflict: if the base is stale and the edit cannot be merged, or
+                another author's changes are pending and no ETag was given
+            EditError: if the operations or diff do not apply to the base version
+        """
+        async with self.locks(article_id):
+            article = self.articles.get(article_id)
+            if not article or patch.base_version > article.current_version:
+                return None
+            self._check_preconditions(article, None, expected_etags)
+            base_version = patch.base_version
+            # At the current version the edit was made against the article as
+            # read, pending text included, which the flush stores as a new version
+            at_current = base_version == article.current_version
+            await self._flush_other_author(article_id, author, expected_etags)
+            current_version, current_content = article.current_version, article.content
+            if at_current:
+                base_version = current_version
+            
+            if base_version == current_version:
+                base_content = current_content
+            else:
+                base = await self.get_article_version(article_id, base_version)
+                if not base:
+                    return None
+                base_content = base.content
+            
+            size = len(base_content)
+            if patch.patch is not None:
+                operations = await cpu_executor.run(operations_from_patch, base_content, patch.patch, size=size)
+            else:
+                operations = patch.operations
+            edited = apply_operations(base_content, operations)
+            
+            if base_version != current_version:
+                if not patch.rebase:
+                    raise EditConflict(
+                        f"Base version {base_version} is stale; "
+                        f"current version is {current_version}"
+                    )
+                size += len(current_content) + len(edited)
+                edited, operations = await cpu_executor.run(
+                    rebase, base_content, current_content, edited, size=size
+                )
+            
+            if edited == current_content:
+                if patch.checkpoint:
+                    await self._flush(article_id)
+                return article
+            
+            article.content = edited
+            article.updated_at = datetime.utcnow()
+            self.search_index.index(article)
+            await self._record_change(article, author, patch.changes_summary, operations, patch.checkpoint)
+            
+            return article
+    
+    async def _flush_other_author(self, article_id: str, author: str, expected_etags: Optional[List[str]]):
+        """
+        A different author's pending changes become their own version first
         
-        article.updated_at = datetime.utcnow()
+        Pending text is in ``article.content`` but in no stored version, so
+        only an If-Match ETag (which changes with every save) shows the
+        writer saw it; without one the write is rejected.
         
-        # Update status-specific timestamps
-        if update_data.status == ArticleStatus.SUBMITTED and not article.submitted_at:
-            article.submitted_at = datetime.utcnow()
-        elif update_data.status == ArticleStatus.PUBLISHED and not article.published_at:
-            article.published_at = datetime.utcnow()
+        Raises:
+            EditConflict: if another author's changes are pending and no ETag was given
+        """
+        pending = self.pending.get(article_id)
+        if pending is not None and pending.author != author:
+            if expected_etags is None:
+                raise EditConflict(
+                    f"Unsaved changes by {pending.author} are pending; resend with If-Match"
+                )
+            await self._flush(article_id)
+    
+    async def _record_change(
+        self,
+        article: Article,
+        author: str,
+        changes_summary: Optional[str],
+        delta: Optional[List[EditOperation]],
+        checkpoint: bool
+    ):
+        """
+        Account for a content change already applied to ``article.content``
         
-        return article
+        The change joins the article's pending version; ``delta`` (None for a
+        full-content write) is appended to its operations. Checkpoints, and
+        every change when the autosave window is 0, are written at once.
+        """
+        pending = self.pending.get(article.article_id)
+        if pending is None:
+            pending = self.pending[article.article_id] = PendingSave(author, article.current_version)
+        else:
+            self.coalesced_saves += 1
+        pending.saves += 1
+        if changes_summary:
+            pending.changes_summary = changes_summary
+        if delta is None or pending.delta is None:
+            pending.delta = None
+        else:
+            pending.delta.extend(delta)
+        if checkpoint or self.autosave_window <= 0:
+            await self._flush(article.article_id)
+    
+    @timed("article")
+    async def flush_article(self, article_id: str) -> Optional[ArticleVersion]:
+        """
+        Write an article's pending changes as a new version
+        
+        Returns:
+            The new version, or None if nothing was pending or the changes
+            cancelled out
+        """
+        async with self.locks(article_id):
+            return await self._flush(article_id)
     
+    async def _flush(self, article_id: str) -> Optional[ArticleVersion]:
+        """flush_article for callers already holding the article's lock"""
+        pending = self.pending.pop(article_id, None)
+        article = self.articles.get(article_id)
+        if pending is None or article is None:
+            return None
+        content = article.content
+        if content == article.versions[-1].content:
+            return None
+        # Measured before the version becomes readable: its representation is
+        # cached as immutable, so metrics are never filled in afterwards
+        try:
+            metrics = await self._measure(content)
+        except Exception:
+            # get_version_metrics measures the content on each read instead
+            metrics = None
+        
+        new_version_number = article.current_version + 1
+        new_version = ArticleVersion(
+            version_id=str(uuid.uuid4()),
+            version_number=new_version_number,
+            content=content,
+            author=pending.author,
+            changes_summary=pending.changes_summary or f"Version {new_version_number} update",
+            base_version=pending.base_version if pending.delta is not None else None,
+            delta=pending.delta,
+            metrics=metrics
+        )
+        article.versions.append(new_version)
+        article.current_version = new_version_number
+        self.flushed_versions += 1
+        return new_version
+    
+    async def flush_autosaves(self, min_age: Optional[float] = None) -> int:
+        """
+        Write pending changes started at least ``min_age`` seconds ago (all if None)
+        
+        Returns:
+            Number of articles flushed
+        """
+        now = time.monotonic()
+        due = [
+            article_id for article_id, pending in self.pending.items()
+            if min_age is None or now - pending.started_at >= min_age
+        ]
+        for article_id in due:
+            await self.flush_article(article_id)
+        return len(due)
+    
+    @timed("article")
     async def delete_article(self, article_id: str) -> bool:
         """Delete an article"""
-        if article_id in self.articles:
-            del self.articles[article_id]
-            return True
-        return False
+        async with self.locks(article_id):
+            if article_id in self.articles:
+                del self.articles[article_id]
+                self.pending.pop(article_id, None)
+                self.diff_cache.discard_article(article_id)
+                self.search_index.remove(article_id)
+                return True
+            return False
     
+    @timed("article")
     async def get_article_version(
         self, 
         article_id: str, 
@@ -175,6 +590,76 @@ class ArticleService:
                 return version
         return None
     
+    @timed("article")
+    async def get_version_metrics(
+        self,
+        article_id: str,
+        version_number: int
+    ) -> Optional[TextMetrics]:
+        """
+        Text metrics stored with a version
+        
+        Versions stored without metrics are measured on read (through the
+        metrics cache); the version itself is never modified, since clients
+        cache it as immutable.
+        """
+        version = await self.get_article_version(article_id, version_number)
+        if not version:
+            return None
+        if version.metrics is None:
+            return await self._measure(version.content)
+        return version.metrics
+    
+    @timed("article")
+    async def diff_versions(
+        self,
+        article_id: str,
+        from_version: int,
+        to_version: int,
+        granularity: DiffGranularity = DiffGranularity.LINE,
+        context: int = 3
+    ) -> Optional[VersionDiff]:
+        """
+        Diff two versions of an article
+        
+        Results are cached per (article, version pair, granularity, context).
+        Large documents are diffed off the event loop.
+        
+        Args:
+            from_version: Base version
+            to_version: Target version
+            granularity: Line hunks or word-level replacements
+            context: Unchanged lines around each line hunk
+        """
+        granularity = DiffGranularity(granularity)
+        key = (article_id, from_version, to_version, granularity.value, context)
+        cached = self.diff_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        old = await self.get_article_version(article_id, from_version)
+        new = await self.get_article_version(article_id, to_version)
+        if not old or not new:
+            return None
+        size = len(old.content) + len(new.content)
+        diff = VersionDiff(
+            article_id=article_id,
+            from_version=from_version,
+            to_version=to_version,
+            granularity=granularity
+        )
+        if granularity == DiffGranularity.WORD:
+            result = await cpu_executor.run(diff_words, old.content, new.content, size=size)
+            diff.changes = [DiffChange(**c._asdict()) for c in result.changes]
+        else:
+            result = await cpu_executor.run(diff_lines, old.content, new.content, context, size=size)
+            diff.hunks = [DiffHunk(**h._asdict()) for h in result.hunks]
+        diff.added = result.added
+        diff.removed = result.removed
+        self.diff_cache.put(key, diff)
+        return diff
+    
+    @timed("article")
     async def get_version_history(self, article_id: str) -> Optional[List[ArticleVersion]]:
         """Get complete version history of an article"""
         article = self.articles.get(article_id)
@@ -182,48 +667,93 @@ class ArticleService:
             return None
         return article.versions
     
+    @timed("article")
     async def revert_to_version(
         self, 
         article_id: str, 
         version_number: int,
-        author: str
+        author: str,
+        expected_version: Optional[int] = None,
+        expected_etags: Optional[List[str]] = None
     ) -> Optional[Article]:
         """
         Revert article to a previous version
         
         Creates a new version with the content from the specified version
-        """
-        article = self.articles.get(article_id)
-        if not article:
-            return None
-        
-        # Find the target version
-        target_version = None
-        for version in article.versions:
-            if version.version_number == version_number:
-                target_version = version
-                break
-        
-        if not target_version:
-            return None
         
-        # Create new version with reverted content
-        new_version_number = article.current_version + 1
-        new_version = ArticleVersion(
-            version_id=str(uuid.uuid4()),
-            version_number=new_version_number,
-            content=target_version.content,
-            author=author,
-            changes_summary=f"Reverted to version {version_number}"
-        )
-        
-        article.content = target_version.content
-        article.versions.append(new_version)
-        article.current_version = new_version_number
-        article.updated_at = datetime.utcnow()
-        
-        return article
+        Raises:
+            PreconditionFailed: if the article is not at the expected version or ETag
+        """
+        async with self.locks(article_id):
+            article = self.articles.get(article_id)
+            if not article:
+                return None
+            self._check_preconditions(article, expected_version, expected_etags)
+            # Pending changes are kept as their own version before the revert
+            await self._flush(article_id)
+            
+            # Find the target version
+            target_version = None
+            for version in article.versions:
+                if version.version_number == version_number:
+                    target_version = version
+                    break
+            
+            if not target_version:
+                return None
+            
+            # Create new version with reverted content
+            new_version_number = article.current_version + 1
+            new_version = ArticleVersion(
+                version_id=str(uuid.uuid4()),
+                version_number=new_version_number,
+                content=target_version.content,
+                author=author,
+                changes_summary=f"Reverted to version {version_number}",
+                # Same content as the target, so its metrics carry over
+                metrics=target_version.metrics or await self._measure(target_version.content)
+            )
+            
+            article.content = target_version.content
+            article.versions.append(new_version)
+            article.current_version = new_version_number
+            article.updated_at = datetime.utcnow()
+            self.search_index.index(article)
+            
+            return article
+
+
+class AutosaveFlusher:
+    """Writes pending autosaves once their window has passed, and all of them on shutdown"""
+
+    def __init__(self, service: ArticleService, interval: float = 1.0):
+        self.service = service
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None and self.interval > 0 and self.service.autosave_window > 0:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.service.flush_autosaves(self.service.autosave_window)
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.service.flush_autosaves()
 
 
 # Global service instance
-article_service = ArticleService()
+article_service = ArticleService(
+    autosave_window=float(os.getenv("AUTOSAVE_WINDOW", 30)),
+    search_index=search_backend_from_env()
+)
+autosave_flusher = AutosaveFlusher(article_service, interval=float(os.getenv("AUTOSAVE_FLUSH_INTERVAL", 1)))
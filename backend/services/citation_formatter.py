@@ -0,0 +1,241 @@
+"""
+Citation Formatter
+Bibliography formatting for IEEE, APA, ACM, Nature and BibTeX
+
+Each style is compiled once into a ``string.Template`` plus an author-list
+formatter. Formatted entries are memoized per (paper_id, style), so
+re-exporting a bibliography only formats papers that have not been seen.
+"""
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from collections import OrderedDict
+from enum import Enum
+from string import Template
+import re
+import threading
+
+
+class CitationStyle(str, Enum):
+    """Supported bibliography styles"""
+    IEEE = "IEEE"
+    APA = "APA"
+    ACM = "ACM"
+    NATURE = "Nature"
+    BIBTEX = "BibTeX"
+
+
+def split_name(name: str) -> Tuple[str, str]:
+    """
+    Split an author name into (surname, initials)
+
+    Accepts "Vaswani, A." and "Ashish Vaswani" forms.
+    """
+    name = name.strip()
+    if "," in name:
+        surname, given = (part.strip() for part in name.split(",", 1))
+    else:
+        parts = name.split()
+        surname, given = parts[-1] if parts else "", " ".join(parts[:-1])
+    initials = " ".join(
+        piece if piece.endswith(".") and len(piece) <= 3 else f"{piece[0]}."
+        for piece in re.split(r"[\s]+", given) if piece
+    )
+    return surname, initials
+
+
+def _initials_first(name: str) -> str:
+    surname, initials = split_name(name)
+    return f"{initials} {surname}".strip()
+
+
+def _surname_first(name: str) -> str:
+    surname, initials = split_name(name)
+    return f"{surname}, {initials}" if initials else surname
+
+
+def _join(names: List[str], final: str) -> str:
+    if len(names) <= 1:
+        return "".join(names)
+    if len(names) == 2:
+        return f"{names[0]}{final}{names[1]}"
+    return ", ".join(names[:-1]) + f",{final}{names[-1]}"
+
+
+def _ieee_authors(authors: Sequence[str]) -> str:
+    if len(authors) > 6:
+        return f"{_initials_first(authors[0])} et al."
+    return _join([_initials_first(a) for a in authors], " and ")
+
+
+def _apa_authors(authors: Sequence[str]) -> str:
+    names = [_surname_first(a) for a in authors[:20]]
+    if len(names) <= 1:
+        return "".join(names)
+    return ", ".join(names[:-1]) + f", & {names[-1]}"
+
+
+def _acm_authors(authors: Sequence[str]) -> str:
+    return _join([_initials_first(a) for a in authors], " and ")
+
+
+def _nature_authors(authors: Sequence[str]) -> str:
+    if len(authors) > 5:
+        return f"{_surname_first(authors[0])} et al."
+    names = [_surname_first(a) for a in authors]
+    if len(names) <= 1:
+        return "".join(names)
+    return ", ".join(names[:-1]) + f" & {names[-1]}"
+
+
+def _bibtex_authors(authors: Sequence[str]) -> str:
+    return " and ".join(_surname_first(a) for a in authors)
+
+
+def _bibtex_escape(value: str) -> str:
+    return re.sub(r"([&%$#_{}])", r"\\\1", value)
+
+
+class _CompiledStyle:
+    """Template and field formatters for one style"""
+
+    def __init__(
+        self,
+        template: str,
+        authors: Callable[[Sequence[str]], str],
+        doi: str = "",
+        escape: Callable[[str], str] = lambda v: v
+    ):
+        self.template = Template(template)
+        self.authors = authors
+        self.doi = Template(doi)
+        self.escape = escape
+
+    def format(self, paper) -> str:
+        escape = self.escape
+        return self.template.substitute(
+            authors=escape(self.authors(paper.authors)),
+            title=escape(paper.title.rstrip(".")),
+            venue=escape(paper.venue),
+            year=paper.year,
+            key=bibtex_key(paper),
+            doi=self.doi.substitute(doi=paper.doi) if paper.doi else "",
+        )
+
+
+def bibtex_key(paper) -> str:
+    """Citation key such as vaswani2017attention"""
+    surname = split_name(paper.authors[0])[0] if paper.authors else "anon"
+    first_word = next((w for w in re.findall(r"[A-Za-z]+", paper.title) if len(w) > 3), "paper")
+    return re.sub(r"[^a-z0-9]", "", f"{surname}{paper.year}{first_word}".lower())
+
+
+_STYLES: Dict[CitationStyle, _CompiledStyle] = {
+    CitationStyle.IEEE: _CompiledStyle(
+        '$authors, "$title," in $venue, $year$doi.',
+        _ieee_authors,
+        doi=", doi: $doi",
+    ),
+    CitationStyle.APA: _CompiledStyle(
+        "$authors ($year). $title. $venue.$doi",
+        _apa_authors,
+        doi=" https://doi.org/$doi",
+    ),
+    CitationStyle.ACM: _CompiledStyle(
+        "$authors. $year. $title. In $venue.$doi",
+        _acm_authors,
+        doi=" https://doi.org/$doi",
+    ),
+    CitationStyle.NATURE: _CompiledStyle(
+        "$authors $title. $venue ($year).$doi",
+        _nature_authors,
+        doi=" https://doi.org/$doi",
+    ),
+    CitationStyle.BIBTEX: _CompiledStyle(
+        "@inproceedings{$key,\n"
+        "  title = {$title},\n"
+        "  author = {$authors},\n"
+        "  booktitle = {$venue},\n"
+        "  year = {$year}$doi\n"
+        "}",
+        _bibtex_authors,
+        doi=",\n  doi = {$doi}",
+        escape=_bibtex_escape,
+    ),
+}
+
+
+class CitationFormatter:
+    """Memoizing bibliography formatter; safe to call from worker threads"""
+
+    def __init__(self, cache_size: int = 100000):
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple[str, CitationStyle], str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def format(self, paper, style: CitationStyle = CitationStyle.IEEE) -> str:
+        """Format one paper, reusing a cached entry when available"""
+        style = CitationStyle(style)
+        key = (paper.paper_id, style)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self.hits += 1
+                self._cache.move_to_end(key)
+                return cached
+            self.misses += 1
+        entry = _STYLES[style].format(paper)
+        with self._lock:
+            self._cache[key] = entry
+            self._cache.move_to_end(key)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return entry
+
+    def format_many(self, papers: Sequence, style: CitationStyle = CitationStyle.IEEE) -> List[str]:
+        """Format many papers in order"""
+        style = CitationStyle(style)
+        return [self.format(paper, style) for paper in papers]
+
+    def render(
+        self,
+        papers: Sequence,
+        style: CitationStyle = CitationStyle.IEEE,
+        numbered: Optional[bool] = None
+    ) -> str:
+        """
+        Render a complete bibliography as one string
+
+        IEEE entries are numbered ``[n]`` by default; BibTeX entries are
+        separated by blank lines.
+        """
+        return self.join(self.format_many(papers, style), style, numbered)
+
+    @staticmethod
+    def join(
+        entries: Sequence[str],
+        style: CitationStyle = CitationStyle.IEEE,
+        numbered: Optional[bool] = None
+    ) -> str:
+        """Join already formatted entries the way ``render`` does"""
+        style = CitationStyle(style)
+        if numbered is None:
+            numbered = style == CitationStyle.IEEE
+        if numbered:
+            entries = [f"[{i}] {entry}" for i, entry in enumerate(entries, 1)]
+        separator = "\n\n" if style == CitationStyle.BIBTEX else "\n"
+        return separator.join(entries)
+
+    def invalidate(self, paper_id: str):
+        """Drop cached entries for a paper whose metadata changed"""
+        with self._lock:
+            for style in CitationStyle:
+                self._cache.pop((paper_id, style), None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._cache), "hits": self.hits, "misses": self.misses}
+
+
+# Global formatter instance
+citation_formatter = CitationFormatter()
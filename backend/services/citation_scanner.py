@@ -0,0 +1,230 @@
+"""
+Citation Scanner
+Single-pass citation extraction and cross-checking against a reference list
+
+Recognized styles:
+- numeric:     [1], [1, 3], [2-5], [2]-[4]
+- author-year: (Smith, 2020), (Smith and Lee 2019; Wang et al., 2021a),
+               Smith et al. (2020)
+
+All patterns are combined into one compiled regex and the text is scanned
+once with ``finditer``, so validation is linear in document length.
+"""
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from bisect import bisect_right
+from dataclasses import dataclass, field
+import re
+
+
+NUMERIC = "numbered"
+AUTHOR_YEAR = "author-year"
+
+_SURNAME = r"[A-Z][A-Za-z'À-ſ-]+"
+_YEAR = r"(?:1[5-9]|20)\d{2}[a-z]?"
+
+_CITATION_RE = re.compile(
+    # [1], [1, 2], [3-5], optionally chained as [2]-[4]
+    r"(?P<numeric>\[\s*\d+(?:\s*[-–,]\s*\d+)*\s*\](?:\s*[-–]\s*\[\s*\d+\s*\])?)"
+    # (Smith, 2020; Lee and Wang 2019a). Any parenthesized group matches and is checked
+    # for a year afterwards: a lazy search for the year backtracks quadratically on an unclosed "("
+    r"|(?P<paren>\([^()]*\))"
+    # Smith et al. (2020) / Smith and Lee (2020)
+    rf"|(?P<narrative>(?P<n_author>{_SURNAME}(?:\s+et\s+al\.?|\s+(?:and|&)\s+{_SURNAME})?)\s+\((?P<n_year>{_YEAR})\))"
+)
+_NUMBER_RE = re.compile(r"\d+")
+_RANGE_RE = re.compile(r"(\d+)\s*\]?\s*[-–]\s*\[?\s*(\d+)")
+_AUTHOR_YEAR_ITEM_RE = re.compile(
+    rf"^\s*(?:e\.g\.,?\s*|see\s+|cf\.\s*)?(?P<author>{_SURNAME})"
+    rf"(?:\s+et\s+al\.?|\s+(?:and|&)\s+{_SURNAME})?,?\s+(?P<year>{_YEAR})\s*$"
+)
+_REFERENCE_YEAR_RE = re.compile(rf"\b({_YEAR})\b")
+_REFERENCE_SURNAME_RE = re.compile(r"[^\W\d_][\w'À-ſ-]*", re.UNICODE)
+_REFERENCE_NUMBER_RE = re.compile(r"^\s*\[?(\d+)[\].)]")
+
+# Upper bound on a numeric range so "[1-100000]" cannot explode
+MAX_RANGE = 500
+
+
+@dataclass
+class Citation:
+    """One in-text citation occurrence"""
+    style: str
+    position: int
+    length: int
+    text: str
+    line: int
+    keys: Tuple = ()
+
+
+@dataclass
+class CitationReport:
+    """Result of scanning a document"""
+    citations: List[Citation] = field(default_factory=list)
+    style_detected: str = "unknown"
+    mixed_styles: bool = False
+    dangling: List[Dict] = field(default_factory=list)
+    unused: List[Dict] = field(default_factory=list)
+    out_of_order: List[Dict] = field(default_factory=list)
+
+    @property
+    def consistent(self) -> bool:
+        return not (self.mixed_styles or self.dangling or self.out_of_order)
+
+
+def _expand_numbers(raw: str) -> Tuple[int, ...]:
+    """[1, 3-5] -> (1, 3, 4, 5), preserving order"""
+    ranges = {m.start(): m for m in _RANGE_RE.finditer(raw)}
+    numbers: List[int] = []
+    consumed_until = -1
+    for m in _NUMBER_RE.finditer(raw):
+        if m.start() < consumed_until:
+            continue
+        span = ranges.get(m.start())
+        if span is None:
+            numbers.append(int(m.group()))
+            continue
+        low, high = int(span.group(1)), int(span.group(2))
+        if low <= high and high - low <= MAX_RANGE:
+            numbers.extend(range(low, high + 1))
+        else:
+            numbers.extend((low, high))
+        consumed_until = span.end()
+    return tuple(numbers)
+
+
+def _author_year_keys(raw: str) -> Tuple[Tuple[str, str], ...]:
+    """(Smith, 2020; Lee et al. 2019) -> (("smith", "2020"), ("lee", "2019"))"""
+    keys = []
+    for item in raw[1:-1].split(";"):
+        m = _AUTHOR_YEAR_ITEM_RE.match(item)
+        if m:
+            keys.append((m.group("author").lower(), m.group("year")))
+    return tuple(keys)
+
+
+def reference_key(reference: str) -> Optional[Tuple[str, str]]:
+    """(first-author surname, year) for an author-year reference entry"""
+    body = _REFERENCE_NUMBER_RE.sub("", reference, count=1)
+    surname = _REFERENCE_SURNAME_RE.search(body)
+    year = _REFERENCE_YEAR_RE.search(body)
+    if not surname or not year:
+        return None
+    return surname.group().lower(), year.group(1)
+
+
+def _matches(text: str) -> Iterator[Tuple[re.Match, Tuple]]:
+    """
+    Citation matches with the keys of parenthesized groups
+
+    A parenthesized group without author-year keys is searched inside
+    instead, so "(see [3])" still yields the numeric citation.
+    """
+    for m in _CITATION_RE.finditer(text):
+        if not m.group("paren"):
+            yield m, ()
+            continue
+        keys = _author_year_keys(m.group("paren"))
+        if keys:
+            yield m, keys
+        else:
+            # The group holds no parentheses, so no inner match is a paren group
+            for inner in _CITATION_RE.finditer(text, m.start() + 1, m.end() - 1):
+                yield inner, ()
+
+
+def scan(text: str) -> List[Citation]:
+    """Extract every citation in one pass over ``text``"""
+    line_starts = [0]
+    line_starts.extend(m.end() for m in re.finditer("\n", text))
+    citations = []
+    for m, paren_keys in _matches(text):
+        line = bisect_right(line_starts, m.start())
+        if m.group("numeric"):
+            keys = _expand_numbers(m.group("numeric"))
+            citations.append(Citation(NUMERIC, m.start(), m.end() - m.start(), m.group(), line, keys))
+        elif m.group("paren"):
+            citations.append(Citation(AUTHOR_YEAR, m.start(), m.end() - m.start(), m.group(), line, paren_keys))
+        else:
+            author = m.group("n_author").split()[0].lower()
+            citations.append(Citation(
+                AUTHOR_YEAR, m.start(), m.end() - m.start(), m.group(), line,
+                ((author, m.group("n_year")),)
+            ))
+    return citations
+
+
+def validate(text: str, references: Sequence[str] = ()) -> CitationReport:
+    """
+    Scan ``text`` and cross-check citations against ``references``
+
+    Numeric citations refer to 1-based positions in ``references``; author-year
+    citations are matched on first-author surname and year. Without a
+    reference list only style detection and ordering are checked.
+    """
+    report = CitationReport(citations=scan(text))
+    numeric = [c for c in report.citations if c.style == NUMERIC]
+    author_year = [c for c in report.citations if c.style == AUTHOR_YEAR]
+
+    if numeric and author_year:
+        report.mixed_styles = True
+    if numeric or author_year:
+        report.style_detected = NUMERIC if len(numeric) >= len(author_year) else AUTHOR_YEAR
+
+    cited = set()
+    if numeric:
+        cited |= _check_numeric(numeric, references, report)
+    if author_year and references:
+        cited |= _check_author_year(author_year, references, report)
+        report.dangling.sort(key=lambda item: item["position"])
+    report.unused = [
+        {"reference": number, "text": reference}
+        for number, reference in enumerate(references, 1)
+        if number not in cited
+    ]
+    return report
+
+
+def _check_numeric(citations: List[Citation], references: Sequence[str], report: CitationReport) -> set:
+    """Record dangling and out-of-order numbers; return the cited reference numbers"""
+    cited = set()
+    expected = 1  # lowest number not cited yet
+    for citation in citations:
+        for number in citation.keys:
+            if references and not 1 <= number <= len(references):
+                report.dangling.append({
+                    "citation": number, "text": citation.text,
+                    "position": citation.position, "line": citation.line,
+                })
+            if number not in cited:
+                # Numbered styles expect sources numbered by first appearance;
+                # one early jump must not flag every later number
+                if number != expected:
+                    report.out_of_order.append({
+                        "citation": number, "expected": expected, "text": citation.text,
+                        "position": citation.position, "line": citation.line,
+                    })
+                cited.add(number)
+                while expected in cited:
+                    expected += 1
+    return cited
+
+
+def _check_author_year(citations: List[Citation], references: Sequence[str], report: CitationReport) -> set:
+    """Record citations with no matching reference; return the matched reference numbers"""
+    index: Dict[Tuple[str, str], int] = {}
+    for number, reference in enumerate(references, 1):
+        key = reference_key(reference)
+        if key is not None:
+            index.setdefault(key, number)
+    cited = set()
+    for citation in citations:
+        for key in citation.keys:
+            number = index.get(key)
+            if number is None:
+                report.dangling.append({
+                    "citation": f"{key[0].title()} {key[1]}", "text": citation.text,
+                    "position": citation.position, "line": citation.line,
+                })
+            else:
+                cited.add(number)
+    return cited
@@ -3,9 +3,19 @@ Editor Service
 Provides academic editing capabilities including grammar correction,
 formatting guidance, and LaTeX support
 """
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Iterator, Optional, Sequence, Any
 from pydantic import BaseModel
 from enum import Enum
+import re
+
+from middleware.cpu_executor import cpu_executor
+from middleware.metrics import timed
+from models.article import Article
+from services import citation_scanner
+from services.formatting_rules import get_formatting_engine
+from services.latex_converter import convert_document, iter_document
+from services.latex_templates import iter_manuscript, render_manuscript
+from services.template_registry import template_registry
 
 
 class SuggestionType(str, Enum):
@@ -38,6 +48,149 @@ class FormattingRule(BaseModel):
     example: str
 
 
+def _check_grammar(text: str) -> List[Suggestion]:
+    """Rule-based grammar check behind EditorService.check_grammar"""
+    suggestions = []
+    
+    # Simple example checks (replace with real NLP in production)
+    common_errors = {
+        " i ": " I ",
+        "dont": "don't",
+        "wont": "won't",
+        "cant": "can't",
+    }
+    
+    for error, correction in common_errors.items():
+        pos = text.find(error)
+        if pos != -1:
+            suggestions.append(Suggestion(
+                type=SuggestionType.GRAMMAR,
+                position=pos,
+                length=len(error),
+                original=error,
+                suggestion=correction,
+                explanation=f"Replace '{error}' with '{correction}'",
+                confidence=0.95
+            ))
+    
+    return suggestions
+
+
+def _check_formatting(text: str, template: str) -> List[Suggestion]:
+    """Template formatting check behind EditorService.check_formatting"""
+    return [
+        Suggestion(
+            type=SuggestionType.FORMATTING,
+            position=issue.position,
+            length=issue.length,
+            original=issue.original,
+            suggestion=issue.suggestion,
+            explanation=issue.explanation,
+            confidence=issue.confidence
+        )
+        for issue in get_formatting_engine(template).check(text)
+    ]
+
+
+# Example improvements (in production, use AI model)
+INFORMAL_PHRASES = {
+    "a lot of": "numerous",
+    "very important": "significant",
+    "shows that": "demonstrates that",
+    "find out": "determine",
+    "get": "obtain",
+}
+
+_INFORMAL_RE = re.compile(
+    r"\b(?:" + "|".join(re.escape(p) for p in INFORMAL_PHRASES) + r")\b", re.IGNORECASE
+)
+
+
+def _suggest_improvements(paragraph: str) -> List[str]:
+    """Informal phrase detection behind EditorService.suggest_improvements"""
+    suggestions = []
+    
+    for informal, formal in INFORMAL_PHRASES.items():
+        if informal.lower() in paragraph.lower():
+            suggestions.append(
+                f"Consider replacing '{informal}' with '{formal}' for more academic tone"
+            )
+    
+    return suggestions
+
+
+def _improvement_suggestions(text: str) -> List[Suggestion]:
+    """Positioned variant of _suggest_improvements for the live editor"""
+    suggestions = []
+    for match in _INFORMAL_RE.finditer(text):
+        informal = match.group()
+        formal = INFORMAL_PHRASES[informal.lower()]
+        suggestions.append(Suggestion(
+            type=SuggestionType.STYLE,
+            position=match.start(),
+            length=len(informal),
+            original=informal,
+            suggestion=formal,
+            explanation=f"Consider replacing '{informal}' with '{formal}' for more academic tone",
+            confidence=0.75
+        ))
+    return suggestions
+
+
+def _check_document(text: str, template: str) -> List[Suggestion]:
+    """Grammar, formatting and style checks combined, ordered by position"""
+    suggestions = _check_grammar(text) + _check_formatting(text, template) + _improvement_suggestions(text)
+    suggestions.sort(key=lambda s: s.position)
+    return suggestions
+
+
+def _validate_citations(text: str, references: Sequence[str] = ()) -> Dict[str, Any]:
+    """Citation scan and cross-check behind EditorService.validate_citations"""
+    report = citation_scanner.validate(text, references)
+    
+    suggestions = []
+    for item in report.dangling:
+        suggestions.append(Suggestion(
+            type=SuggestionType.CITATION,
+            position=item["position"],
+            length=len(item["text"]),
+            original=item["text"],
+            suggestion=item["text"],
+            explanation=f"Citation {item['citation']} does not match any entry in the reference list",
+            confidence=0.90
+        ))
+    for item in report.out_of_order:
+        suggestions.append(Suggestion(
+            type=SuggestionType.CITATION,
+            position=item["position"],
+            length=len(item["text"]),
+            original=item["text"],
+            suggestion=item["text"],
+            explanation=(
+                f"Reference {item['citation']} is cited before reference {item['expected']}; "
+                "numbered styles expect references in order of first citation"
+            ),
+            confidence=0.80
+        ))
+    suggestions.sort(key=lambda s: s.position)
+    
+    return {
+        "citation_count": len(report.citations),
+        "style_detected": report.style_detected,
+        "consistent": report.consistent,
+        "mixed_styles": report.mixed_styles,
+        "citations": [
+            {"style": c.style, "position": c.position, "length": c.length,
+             "line": c.line, "text": c.text, "keys": list(c.keys)}
+            for c in report.citations
+        ],
+        "dangling": report.dangling,
+        "unused": report.unused,
+        "out_of_order": report.out_of_order,
+        "suggestions": [s.model_dump() for s in suggestions]
+    }
+
+
 class EditorService:
     """Service for academic editing features"""
     
@@ -47,33 +200,11 @@ class EditorService:
     def _load_formatting_rules(self) -> Dict[str, List[FormattingRule]]:
         """Load formatting rules for different templates"""
         return {
-            "IEEE": [
-                FormattingRule(
-                    rule_id="ieee_title",
-                    template="IEEE",
-                    category="Title",
-                    description="Title should use title case",
-                    example="Deep Learning for Image Recognition"
-                ),
-                FormattingRule(
-                    rule_id="ieee_sections",
-                    template="IEEE",
-                    category="Sections",
-                    description="Main sections: Introduction, Related Work, Methodology, Results, Conclusion",
-                    example="I. Introduction\\nII. Related Work"
-                ),
-            ],
-            "Elsevier": [
-                FormattingRule(
-                    rule_id="elsevier_abstract",
-                    template="Elsevier",
-                    category="Abstract",
-                    description="Abstract should be 150-250 words",
-                    example="A concise summary of the work..."
-                ),
-            ],
+            name: [FormattingRule(**rule) for rule in spec.rules]
+            for name, spec in template_registry.items()
         }
     
+    @timed("editor")
     async def check_grammar(self, text: str) -> List[Suggestion]:
         """
         Check text for grammar errors
@@ -85,31 +216,9 @@ class EditorService:
         - GPT-based grammar checkers
         - spaCy with custom models
         """
-        suggestions = []
-        
-        # Simple example checks (replace with real NLP in production)
-        common_errors = {
-            " i ": " I ",
-            "dont": "don't",
-            "wont": "won't",
-            "cant": "can't",
-        }
-        
-        for error, correction in common_errors.items():
-            pos = text.find(error)
-            if pos != -1:
-                suggestions.append(Suggestion(
-                    type=SuggestionType.GRAMMAR,
-                    position=pos,
-                    length=len(error),
-                    original=error,
-                    suggestion=correction,
-                    explanation=f"Replace '{error}' with '{correction}'",
-                    confidence=0.95
-                ))
-        
-        return suggestions
+        return await cpu_executor.run(_check_grammar, text, size=len(text))
     
+    @timed("editor")
     async def check_formatting(self, text: str, template: str) -> List[Suggestion]:
         """
         Check text formatting against academic template
@@ -118,100 +227,122 @@ class EditorService:
             text: Text to check
             template: Academic template (IEEE, Elsevier, etc.)
         """
-        suggestions = []
+        return await cpu_executor.run(_check_formatting, text, template, size=len(text))
+    
+    @timed("editor")
+    async def check_document(self, text: str, template: str = "Generic") -> List[Suggestion]:
+        """
+        Run grammar, formatting and style checks in one call
         
-        # Check for common formatting issues
-        lines = text.split('\n')
+        Used by the live editing channel, which needs positioned suggestions
+        from every checker at once.
+        """
+        return await cpu_executor.run(_check_document, text, template, size=len(text))
+    
+    @timed("editor")
+    async def convert_to_latex(self, text: str, template: Optional[str] = None) -> str:
+        """
+        Convert Markdown or plain text to LaTeX format
         
-        # Check for proper section numbering (example)
-        if template == "IEEE":
-            for i, line in enumerate(lines):
-                if line.strip().startswith("Introduction") and not line.strip().startswith("I."):
-                    suggestions.append(Suggestion(
-                        type=SuggestionType.FORMATTING,
-                        position=text.find(line),
-                        length=len(line),
-                        original=line,
-                        suggestion=f"I. {line.strip()}",
-                        explanation="IEEE format requires Roman numerals for main sections",
-                        confidence=0.90
-                    ))
+        Handles headings, lists, quotes, emphasis, code, inline and display
+        math, and escapes LaTeX special characters. All-caps lines are still
+        treated as section headings.
         
-        return suggestions
+        Args:
+            text: Text to convert
+            template: Academic template whose document class and preamble
+                to use; a generic article preamble when omitted
+        """
+        if template is None:
+            return await cpu_executor.run(convert_document, text, size=len(text))
+        return await cpu_executor.run(render_manuscript, text, template, size=len(text))
     
-    async def convert_to_latex(self, text: str) -> str:
+    def iter_latex(
+        self,
+        text: str,
+        template: Optional[str] = None,
+        chunk_size: int = 16384
+    ) -> Iterator[str]:
         """
-        Convert plain text to LaTeX format
+        Convert text to LaTeX lazily, yielding the document in chunks
         
-        Basic conversion - can be enhanced with more sophisticated parsing
+        Intended for streaming responses; nothing beyond the current chunk
+        is buffered.
         """
-        latex = "\\documentclass{article}\n"
-        latex += "\\usepackage{amsmath}\n"
-        latex += "\\usepackage{graphicx}\n\n"
-        latex += "\\begin{document}\n\n"
-        
-        # Simple conversion
-        lines = text.split('\n')
-        for line in lines:
-            line = line.strip()
-            if not line:
-                latex += "\n"
-            elif line.isupper():  # Assume all-caps is a section
-                latex += f"\\section{{{line.title()}}}\n"
-            else:
-                latex += f"{line}\n"
+        if template is None:
+            return iter_document(text, chunk_size=chunk_size)
+        return iter_manuscript(text, template, chunk_size=chunk_size)
+    
+    @timed("editor")
+    async def convert_article_to_latex(self, article: Article, template: Optional[str] = None) -> str:
+        """
+        Export a full manuscript for an article
         
-        latex += "\n\\end{document}"
-        return latex
+        Title, authors, abstract, keywords, content and references are laid
+        out using the article's template unless another one is given.
+        """
+        return await cpu_executor.run(
+            render_manuscript, article.content, template or article.template,
+            size=len(article.content), **self._manuscript_metadata(article)
+        )
+    
+    def iter_article_latex(
+        self,
+        article: Article,
+        template: Optional[str] = None,
+        chunk_size: int = 16384
+    ) -> Iterator[str]:
+        """Streaming variant of convert_article_to_latex"""
+        return iter_manuscript(
+            article.content, template or article.template,
+            chunk_size=chunk_size, **self._manuscript_metadata(article)
+        )
     
+    @staticmethod
+    def _manuscript_metadata(article: Article) -> Dict[str, Any]:
+        return {
+            "title": article.title,
+            "authors": article.authors,
+            "abstract": article.abstract,
+            "keywords": article.keywords,
+            "references": article.references,
+        }
+    
+    @timed("editor")
     async def suggest_improvements(self, paragraph: str) -> List[str]:
         """
         Suggest academic language improvements for a paragraph
         
         Uses AI to suggest more formal phrasing
         """
-        suggestions = []
-        
-        # Example improvements (in production, use AI model)
-        informal_phrases = {
-            "a lot of": "numerous",
-            "very important": "significant",
-            "shows that": "demonstrates that",
-            "find out": "determine",
-            "get": "obtain",
-        }
-        
-        for informal, formal in informal_phrases.items():
-            if informal.lower() in paragraph.lower():
-                suggestions.append(
-                    f"Consider replacing '{informal}' with '{formal}' for more academic tone"
-                )
-        
-        return suggestions
+        return await cpu_executor.run(_suggest_improvements, paragraph, size=len(paragraph))
     
+    @timed("editor")
     async def get_formatting_rules(self, template: str) -> List[FormattingRule]:
         """Get formatting rules for a specific template"""
-        return self.formatting_rules.get(template, [])
+        spec = template_registry.get(template)
+        return self.formatting_rules[spec.name] if spec else []
     
-    async def validate_citations(self, text: str) -> Dict[str, Any]:
+    @timed("editor")
+    async def validate_citations(
+        self,
+        text: str,
+        references: Optional[Sequence[str]] = None
+    ) -> Dict[str, Any]:
         """
         Validate citation formatting
         
-        Check for proper citation format and consistency
-        """
-        # Count citations
-        citation_count = text.count('[')
-        
-        # Check for consistency
-        has_numbered = '[1]' in text or '[2]' in text
-        has_author_year = '(' in text and ')' in text
+        Check for proper citation format and consistency. When a reference
+        list is given, citations are cross-checked against it to find
+        dangling, unused and out-of-order references.
         
-        return {
-            "citation_count": citation_count,
-            "style_detected": "numbered" if has_numbered else "author-year" if has_author_year else "unknown",
-            "consistent": True,  # Would do real validation in production
-            "suggestions": []
-        }
+        Args:
+            text: Text to scan
+            references: Reference list (e.g. ``Article.references``)
+        """
+        return await cpu_executor.run(
+            _validate_citations, text, list(references or []), size=len(text)
+        )
 
 
 # Global service instance
@@ -0,0 +1,280 @@
+"""
+Formatting Rules
+Declarative per-template formatting checks compiled into one document pass
+
+Each template's data file has a ``formatting`` section:
+
+- numbering: "roman" (I. Introduction), "arabic_dot" (1. Introduction),
+  "arabic" (1 Introduction), "none" (Introduction) or null (not checked)
+- heading_case: "title" or null
+- abstract_words: [min, max] word count, either bound may be null
+- keywords: [min, max] keyword count, or null
+- keywords_sorted: keywords must be in alphabetical order
+
+The engine walks the text line by line once, tracking offsets, the current
+section, the abstract word count and the keyword line, so checking is linear
+in document length and every issue points at its exact position.
+"""
+from typing import Any, Iterator, List, Mapping, NamedTuple, Optional, Tuple
+from functools import lru_cache
+import re
+
+from services.template_registry import template_registry
+
+
+class FormattingIssue(NamedTuple):
+    """One formatting problem found in the document"""
+    rule: str
+    position: int
+    length: int
+    original: str
+    suggestion: str
+    explanation: str
+    confidence: float
+
+
+# Headings recognized without markdown markers
+KNOWN_SECTIONS = (
+    "Abstract", "Keywords", "Key words", "Index Terms", "CCS Concepts", "Highlights",
+    "Introduction", "Background", "Related Work", "Literature Review", "Preliminaries",
+    "Method", "Methods", "Methodology", "Materials and Methods", "Approach",
+    "Experiments", "Experimental Setup", "Experimental Results", "Evaluation",
+    "Results", "Results and Discussion", "Discussion", "Limitations", "Future Work",
+    "Conclusion", "Conclusions", "Acknowledgments", "Acknowledgements",
+    "Appendix", "References", "References and Notes", "Bibliography",
+)
+
+# Front and back matter, never numbered
+UNNUMBERED = frozenset({
+    "abstract", "keywords", "key words", "index terms", "ccs concepts", "highlights",
+    "acknowledgments", "acknowledgements", "appendix", "references",
+    "references and notes", "bibliography",
+})
+
+_SMALL_WORDS = frozenset({
+    "a", "an", "and", "as", "at", "but", "by", "for", "from", "in", "into",
+    "nor", "of", "on", "or", "the", "to", "via", "vs", "with",
+})
+
+_NUMBER = r"(?:[IVXLC]+\.?|\d+\.?)"
+_HEADING_RE = re.compile(
+    rf"^(?P<marker>\#{{1,6}}\s+)?(?P<number>{_NUMBER}\s+)?"
+    r"(?P<title>" + "|".join(re.escape(s) for s in sorted(KNOWN_SECTIONS, key=len, reverse=True)) + r")"
+    r"\s*:?\s*$",
+    re.IGNORECASE
+)
+_MARKDOWN_HEADING_RE = re.compile(rf"^(?P<marker>\#{{1,6}}\s+)(?P<number>{_NUMBER}\s+)?(?P<title>\S.*?)\s*$")
+_ABSTRACT_INLINE_RE = re.compile(r"^(?:\#{1,6}\s+)?Abstract\s*[-—–:.]\s*(?P<body>\S.*)$", re.IGNORECASE)
+_KEYWORDS_INLINE_RE = re.compile(
+    r"^(?:\#{1,6}\s+)?(?P<label>Keywords|Key words|Index Terms)\s*[-—–:.]\s*(?P<body>\S.*)$",
+    re.IGNORECASE
+)
+_KEYWORD_SPLIT_RE = re.compile(r"\s*[,;·]\s*")
+
+_NUMBERING_LABELS = {
+    "roman": "Roman numerals",
+    "arabic_dot": "Arabic numerals followed by a period",
+    "arabic": "Arabic numerals without a trailing period",
+    "none": "unnumbered headings",
+}
+
+
+def to_roman(number: int) -> str:
+    """1 -> I, 4 -> IV, 14 -> XIV"""
+    numerals = (
+        (1000, "M"), (900, "CM"), (500, "D"), (400, "CD"), (100, "C"), (90, "XC"),
+        (50, "L"), (40, "XL"), (10, "X"), (9, "IX"), (5, "V"), (4, "IV"), (1, "I"),
+    )
+    out = []
+    for value, numeral in numerals:
+        count, number = divmod(number, value)
+        out.append(numeral * count)
+    return "".join(out)
+
+
+def title_case(title: str) -> str:
+    """Capitalize every word except short function words after the first"""
+    words = title.split()
+    return " ".join(
+        word if word[:1].isupper() or (i and word.lower() in _SMALL_WORDS) else word[:1].upper() + word[1:]
+        for i, word in enumerate(words)
+    )
+
+
+def _iter_lines(text: str) -> Iterator[Tuple[int, str]]:
+    """(offset, line) pairs without newlines"""
+    offset = 0
+    for line in text.split("\n"):
+        yield offset, line
+        offset += len(line) + 1
+
+
+class FormattingEngine:
+    """Compiled formatting checks for one template"""
+
+    def __init__(self, name: str, spec: Mapping[str, Any]):
+        self.name = name
+        self.numbering: Optional[str] = spec.get("numbering")
+        self.heading_case: Optional[str] = spec.get("heading_case")
+        self.abstract_words = tuple(spec.get("abstract_words") or (None, None))
+        self.keyword_range = tuple(spec["keywords"]) if spec.get("keywords") else None
+        self.keywords_sorted = bool(spec.get("keywords_sorted"))
+
+    def _number(self, counter: int) -> str:
+        if self.numbering == "roman":
+            return f"{to_roman(counter)}. "
+        if self.numbering == "arabic_dot":
+            return f"{counter}. "
+        if self.numbering == "arabic":
+            return f"{counter} "
+        return ""
+
+    def check(self, text: str) -> List[FormattingIssue]:
+        """Run every check in a single pass over ``text``"""
+        issues: List[FormattingIssue] = []
+        counter = 0
+        # Abstract state: [start offset, end offset, word count] while inside it
+        abstract: Optional[List[int]] = None
+        keywords_pending = False
+
+        for offset, line in _iter_lines(text):
+            stripped = line.strip()
+            if not stripped:
+                continue
+            lead = len(line) - len(line.lstrip())
+
+            keyword_match = _KEYWORDS_INLINE_RE.match(stripped)
+            heading = None if keyword_match else (
+                _HEADING_RE.match(stripped) or _MARKDOWN_HEADING_RE.match(stripped)
+            )
+            inline_abstract = None if heading else _ABSTRACT_INLINE_RE.match(stripped)
+
+            if abstract is not None and (heading or keyword_match or inline_abstract):
+                self._check_abstract(text, abstract, issues)
+                abstract = None
+
+            if keyword_match:
+                self._check_keywords(
+                    keyword_match.group("body"), offset + lead + keyword_match.start("body"), issues
+                )
+                keywords_pending = False
+                continue
+            if keywords_pending and not heading:
+                self._check_keywords(stripped, offset + lead, issues)
+                keywords_pending = False
+                continue
+            keywords_pending = False
+
+            if inline_abstract:
+                body = inline_abstract.group("body")
+                abstract = [offset + lead, offset + len(line), len(body.split())]
+                continue
+
+            if heading:
+                title = heading.group("title")
+                lowered = " ".join(title.lower().split())
+                if lowered == "abstract":
+                    abstract = [offset + lead, offset + len(line), 0]
+                elif lowered in ("keywords", "key words", "index terms"):
+                    keywords_pending = True
+                marker = heading.group("marker") or ""
+                # Only top-level headings take part in section numbering
+                if lowered not in UNNUMBERED and len(marker.strip()) <= 1:
+                    counter += 1
+                    issue = self._check_heading(stripped, offset + lead, heading, counter)
+                    if issue:
+                        issues.append(issue)
+                continue
+
+            if abstract is not None:
+                abstract[1] = offset + len(line)
+                abstract[2] += len(stripped.split())
+
+        if abstract is not None:
+            self._check_abstract(text, abstract, issues)
+        return issues
+
+    def _check_heading(self, line: str, position: int, heading: "re.Match", counter: int) -> Optional[FormattingIssue]:
+        marker = heading.group("marker") or ""
+        title = " ".join(heading.group("title").split())
+        number = heading.group("number") or ""
+        reasons = []
+
+        expected_number = number
+        if self.numbering is not None:
+            expected_number = self._number(counter)
+            if number.strip() != expected_number.strip():
+                reasons.append(f"{self.name} format requires {_NUMBERING_LABELS[self.numbering]} for main sections")
+        expected_title = title
+        if self.heading_case == "title":
+            expected_title = title_case(title)
+            if expected_title != title:
+                reasons.append(f"{self.name} section headings use title case")
+
+        if not reasons:
+            return None
+        return FormattingIssue(
+            rule="section_heading",
+            position=position,
+            length=len(line),
+            original=line,
+            suggestion=f"{marker}{expected_number}{expected_title}",
+            explanation="; ".join(reasons),
+            confidence=0.90,
+        )
+
+    def _check_abstract(self, text: str, abstract: List[int], issues: List[FormattingIssue]):
+        start, end, words = abstract
+        low, high = self.abstract_words
+        if not words:
+            return
+        if low is not None and words < low:
+            problem = f"has {words} words; {self.name} asks for at least {low}"
+        elif high is not None and words > high:
+            problem = f"has {words} words; {self.name} allows at most {high}"
+        else:
+            return
+        excerpt = text[start:end]
+        issues.append(FormattingIssue(
+            rule="abstract_length",
+            position=start,
+            length=end - start,
+            original=excerpt if len(excerpt) <= 200 else excerpt[:197] + "...",
+            suggestion="Shorten the abstract" if high is not None and words > high else "Expand the abstract",
+            explanation=f"Abstract {problem}",
+            confidence=0.85,
+        ))
+
+    def _check_keywords(self, body: str, position: int, issues: List[FormattingIssue]):
+        keywords = [k for k in _KEYWORD_SPLIT_RE.split(body.strip().rstrip(".")) if k]
+        if self.keyword_range:
+            low, high = self.keyword_range
+            if not (low or 0) <= len(keywords) <= (high or len(keywords)):
+                issues.append(FormattingIssue(
+                    rule="keyword_count",
+                    position=position,
+                    length=len(body),
+                    original=body,
+                    suggestion=f"Provide {low}-{high} keywords",
+                    explanation=f"{len(keywords)} keywords given; {self.name} asks for {low}-{high}",
+                    confidence=0.85,
+                ))
+        if self.keywords_sorted:
+            ordered = sorted(keywords, key=str.lower)
+            if ordered != keywords:
+                issues.append(FormattingIssue(
+                    rule="keyword_order",
+                    position=position,
+                    length=len(body),
+                    original=body,
+                    suggestion=", ".join(ordered),
+                    explanation=f"{self.name} lists keywords in alphabetical order",
+                    confidence=0.80,
+                ))
+
+
+@lru_cache(maxsize=None)
+def get_formatting_engine(template: str) -> FormattingEngine:
+    """Compiled formatting engine, built once per template name"""
+    spec = template_registry.get(template) or template_registry["Generic"]
+    return FormattingEngine(spec.name, spec.data.get("formatting", {}))
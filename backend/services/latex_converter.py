@@ -0,0 +1,297 @@
+"""
+LaTeX Converter
+Linear-time Markdown/plain text to LaTeX conversion
+
+The conversion is a three-stage stream:
+
+    lines -> tokenize() -> parse_blocks() -> emit() -> LaTeX chunks
+
+Every stage is a generator, so a document is never held twice in memory and
+output can be streamed while the input is still being processed. Output is
+accumulated in ``io.StringIO`` buffers instead of repeated string
+concatenation.
+"""
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+import io
+import re
+
+
+class Token(NamedTuple):
+    """One classified input line"""
+    kind: str
+    text: str = ""
+    level: int = 0
+
+
+class Block(NamedTuple):
+    """A parsed document block"""
+    kind: str
+    lines: Tuple[str, ...]
+    level: int = 0
+
+
+# Token / block kinds
+BLANK = "blank"
+HEADING = "heading"
+ULIST = "ulist"
+OLIST = "olist"
+QUOTE = "quote"
+TEXT = "text"
+FENCE = "fence"
+MATH_FENCE = "math_fence"
+MATH_LINE = "math_line"
+RAW = "raw"
+PARAGRAPH = "paragraph"
+CODE = "code"
+MATH = "math"
+
+HEADING_RE = re.compile(r"^(#{1,6})\s+(.*?)\s*#*$")
+ULIST_RE = re.compile(r"^[-*+]\s+(.*)$")
+OLIST_RE = re.compile(r"^\d+[.)]\s+(.*)$")
+MATH_LINE_RE = re.compile(r"^\$\$(.+)\$\$$")
+
+SECTION_COMMANDS = {
+    1: "section",
+    2: "subsection",
+    3: "subsubsection",
+    4: "paragraph",
+    5: "subparagraph",
+    6: "subparagraph",
+}
+
+_SPECIAL_CHARS = {
+    "\\": r"\textbackslash{}",
+    "~": r"\textasciitilde{}",
+    "^": r"\textasciicircum{}",
+    "&": r"\&",
+    "%": r"\%",
+    "$": r"\$",
+    "#": r"\#",
+    "_": r"\_",
+    "{": r"\{",
+    "}": r"\}",
+}
+
+_ESCAPE_RE = re.compile(r"[\\~^&%$#_{}]")
+
+# Inline constructs, tried left to right in a single scan of each line
+_INLINE_RE = re.compile(
+    r"(?P<math>\$(?![\s$])(?:\\.|[^$\\\n])*?(?<!\s)\$)"
+    r"|`(?P<code>[^`]+)`"
+    r"|\*\*(?P<bold>[^*]+?)\*\*"
+    r"|\*(?P<em>[^*\s][^*]*?)\*"
+    r"|(?<![\w\\])_(?P<uem>[^_\s][^_]*?)_(?!\w)"
+    r"|(?P<special>[\\~^&%$#_{}])"
+)
+
+
+def escape_latex(text: str) -> str:
+    """Escape LaTeX special characters in plain text"""
+    return _ESCAPE_RE.sub(lambda m: _SPECIAL_CHARS[m.group()], text)
+
+
+def _inline_replace(match: "re.Match") -> str:
+    kind = match.lastgroup
+    value = match.group(kind)
+    if kind == "math":
+        return value
+    if kind == "code":
+        return f"\\texttt{{{escape_latex(value)}}}"
+    if kind == "bold":
+        return f"\\textbf{{{convert_inline(value)}}}"
+    if kind in ("em", "uem"):
+        return f"\\emph{{{convert_inline(value)}}}"
+    return _SPECIAL_CHARS[value]
+
+
+def convert_inline(text: str) -> str:
+    """Convert emphasis, code and inline math; escape everything else"""
+    return _INLINE_RE.sub(_inline_replace, text)
+
+
+def tokenize(lines: Iterable[str]) -> Iterator[Token]:
+    """
+    Classify each input line
+
+    Lines inside a ``` or ``$$`` fence are passed through unchanged as RAW
+    tokens until the closing fence.
+    """
+    fence: Optional[str] = None  # FENCE or MATH_FENCE while inside one
+    for raw in lines:
+        line = raw.rstrip("\r\n")
+        stripped = line.strip()
+        if fence is not None:
+            if (stripped.startswith("```") if fence == FENCE else stripped == "$$"):
+                yield Token(fence, line)
+                fence = None
+            else:
+                yield Token(RAW, line)
+            continue
+        if not stripped:
+            yield Token(BLANK)
+            continue
+        if stripped.startswith("```"):
+            fence = FENCE
+            yield Token(FENCE, line)
+            continue
+        if stripped == "$$":
+            fence = MATH_FENCE
+            yield Token(MATH_FENCE)
+            continue
+        match = MATH_LINE_RE.match(stripped)
+        if match:
+            yield Token(MATH_LINE, match.group(1).strip())
+            continue
+        match = HEADING_RE.match(stripped)
+        if match:
+            yield Token(HEADING, match.group(2), len(match.group(1)))
+            continue
+        match = ULIST_RE.match(stripped)
+        if match:
+            yield Token(ULIST, match.group(1))
+            continue
+        match = OLIST_RE.match(stripped)
+        if match:
+            yield Token(OLIST, match.group(1))
+            continue
+        if stripped.startswith(">"):
+            yield Token(QUOTE, stripped[1:].strip())
+            continue
+        if stripped.isupper() and any(c.isalpha() for c in stripped):
+            # Legacy convention: an all-caps line is a section heading
+            yield Token(HEADING, stripped.title(), 1)
+            continue
+        yield Token(TEXT, stripped, 0)
+
+
+def parse_blocks(tokens: Iterable[Token]) -> Iterator[Block]:
+    """Group line tokens into blocks, yielding each block once it is complete"""
+    kind: Optional[str] = None
+    lines: List[str] = []
+    raw_mode: Optional[str] = None  # CODE or MATH while inside a fence
+
+    def flush():
+        nonlocal kind, lines
+        block = Block(kind, tuple(lines)) if kind else None
+        kind, lines = None, []
+        return block
+
+    for token in tokens:
+        if raw_mode is not None:
+            closes = (token.kind == FENCE) if raw_mode == CODE else (token.kind == MATH_FENCE)
+            if closes:
+                yield Block(raw_mode, tuple(lines))
+                kind, lines, raw_mode = None, [], None
+            else:
+                lines.append(token.text)
+            continue
+
+        if token.kind in (FENCE, MATH_FENCE):
+            block = flush()
+            if block:
+                yield block
+            raw_mode = CODE if token.kind == FENCE else MATH
+            continue
+
+        if token.kind in (HEADING, MATH_LINE, BLANK):
+            block = flush()
+            if block:
+                yield block
+            if token.kind == HEADING:
+                yield Block(HEADING, (token.text,), token.level)
+            elif token.kind == MATH_LINE:
+                yield Block(MATH, (token.text,))
+            continue
+
+        block_kind = PARAGRAPH if token.kind == TEXT else token.kind
+        if kind != block_kind:
+            # A plain text line directly after a list item continues that item
+            if token.kind == TEXT and kind in (ULIST, OLIST, QUOTE):
+                lines[-1] = f"{lines[-1]} {token.text}"
+                continue
+            block = flush()
+            if block:
+                yield block
+            kind = block_kind
+        lines.append(token.text)
+
+    if raw_mode is not None:
+        # Unterminated fence: emit what was collected
+        yield Block(raw_mode, tuple(lines))
+    else:
+        block = flush()
+        if block:
+            yield block
+
+
+def emit_block(block: Block, out: io.StringIO):
+    """Write the LaTeX for one block into ``out``"""
+    if block.kind == HEADING:
+        command = SECTION_COMMANDS.get(block.level, "paragraph")
+        out.write(f"\\{command}{{{convert_inline(block.lines[0])}}}\n\n")
+    elif block.kind == PARAGRAPH:
+        out.write("\n".join(convert_inline(line) for line in block.lines))
+        out.write("\n\n")
+    elif block.kind in (ULIST, OLIST):
+        env = "itemize" if block.kind == ULIST else "enumerate"
+        out.write(f"\\begin{{{env}}}\n")
+        for item in block.lines:
+            out.write(f"  \\item {convert_inline(item)}\n")
+        out.write(f"\\end{{{env}}}\n\n")
+    elif block.kind == QUOTE:
+        out.write("\\begin{quote}\n")
+        out.write("\n".join(convert_inline(line) for line in block.lines))
+        out.write("\n\\end{quote}\n\n")
+    elif block.kind == MATH:
+        out.write("\\begin{equation*}\n")
+        out.write("\n".join(block.lines))
+        out.write("\n\\end{equation*}\n\n")
+    elif block.kind == CODE:
+        out.write("\\begin{verbatim}\n")
+        out.write("\n".join(block.lines))
+        out.write("\n\\end{verbatim}\n\n")
+
+
+DEFAULT_PREAMBLE = (
+    "\\documentclass{article}\n"
+    "\\usepackage{amsmath}\n"
+    "\\usepackage{graphicx}\n\n"
+    "\\begin{document}\n\n"
+)
+DEFAULT_CLOSING = "\\end{document}\n"
+
+
+def iter_body(text: str, chunk_size: int = 16384) -> Iterator[str]:
+    """
+    Convert ``text`` and yield the LaTeX body in chunks of about ``chunk_size``
+
+    Lines are read lazily from an ``io.StringIO`` view of the input.
+    """
+    out = io.StringIO()
+    for block in parse_blocks(tokenize(io.StringIO(text))):
+        emit_block(block, out)
+        if out.tell() >= chunk_size:
+            yield out.getvalue()
+            out = io.StringIO()
+    if out.tell():
+        yield out.getvalue()
+
+
+def iter_document(
+    text: str,
+    preamble: str = DEFAULT_PREAMBLE,
+    closing: str = DEFAULT_CLOSING,
+    chunk_size: int = 16384
+) -> Iterator[str]:
+    """Yield a complete LaTeX document in chunks"""
+    yield preamble
+    yield from iter_body(text, chunk_size)
+    yield closing
+
+
+def convert_document(text: str, preamble: str = DEFAULT_PREAMBLE, closing: str = DEFAULT_CLOSING) -> str:
+    """Convert ``text`` to a complete LaTeX document string"""
+    out = io.StringIO()
+    for chunk in iter_document(text, preamble, closing):
+        out.write(chunk)
+    return out.getvalue()
@@ -0,0 +1,111 @@
+"""
+LaTeX Templates
+Template-aware manuscript skeletons (IEEEtran, elsarticle, acmart, ...)
+
+Document class, packages and front-matter layout come from the ``latex``
+section of each template data file. The fixed preamble is rendered and the
+front-matter fragments are compiled into ``string.Template`` objects once per
+template; manuscripts are then assembled in a single streaming pass.
+"""
+from typing import Any, Iterator, Mapping, Optional, Sequence
+from functools import lru_cache
+from string import Template
+import io
+
+from services.latex_converter import DEFAULT_CLOSING, convert_inline, iter_body
+from services.template_registry import template_registry
+
+
+class LatexTemplate:
+    """Precompiled LaTeX fragments for one academic template"""
+
+    def __init__(self, name: str, spec: Mapping[str, Any]):
+        self.name = name
+        packages = "".join(f"\\usepackage{{{pkg}}}\n" for pkg in spec.get("packages", ()))
+        self.preamble = f"{spec['documentclass']}\n{packages}\n\\begin{{document}}\n\n"
+        self.author_format = Template(spec["author_format"])
+        self.author_separator = spec["author_separator"]
+        self.keyword_separator = spec["keyword_separator"]
+        self.abstract_block = Template(spec["abstract_block"])
+        self.keywords_block = Template(spec["keywords_block"])
+        self.front_matter = Template(spec["front_matter"])
+
+    def render_front_matter(
+        self,
+        title: str,
+        authors: Sequence[str] = (),
+        abstract: Optional[str] = None,
+        keywords: Sequence[str] = ()
+    ) -> str:
+        """Title block, authors, abstract and keywords in this template's layout"""
+        author_text = self.author_separator.join(
+            self.author_format.substitute(name=convert_inline(a)) for a in authors
+        )
+        abstract_text = (
+            self.abstract_block.substitute(abstract=convert_inline(abstract)) if abstract else ""
+        )
+        keyword_text = (
+            self.keywords_block.substitute(
+                keywords=self.keyword_separator.join(convert_inline(k) for k in keywords)
+            ) if keywords else ""
+        )
+        return self.front_matter.substitute(
+            title=convert_inline(title),
+            authors=author_text,
+            abstract_block=abstract_text,
+            keywords_block=keyword_text,
+        )
+
+
+@lru_cache(maxsize=None)
+def get_latex_template(template: str) -> LatexTemplate:
+    """Compiled LaTeX template, built once per template name"""
+    spec = template_registry.get(template) or template_registry["Generic"]
+    return LatexTemplate(spec.name, spec.data["latex"])
+
+
+def render_bibliography(references: Sequence[str]) -> str:
+    """thebibliography environment for a list of formatted references"""
+    if not references:
+        return ""
+    out = io.StringIO()
+    out.write(f"\\begin{{thebibliography}}{{{len(references)}}}\n\n")
+    for number, reference in enumerate(references, 1):
+        out.write(f"\\bibitem{{ref{number}}} {convert_inline(reference)}\n\n")
+    out.write("\\end{thebibliography}\n\n")
+    return out.getvalue()
+
+
+def iter_manuscript(
+    content: str,
+    template: str = "Generic",
+    title: Optional[str] = None,
+    authors: Sequence[str] = (),
+    abstract: Optional[str] = None,
+    keywords: Sequence[str] = (),
+    references: Sequence[str] = (),
+    chunk_size: int = 16384
+) -> Iterator[str]:
+    """
+    Yield a complete manuscript for ``template`` in one pass
+
+    The front matter is only emitted when a title is given, so plain text can
+    still be converted into a bare template skeleton.
+    """
+    latex = get_latex_template(template)
+    yield latex.preamble
+    if title:
+        yield latex.render_front_matter(title, authors, abstract, keywords)
+    yield from iter_body(content, chunk_size)
+    bibliography = render_bibliography(references)
+    if bibliography:
+        yield bibliography
+    yield DEFAULT_CLOSING
+
+
+def render_manuscript(content: str, template: str = "Generic", **metadata) -> str:
+    """Complete manuscript as a single string"""
+    out = io.StringIO()
+    for chunk in iter_manuscript(content, template, **metadata):
+        out.write(chunk)
+    return out.getvalue()
@@ -0,0 +1,151 @@
+"""
+Live Editing Sessions
+Server-side document state for the editor's WebSocket channel
+
+The client sends small edit operations instead of the full text. Each
+session applies them to its copy of the document, re-runs the editor checks
+and reports only the suggestions that appeared or disappeared. Suggestions
+untouched by an edit keep their identity: their positions are shifted
+through the edit exactly as the client shifts its own text, so they are not
+re-sent.
+"""
+from typing import Dict, List, Optional, Tuple
+from collections import OrderedDict
+import itertools
+import os
+import time
+
+from models.article import EditOperation
+from services.editor_service import Suggestion, editor_service
+from services.text_ops import EditError, resolve
+
+
+SuggestionKey = Tuple[str, int, int, str, str]
+
+
+def _key(suggestion: Suggestion) -> SuggestionKey:
+    return (
+        suggestion.type.value, suggestion.position, suggestion.length,
+        suggestion.original, suggestion.suggestion
+    )
+
+
+class LiveSession:
+    """Document state and current suggestions for one connection"""
+
+    def __init__(self, session_id: str, template: str = "Generic", max_chars: int = 500000):
+        self.session_id = session_id
+        self.template = template
+        self.max_chars = max_chars
+        self.text = ""
+        self.version = 0
+        self.suggestions: Dict[SuggestionKey, Suggestion] = {}
+        self.last_active = time.monotonic()
+
+    def touch(self):
+        self.last_active = time.monotonic()
+
+    def apply(self, operations: List[EditOperation]):
+        """
+        Apply edits in order, shifting existing suggestions along with them
+
+        Suggestions overlapping an edited range are dropped; the next check
+        reports them as removed (or re-adds them if they still apply).
+        Raises EditError if an edit is out of range or the document would
+        exceed ``max_chars``; the document is left unchanged in that case.
+        """
+        text = self.text
+        suggestions = list(self.suggestions.values())
+        for operation in operations:
+            start, end, insert = resolve(len(text), operation)
+            if len(text) - (end - start) + len(insert) > self.max_chars:
+                raise EditError(f"Document would exceed {self.max_chars} characters")
+
+            text = text[:start] + insert + text[end:]
+            delta = len(insert) - (end - start)
+            shifted = []
+            for suggestion in suggestions:
+                s_start, s_end = suggestion.position, suggestion.position + suggestion.length
+                if s_end <= start:
+                    shifted.append(suggestion)
+                elif s_start >= end:
+                    shifted.append(suggestion.model_copy(update={"position": s_start + delta}))
+            suggestions = shifted
+
+        self.text = text
+        self.version += 1
+        self.suggestions = {_key(s): s for s in suggestions}
+
+    async def check(self) -> Tuple[List[Suggestion], List[Suggestion]]:
+        """Re-run the editor checks and return (added, removed) suggestions"""
+        current = await editor_service.check_document(self.text, self.template)
+        fresh = {_key(s): s for s in current}
+        added = [s for key, s in fresh.items() if key not in self.suggestions]
+        removed = [s for key, s in self.suggestions.items() if key not in fresh]
+        self.suggestions = fresh
+        return added, removed
+
+
+class LiveSessionManager:
+    """
+    Bounded registry of live sessions
+
+    Args:
+        max_sessions: Sessions held at once; opening one more evicts the
+            least recently active
+        idle_timeout: Seconds without messages before a session is evicted
+        max_chars: Per-session document size limit
+    """
+
+    def __init__(self, max_sessions: int = 1000, idle_timeout: float = 300.0, max_chars: int = 500000):
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.max_chars = max_chars
+        self._sessions: "OrderedDict[str, LiveSession]" = OrderedDict()
+        self._ids = itertools.count(1)
+        self.evicted = 0
+
+    def open(self, template: str = "Generic") -> LiveSession:
+        self.sweep()
+        while len(self._sessions) >= self.max_sessions:
+            self._sessions.popitem(last=False)
+            self.evicted += 1
+        session = LiveSession(f"live-{os.getpid()}-{next(self._ids)}", template, self.max_chars)
+        self._sessions[session.session_id] = session
+        return session
+
+    def get(self, session_id: str) -> Optional[LiveSession]:
+        """Active session by id, marking it as recently used"""
+        session = self._sessions.get(session_id)
+        if session is not None:
+            session.touch()
+            self._sessions.move_to_end(session_id)
+        return session
+
+    def close(self, session_id: str):
+        self._sessions.pop(session_id, None)
+
+    def sweep(self) -> int:
+        """Evict idle sessions; returns how many were removed"""
+        cutoff = time.monotonic() - self.idle_timeout
+        removed = 0
+        # Sessions are kept in least-recently-active order
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if session.last_active >= cutoff:
+                break
+            del self._sessions[session_id]
+            removed += 1
+        self.evicted += removed
+        return removed
+
+    def stats(self) -> Dict[str, int]:
+        return {"sessions": len(self._sessions), "max_sessions": self.max_sessions, "evicted": self.evicted}
+
+
+# Global session manager
+live_sessions = LiveSessionManager(
+    max_sessions=int(os.getenv("LIVE_MAX_SESSIONS", 1000)),
+    idle_timeout=float(os.getenv("LIVE_IDLE_TIMEOUT", 300)),
+    max_chars=int(os.getenv("LIVE_MAX_CHARS", 500000)),
+)
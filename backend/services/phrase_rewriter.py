@@ -0,0 +1,138 @@
+"""
+Phrase Rewriter
+Single-pass, word-boundary-aware phrase replacement
+
+Rule tables live in ``data/phrases/<discipline>.json``; every discipline
+inherits the ``general`` table. A table is compiled once into a trie-shaped
+regular expression, so one left-to-right scan applies every rule and the
+cost of matching grows with phrase length, not with the number of rules.
+Longest match wins and replacements follow the casing of the matched text.
+"""
+from typing import Dict, List, NamedTuple, Tuple
+from functools import lru_cache
+from pathlib import Path
+import io
+import json
+import re
+
+
+PHRASE_DIR = Path(__file__).resolve().parent.parent / "data" / "phrases"
+BASE_DISCIPLINE = "general"
+
+
+class Change(NamedTuple):
+    """One replacement, with spans in both the original and rewritten text"""
+    start: int
+    end: int
+    original: str
+    replacement: str
+    rule: str
+    output_start: int
+    output_end: int
+
+
+class RewriteResult(NamedTuple):
+    text: str
+    changes: List[Change]
+
+
+def _trie_pattern(phrases: List[str]) -> str:
+    """
+    Build a regex equivalent to ``a|b|c...`` from a character trie
+
+    Shared prefixes are factored out, so the engine never retries the same
+    prefix for every phrase that starts with it. Spaces match any run of
+    whitespace.
+    """
+    trie: Dict = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def build(node: Dict) -> str:
+        terminal = "" in node
+        branches = [
+            (r"\s+" if char == " " else re.escape(char)) + build(child)
+            for char, child in sorted(node.items()) if char
+        ]
+        if not branches:
+            return ""
+        # Longer continuations are tried first, giving longest-match semantics
+        body = branches[0] if len(branches) == 1 and not terminal else "(?:" + "|".join(branches) + ")"
+        return body + "?" if terminal else body
+
+    return build(trie)
+
+
+def match_case(replacement: str, original: str) -> str:
+    """Apply the casing pattern of ``original`` to ``replacement``"""
+    if original.isupper() and len(original) > 1:
+        return replacement.upper()
+    if original[:1].isupper():
+        return replacement[:1].upper() + replacement[1:]
+    return replacement
+
+
+class PhraseRewriter:
+    """Compiled rewriter for one rule table"""
+
+    def __init__(self, rules: Dict[str, str]):
+        # Normalize keys: lower case, single spaces
+        self.rules = {" ".join(k.lower().split()): v for k, v in rules.items() if k.strip()}
+        pattern = _trie_pattern(list(self.rules))
+        self._regex = re.compile(rf"(?<!\w)(?:{pattern})(?!\w)", re.IGNORECASE) if self.rules else None
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def rewrite(self, text: str) -> RewriteResult:
+        """Apply every rule in one left-to-right pass"""
+        if self._regex is None:
+            return RewriteResult(text, [])
+        out = io.StringIO()
+        changes: List[Change] = []
+        last = 0
+        written = 0
+        for match in self._regex.finditer(text):
+            original = match.group()
+            rule = " ".join(original.lower().split())
+            replacement = match_case(self.rules[rule], original)
+            segment = text[last:match.start()]
+            out.write(segment)
+            written += len(segment)
+            out.write(replacement)
+            changes.append(Change(
+                match.start(), match.end(), original, replacement, rule,
+                written, written + len(replacement)
+            ))
+            written += len(replacement)
+            last = match.end()
+        if not changes:
+            return RewriteResult(text, changes)
+        out.write(text[last:])
+        return RewriteResult(out.getvalue(), changes)
+
+
+_DISCIPLINE_RE = re.compile(r"^[a-z][a-z0-9_]*$")
+
+
+def _read_rules(discipline: str) -> Dict[str, str]:
+    path = PHRASE_DIR / f"{discipline}.json"
+    if not _DISCIPLINE_RE.match(discipline) or not path.is_file():
+        raise KeyError(f"Unknown discipline: {discipline}")
+    return json.loads(path.read_text(encoding="utf-8"))["rules"]
+
+
+def available_disciplines() -> Tuple[str, ...]:
+    return tuple(sorted(p.stem for p in PHRASE_DIR.glob("*.json")))
+
+
+@lru_cache(maxsize=None)
+def get_rewriter(discipline: str = BASE_DISCIPLINE) -> PhraseRewriter:
+    """Compiled rewriter for a discipline (general rules plus its own)"""
+    rules = dict(_read_rules(BASE_DISCIPLINE))
+    if discipline != BASE_DISCIPLINE:
+        rules.update(_read_rules(discipline))
+    return PhraseRewriter(rules)
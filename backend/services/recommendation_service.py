@@ -2,10 +2,19 @@
 Recommendation Service
 AI-powered literature and knowledge recommendation system
 """
-from typing import List, Dict, Optional, Any
+from typing import AsyncIterator, List, Dict, Optional, Any, Tuple
 from pydantic import BaseModel
 from enum import Enum
 from datetime import datetime
+import asyncio
+import os
+
+from middleware.cpu_executor import cpu_executor, PoolKind
+from middleware.metrics import stage, timed
+from services.citation_formatter import CitationStyle, citation_formatter
+from services.phrase_rewriter import BASE_DISCIPLINE, get_rewriter
+from services.sentence_segmenter import iter_paragraphs, iter_sentences
+from services.text_metrics import style_scores
 
 
 class RecommendationType(str, Enum):
@@ -31,6 +40,14 @@ class Paper(BaseModel):
     relevance_score: float = 0.0
 
 
+class PhraseChange(BaseModel):
+    """A single phrase replacement with its span in the original sentence"""
+    start: int
+    end: int
+    original: str
+    replacement: str
+
+
 class LanguageOptimization(BaseModel):
     """Language optimization suggestion"""
     original_sentence: str
@@ -38,6 +55,133 @@ class LanguageOptimization(BaseModel):
     improvements: List[str]
     formality_score: float
     clarity_score: float
+    changes: List[PhraseChange] = []
+
+
+def _search_papers(
+    papers: List[Paper],
+    query: str,
+    limit: int,
+    recommendation_type: Optional[RecommendationType]
+) -> List[Paper]:
+    """Keyword match and rank papers for RecommendationService.search_papers"""
+    # Simple keyword matching (in production, use semantic search)
+    query_lower = query.lower()
+    results = []
+    
+    for paper in papers:
+        # Calculate relevance based on keyword matching
+        title_match = any(word in paper.title.lower() for word in query_lower.split())
+        abstract_match = any(word in paper.abstract.lower() for word in query_lower.split())
+        
+        if title_match or abstract_match:
+            results.append(paper)
+    
+    # Sort based on recommendation type
+    if recommendation_type == RecommendationType.HIGH_CITATION:
+        results.sort(key=lambda p: p.citations, reverse=True)
+    elif recommendation_type == RecommendationType.RECENT:
+        results.sort(key=lambda p: p.year, reverse=True)
+    elif recommendation_type == RecommendationType.HIGH_IMPACT:
+        # Calculate impact factor as citations per year since publication
+        current_year = datetime.now().year
+        results.sort(key=lambda p: p.citations / max(current_year - p.year, 1), reverse=True)
+    else:
+        results.sort(key=lambda p: p.relevance_score, reverse=True)
+    
+    return results[:limit]
+
+
+def _build_optimization(
+    sentence: str,
+    optimized: str,
+    changes: List[PhraseChange],
+    scores: Tuple[float, float]
+) -> LanguageOptimization:
+    """Assemble a LanguageOptimization from rewriter changes for one sentence"""
+    improvements = []
+    seen = set()
+    for change in changes:
+        rule = " ".join(change.original.lower().split())
+        if rule not in seen:
+            seen.add(rule)
+            improvements.append(f"Replaced '{rule}' with '{change.replacement.lower()}' for formal tone")
+    
+    # Add passive voice suggestion for methods
+    if "we" in sentence.lower() and "method" in sentence.lower():
+        improvements.append("Consider using passive voice in methodology sections")
+    
+    # Scores measured on the optimized text
+    formality_score, clarity_score = scores
+    
+    return LanguageOptimization(
+        original_sentence=sentence,
+        optimized_sentence=optimized,
+        improvements=improvements,
+        formality_score=formality_score,
+        clarity_score=clarity_score,
+        changes=changes
+    )
+
+
+def _optimize_sentence(sentence: str, discipline: str = BASE_DISCIPLINE) -> LanguageOptimization:
+    """Phrase-level rewrite behind RecommendationService.optimize_sentence"""
+    # Replace informal words (rule tables in data/phrases)
+    result = get_rewriter(discipline).rewrite(sentence)
+    changes = [
+        PhraseChange(start=c.start, end=c.end, original=c.original, replacement=c.replacement)
+        for c in result.changes
+    ]
+    return _build_optimization(sentence, result.text, changes, style_scores([result.text])[0])
+
+
+def _optimize_paragraph(paragraph: str, discipline: str = BASE_DISCIPLINE) -> Dict[str, Any]:
+    """
+    Whole-paragraph rewrite behind RecommendationService.optimize_paragraph
+    
+    The paragraph is rewritten in a single pass and the changes are then
+    distributed over the segmented sentences by offset.
+    """
+    result = get_rewriter(discipline).rewrite(paragraph)
+    changes = result.changes
+    rewritten = []
+    
+    index = 0
+    for span in iter_sentences(paragraph):
+        while index < len(changes) and changes[index].start < span.start:
+            index += 1
+        sentence_changes = []
+        pieces = []
+        cursor = span.start
+        while index < len(changes) and changes[index].end <= span.end:
+            change = changes[index]
+            pieces.append(paragraph[cursor:change.start])
+            pieces.append(change.replacement)
+            cursor = change.end
+            sentence_changes.append(PhraseChange(
+                start=change.start - span.start,
+                end=change.end - span.start,
+                original=change.original,
+                replacement=change.replacement
+            ))
+            index += 1
+        pieces.append(paragraph[cursor:span.end])
+        rewritten.append((span.text, "".join(pieces), sentence_changes))
+    
+    # Score every optimized sentence in one vectorized call
+    scores = style_scores([optimized for _, optimized, _ in rewritten])
+    optimizations = [
+        _build_optimization(sentence, optimized, sentence_changes, score)
+        for (sentence, optimized, sentence_changes), score in zip(rewritten, scores)
+    ]
+    
+    return {
+        "original": paragraph,
+        "optimized": result.text,
+        "sentence_optimizations": optimizations,
+        "overall_formality": sum(opt.formality_score for opt in optimizations) / len(optimizations) if optimizations else 0,
+        "overall_clarity": sum(opt.clarity_score for opt in optimizations) / len(optimizations) if optimizations else 0,
+    }
 
 
 class RecommendationService:
@@ -46,6 +190,10 @@ class RecommendationService:
     def __init__(self):
         # Mock database of papers (in production, connect to real databases)
         self.papers_db = self._initialize_paper_database()
+        self.papers_by_id = {p.paper_id: p for p in self.papers_db}
+        self.papers_by_doi = {p.doi.lower(): p for p in self.papers_db if p.doi}
+        # Paragraphs optimized at once by optimize_document
+        self.document_concurrency = max(1, int(os.getenv("OPTIMIZE_CONCURRENCY", 4)))
     
     def _initialize_paper_database(self) -> List[Paper]:
         """Initialize mock paper database"""
@@ -85,6 +233,7 @@ class RecommendationService:
             ),
         ]
     
+    @timed("recommendation")
     async def search_papers(
         self, 
         query: str, 
@@ -101,32 +250,15 @@ class RecommendationService:
             limit: Maximum number of papers to return
             recommendation_type: Type of recommendation to prioritize
         """
-        # Simple keyword matching (in production, use semantic search)
-        query_lower = query.lower()
-        results = []
-        
-        for paper in self.papers_db:
-            # Calculate relevance based on keyword matching
-            title_match = any(word in paper.title.lower() for word in query_lower.split())
-            abstract_match = any(word in paper.abstract.lower() for word in query_lower.split())
-            
-            if title_match or abstract_match:
-                results.append(paper)
-        
-        # Sort based on recommendation type
-        if recommendation_type == RecommendationType.HIGH_CITATION:
-            results.sort(key=lambda p: p.citations, reverse=True)
-        elif recommendation_type == RecommendationType.RECENT:
-            results.sort(key=lambda p: p.year, reverse=True)
-        elif recommendation_type == RecommendationType.HIGH_IMPACT:
-            # Calculate impact factor as citations per year since publication
-            current_year = datetime.now().year
-            results.sort(key=lambda p: p.citations / max(current_year - p.year, 1), reverse=True)
-        else:
-            results.sort(key=lambda p: p.relevance_score, reverse=True)
-        
-        return results[:limit]
+        # Cost grows with corpus size times query length
+        with stage("recommendation", "search_papers", "scoring"):
+            return await cpu_executor.run(
+                _search_papers, self.papers_db, query, limit, recommendation_type,
+                size=len(self.papers_db) * len(query),
+                kind=PoolKind.THREAD
+            )
     
+    @timed("recommendation")
     async def recommend_papers(
         self, 
         context: str,
@@ -163,7 +295,12 @@ class RecommendationService:
         
         return scored_papers[:limit]
     
-    async def optimize_sentence(self, sentence: str) -> LanguageOptimization:
+    @timed("recommendation")
+    async def optimize_sentence(
+        self,
+        sentence: str,
+        discipline: str = BASE_DISCIPLINE
+    ) -> LanguageOptimization:
         """
         Optimize a sentence for academic writing
         
@@ -171,73 +308,103 @@ class RecommendationService:
         
         Args:
             sentence: Original sentence to optimize
+            discipline: Phrase table to apply on top of the general rules
         """
-        # Example optimizations (in production, use AI model)
-        optimized = sentence
-        improvements = []
-        
-        # Replace informal words
-        replacements = {
-            "a lot of": "numerous",
-            "very": "significantly",
-            "get": "obtain",
-            "show": "demonstrate",
-            "find": "determine",
-            "use": "utilize",
-            "good": "effective",
-            "bad": "ineffective",
-            "big": "substantial",
-            "small": "minimal",
-        }
-        
-        for informal, formal in replacements.items():
-            if informal in sentence.lower():
-                optimized = optimized.replace(informal, formal)
-                improvements.append(f"Replaced '{informal}' with '{formal}' for formal tone")
-        
-        # Add passive voice suggestion for methods
-        if "we" in sentence.lower() and "method" in sentence.lower():
-            improvements.append("Consider using passive voice in methodology sections")
-        
-        # Calculate scores
-        formality_score = 0.7 + (len(improvements) * 0.1)
-        clarity_score = 0.8
-        
-        return LanguageOptimization(
-            original_sentence=sentence,
-            optimized_sentence=optimized,
-            improvements=improvements,
-            formality_score=min(formality_score, 1.0),
-            clarity_score=clarity_score
-        )
+        return await cpu_executor.run(_optimize_sentence, sentence, discipline, size=len(sentence))
     
-    async def optimize_paragraph(self, paragraph: str) -> Dict[str, Any]:
+    @timed("recommendation")
+    async def optimize_paragraph(
+        self,
+        paragraph: str,
+        discipline: str = BASE_DISCIPLINE
+    ) -> Dict[str, Any]:
         """
         Optimize an entire paragraph
         
         Returns comprehensive suggestions for improvement
         """
-        sentences = paragraph.split('.')
-        optimizations = []
+        return await cpu_executor.run(_optimize_paragraph, paragraph, discipline, size=len(paragraph))
+    
+    @timed("recommendation")
+    async def optimize_document(
+        self,
+        text: str,
+        discipline: str = BASE_DISCIPLINE,
+        concurrency: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Optimize a whole document paragraph by paragraph
         
-        for sentence in sentences:
-            if sentence.strip():
-                opt = await self.optimize_sentence(sentence.strip())
-                optimizations.append(opt)
+        Paragraphs are read lazily and at most ``concurrency`` are in flight,
+        so the first result arrives after one paragraph's work regardless of
+        document length. Every paragraph is offloaded to the process pool,
+        however short, so those paragraphs really run in parallel. Results
+        are yielded in completion order, tagged with their paragraph index
+        and offsets; a final ``done`` event carries the document-level scores.
         
-        # Combine optimized sentences
-        optimized_paragraph = '. '.join([opt.optimized_sentence for opt in optimizations])
-        if optimized_paragraph and not optimized_paragraph.endswith('.'):
-            optimized_paragraph += '.'
+        Args:
+            text: Full document text, paragraphs separated by blank lines
+            discipline: Phrase table to apply on top of the general rules
+            concurrency: Maximum paragraphs in flight (default OPTIMIZE_CONCURRENCY)
+        """
+        limit = concurrency or self.document_concurrency
+        paragraphs = enumerate(iter_paragraphs(text))
+        pending: Dict[asyncio.Task, Any] = {}
+        count = 0
+        formality = 0.0
+        clarity = 0.0
+        exhausted = False
         
-        return {
-            "original": paragraph,
-            "optimized": optimized_paragraph,
-            "sentence_optimizations": optimizations,
-            "overall_formality": sum(opt.formality_score for opt in optimizations) / len(optimizations) if optimizations else 0,
-            "overall_clarity": sum(opt.clarity_score for opt in optimizations) / len(optimizations) if optimizations else 0,
+        try:
+            while True:
+                while not exhausted and len(pending) < limit:
+                    item = next(paragraphs, None)
+                    if item is None:
+                        exhausted = True
+                        break
+                    index, span = item
+                    # Inline runs would execute one after another on the loop
+                    task = asyncio.ensure_future(cpu_executor.run(
+                        _optimize_paragraph, span.text, discipline,
+                        size=len(span.text), kind=PoolKind.PROCESS, offload=True
+                    ))
+                    pending[task] = (index, span)
+                if not pending:
+                    break
+                
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    index, span = pending.pop(task)
+                    result = task.result()
+                    count += 1
+                    formality += result["overall_formality"]
+                    clarity += result["overall_clarity"]
+                    yield {
+                        "event": "paragraph",
+                        "index": index,
+                        "start": span.start,
+                        "end": span.end,
+                        "original": result["original"],
+                        "optimized": result["optimized"],
+                        "sentence_optimizations": [
+                            opt.model_dump() for opt in result["sentence_optimizations"]
+                        ],
+                        "overall_formality": result["overall_formality"],
+                        "overall_clarity": result["overall_clarity"],
+                    }
+        finally:
+            # Client went away or a paragraph failed: drop outstanding work
+            for task in pending:
+                task.cancel()
+        
+        yield {
+            "event": "done",
+            "paragraphs": count,
+            "overall_formality": formality / count if count else 0,
+            "overall_clarity": clarity / count if count else 0,
         }
     
+    @timed("recommendation")
     async def get_citation_suggestions(self, topic: str) -> List[str]:
         """
         Suggest citations for a given topic
@@ -246,17 +413,55 @@ class RecommendationService:
         """
         papers = await self.search_papers(topic, limit=5, recommendation_type=RecommendationType.HIGH_CITATION)
         
-        citations = []
-        for i, paper in enumerate(papers, 1):
-            authors_str = ", ".join(paper.authors[:3])
-            if len(paper.authors) > 3:
-                authors_str += " et al."
+        return [
+            f"[{i}] {entry}"
+            for i, entry in enumerate(citation_formatter.format_many(papers, CitationStyle.IEEE), 1)
+        ]
+    
+    @timed("recommendation")
+    async def format_bibliography(
+        self,
+        paper_ids: Optional[List[str]] = None,
+        dois: Optional[List[str]] = None,
+        style: CitationStyle = CitationStyle.IEEE
+    ) -> Dict[str, Any]:
+        """
+        Format a bibliography for many papers at once
+        
+        Args:
+            paper_ids: Papers to include, in order
+            dois: Papers to include by DOI, appended after paper_ids
+            style: Citation style (IEEE, APA, ACM, Nature, BibTeX)
             
-            citation = f"[{i}] {authors_str}, \"{paper.title}\", {paper.venue}, {paper.year}."
-            citations.append(citation)
+        Returns:
+            Formatted entries, the rendered bibliography and any identifiers
+            that could not be resolved
+        """
+        papers = []
+        missing = []
+        for paper_id in paper_ids or []:
+            paper = self.papers_by_id.get(paper_id)
+            if paper:
+                papers.append(paper)
+            else:
+                missing.append(paper_id)
+        for doi in dois or []:
+            paper = self.papers_by_doi.get(doi.strip().lower())
+            if paper:
+                papers.append(paper)
+            else:
+                missing.append(doi)
         
-        return citations
-
+        entries = await cpu_executor.run(
+            citation_formatter.format_many, papers, style,
+            size=len(papers) * 100, kind=PoolKind.THREAD
+        )
+        return {
+            "style": style,
+            "entries": entries,
+            "bibliography": citation_formatter.join(entries, style),
+            "missing": missing
+        }
 
 # Global service instance
 recommendation_service = RecommendationService()
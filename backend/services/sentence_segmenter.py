@@ -0,0 +1,118 @@
+"""
+Sentence Segmenter
+Rule-based sentence splitting with an abbreviation lexicon and offsets
+
+A sentence ends at ``.``, ``!`` or ``?`` (plus any closing quotes or
+brackets) followed by whitespace, unless the period belongs to a known
+abbreviation ("e.g.", "Fig.", "et al."), an initial ("A. Smith") or the
+next word starts in lower case. Periods inside tokens (decimals, DOIs,
+URLs) are never candidates because no whitespace follows them. A blank line
+always ends a sentence.
+"""
+from typing import Iterator, List, NamedTuple
+import re
+
+
+class SentenceSpan(NamedTuple):
+    """A sentence and its [start, end) offsets in the source text"""
+    start: int
+    end: int
+    text: str
+
+
+ABBREVIATIONS = frozenset({
+    # Latin and general
+    "e.g", "i.e", "cf", "etc", "vs", "viz", "al", "et al", "approx", "ca", "resp",
+    "incl", "esp", "misc", "no", "nos", "vol", "vols", "pp", "p", "ed", "eds",
+    "ch", "sec", "secs", "para", "ref", "refs", "st", "nd", "rd", "th",
+    # Figures, tables, equations
+    "fig", "figs", "tab", "tabs", "eq", "eqs", "eqn", "eqns", "suppl", "app",
+    # Titles
+    "dr", "prof", "mr", "mrs", "ms", "jr", "sr", "rev", "gen", "hon",
+    # Units and misc scientific
+    "min", "max", "avg", "std", "var", "dept", "univ", "inst", "corp", "inc", "ltd", "co",
+    # Months
+    "jan", "feb", "mar", "apr", "jun", "jul", "aug", "sep", "sept", "oct", "nov", "dec",
+})
+
+# Abbreviations after which a capitalized word does not start a new sentence
+_NON_TERMINAL = frozenset({
+    "e.g", "i.e", "cf", "vs", "viz", "fig", "figs", "tab", "tabs", "eq", "eqs",
+    "eqn", "eqns", "ref", "refs", "sec", "secs", "ch", "no", "nos", "vol", "pp", "p",
+    "dr", "prof", "mr", "mrs", "ms", "st", "approx", "ca", "al", "et al",
+})
+
+_CANDIDATE_RE = re.compile(r"[.!?]+[\"'”’)\]]*(?=\s|$)|\n[ \t]*\n")
+_PARAGRAPH_BREAK_RE = re.compile(r"\n[ \t]*\n")
+_PREV_TOKEN_RE = re.compile(r"(\S+)$")
+_NEXT_CHAR_RE = re.compile(r"\s*([\"'“‘(\[]*)(\S)?")
+
+
+def _is_boundary(text: str, match: "re.Match") -> bool:
+    punct = match.group()
+    if punct.startswith("\n"):
+        return True
+    if "." not in punct or punct.rstrip("\"'”’)]").endswith(("!", "?")):
+        return True
+
+    # Token before the final period, e.g. "Fig" or "e.g"
+    head = text[max(0, match.start() - 32):match.start()]
+    token_match = _PREV_TOKEN_RE.search(head)
+    token = token_match.group(1).lower().lstrip("(\"'[“‘") if token_match else ""
+    if head.lower().endswith("et al"):
+        token = "et al"
+
+    nxt = _NEXT_CHAR_RE.match(text, match.end())
+    next_char = nxt.group(2) if nxt else None
+    if next_char is None:
+        return True
+    if next_char.islower():
+        return False
+
+    if token in _NON_TERMINAL:
+        return False
+    if len(token) == 1 and token.isalpha():
+        # Single initial such as "J. Smith"
+        return False
+    if token in ABBREVIATIONS:
+        # "etc." and similar can end a sentence; rely on the next word
+        return next_char.isupper()
+    return True
+
+
+def iter_sentences(text: str) -> Iterator[SentenceSpan]:
+    """Yield sentences with offsets, in one pass over ``text``"""
+    start = 0
+    length = len(text)
+    for match in _CANDIDATE_RE.finditer(text):
+        if not _is_boundary(text, match):
+            continue
+        end = match.end() if not match.group().startswith("\n") else match.start()
+        yield from _emit(text, start, end)
+        start = match.end()
+    if start < length:
+        yield from _emit(text, start, length)
+
+
+def _emit(text: str, start: int, end: int) -> Iterator[SentenceSpan]:
+    # Trim surrounding whitespace while keeping offsets exact
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    if start < end:
+        yield SentenceSpan(start, end, text[start:end])
+
+
+def iter_paragraphs(text: str) -> Iterator[SentenceSpan]:
+    """Yield blank-line separated paragraphs with offsets, lazily"""
+    start = 0
+    for match in _PARAGRAPH_BREAK_RE.finditer(text):
+        yield from _emit(text, start, match.start())
+        start = match.end()
+    yield from _emit(text, start, len(text))
+
+
+def segment(text: str) -> List[SentenceSpan]:
+    """All sentences in ``text`` with their offsets"""
+    return list(iter_sentences(text))
@@ -0,0 +1,106 @@
+"""
+Template Registry
+Immutable, load-once registry of academic template definitions
+
+Each TemplateType has a data file in ``data/templates``. Files are parsed
+once at import; every request afterwards reads frozen data and
+pre-serialized JSON bytes with a precomputed ETag.
+"""
+from typing import Any, Dict, Iterator, Mapping, Optional, Tuple
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import MappingProxyType
+import hashlib
+import json
+
+from models.article import TemplateType
+
+
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "data" / "templates"
+
+# Template data only changes on deploy; let browsers and nginx cache it
+RULES_CACHE_CONTROL = "public, max-age=86400"
+
+
+@dataclass(frozen=True)
+class TemplateSpec:
+    """Frozen definition of one academic template"""
+    name: str
+    sections: Tuple[str, ...]
+    guidelines: Tuple[str, ...]
+    rules: Tuple[Mapping[str, str], ...]
+    data: Mapping[str, Any] = field(repr=False)
+    rules_json: bytes = field(repr=False)
+    rules_etag: str = ""
+
+    def structure(self) -> Dict[str, Any]:
+        """Section/guideline structure as returned by suggest_structure"""
+        return {"sections": list(self.sections), "guidelines": list(self.guidelines)}
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively convert parsed JSON into read-only containers"""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _etag(payload: bytes) -> str:
+    return '"' + hashlib.sha256(payload).hexdigest()[:32] + '"'
+
+
+def _load_spec(path: Path) -> TemplateSpec:
+    raw = json.loads(path.read_text(encoding="utf-8"))
+    name = raw["template"]
+    rules = [{"rule_id": r["rule_id"], "template": name, "category": r["category"],
+              "description": r["description"], "example": r["example"]}
+             for r in raw.get("rules", [])]
+    rules_json = json.dumps(rules, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return TemplateSpec(
+        name=name,
+        sections=tuple(raw.get("sections", [])),
+        guidelines=tuple(raw.get("guidelines", [])),
+        rules=tuple(MappingProxyType(r) for r in rules),
+        data=_freeze(raw),
+        rules_json=rules_json,
+        rules_etag=_etag(rules_json),
+    )
+
+
+class TemplateRegistry:
+    """Read-only lookup of TemplateSpec by template name"""
+
+    def __init__(self, directory: Path = TEMPLATE_DIR):
+        specs = {}
+        for template in TemplateType:
+            path = directory / f"{template.value.lower()}.json"
+            specs[template.value] = _load_spec(path)
+        self._specs: Mapping[str, TemplateSpec] = MappingProxyType(specs)
+        self._by_lower: Mapping[str, TemplateSpec] = MappingProxyType(
+            {name.lower(): spec for name, spec in specs.items()}
+        )
+
+    def get(self, template: str) -> Optional[TemplateSpec]:
+        """Look up a template by name (case-insensitive)"""
+        spec = self._specs.get(template)
+        if spec is None:
+            spec = self._by_lower.get(str(template).lower())
+        return spec
+
+    def __getitem__(self, template: str) -> TemplateSpec:
+        spec = self.get(template)
+        if spec is None:
+            raise KeyError(template)
+        return spec
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._specs)
+
+    def items(self):
+        return self._specs.items()
+
+
+# Global registry instance, loaded once per process (before fork with preload_app)
+template_registry = TemplateRegistry()
@@ -0,0 +1,292 @@
+"""
+Text Diff
+Myers O(ND) diff over interned line or word tokens
+
+Each distinct line (or word) is mapped to a small integer once, so the
+diff compares ints instead of re-hashing and re-comparing strings, and a
+common prefix and suffix are trimmed before the search. The middle is
+solved with the linear-space bisection variant of Myers' algorithm, so
+memory stays O(N) even for large rewrites.
+
+Two output shapes, both far smaller than shipping two full versions:
+
+- line diffs: unified-style hunks with a few lines of context
+- word diffs: replacements at character offsets (``old_offset``/``old_text``
+  -> ``new_offset``/``new_text``)
+"""
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+import re
+
+
+EQUAL, DELETE, INSERT = "=", "-", "+"
+
+_WORD_TOKEN_RE = re.compile(r"\s+|\w+|[^\w\s]")
+
+# A diff is a run-length list of (op, count) pairs
+Runs = List[Tuple[str, int]]
+
+
+class Hunk(NamedTuple):
+    """Unified-style hunk; lines are prefixed with ' ', '-' or '+'"""
+    old_start: int
+    old_lines: int
+    new_start: int
+    new_lines: int
+    lines: List[str]
+
+
+class WordChange(NamedTuple):
+    """Replace ``old_text`` at ``old_offset`` with ``new_text`` (at ``new_offset`` in the result)"""
+    old_offset: int
+    old_text: str
+    new_offset: int
+    new_text: str
+
+
+class LineDiff(NamedTuple):
+    hunks: List[Hunk]
+    added: int
+    removed: int
+
+
+class WordDiff(NamedTuple):
+    changes: List[WordChange]
+    added: int
+    removed: int
+
+
+def _intern(*sequences: Sequence[str]) -> List[List[int]]:
+    """Map equal tokens to equal ints across all sequences"""
+    ids: Dict[str, int] = {}
+    return [[ids.setdefault(token, len(ids)) for token in seq] for seq in sequences]
+
+
+def _append(runs: Runs, op: str, count: int):
+    if count <= 0:
+        return
+    if runs and runs[-1][0] == op:
+        runs[-1] = (op, runs[-1][1] + count)
+    else:
+        runs.append((op, count))
+
+
+def _extend(runs: Runs, other: Runs):
+    for op, count in other:
+        _append(runs, op, count)
+
+
+def _diff(a: Sequence[int], b: Sequence[int]) -> Runs:
+    """Run-length edit script turning ``a`` into ``b``"""
+    runs: Runs = []
+    if a == b:
+        _append(runs, EQUAL, len(a))
+        return runs
+
+    prefix = 0
+    limit = min(len(a), len(b))
+    while prefix < limit and a[prefix] == b[prefix]:
+        prefix += 1
+    suffix = 0
+    limit -= prefix
+    while suffix < limit and a[-1 - suffix] == b[-1 - suffix]:
+        suffix += 1
+    a_mid = a[prefix:len(a) - suffix]
+    b_mid = b[prefix:len(b) - suffix]
+
+    _append(runs, EQUAL, prefix)
+    if not a_mid:
+        _append(runs, INSERT, len(b_mid))
+    elif not b_mid:
+        _append(runs, DELETE, len(a_mid))
+    else:
+        _extend(runs, _bisect(a_mid, b_mid))
+    _append(runs, EQUAL, suffix)
+    return runs
+
+
+def _bisect(a: Sequence[int], b: Sequence[int]) -> Runs:
+    """Find the middle snake and diff both halves (Myers 1986, section 4b)"""
+    n, m = len(a), len(b)
+    max_d = (n + m + 1) // 2
+    offset = max_d
+    v_length = 2 * max_d + 2
+    forward = [-1] * v_length
+    reverse = [-1] * v_length
+    forward[offset + 1] = 0
+    reverse[offset + 1] = 0
+    delta = n - m
+    # With an odd delta the paths meet while extending forward, else in reverse
+    front = delta % 2 != 0
+    k1_start = k1_end = k2_start = k2_end = 0
+
+    for d in range(max_d):
+        for k1 in range(-d + k1_start, d + 1 - k1_end, 2):
+            k1_offset = offset + k1
+            if k1 == -d or (k1 != d and forward[k1_offset - 1] < forward[k1_offset + 1]):
+                x1 = forward[k1_offset + 1]
+            else:
+                x1 = forward[k1_offset - 1] + 1
+            y1 = x1 - k1
+            while x1 < n and y1 < m and a[x1] == b[y1]:
+                x1 += 1
+                y1 += 1
+            forward[k1_offset] = x1
+            if x1 > n:
+                k1_end += 2
+            elif y1 > m:
+                k1_start += 2
+            elif front:
+                k2_offset = offset + delta - k1
+                if 0 <= k2_offset < v_length and reverse[k2_offset] != -1:
+                    if x1 >= n - reverse[k2_offset]:
+                        return _split(a, b, x1, y1)
+
+        for k2 in range(-d + k2_start, d + 1 - k2_end, 2):
+            k2_offset = offset + k2
+            if k2 == -d or (k2 != d and reverse[k2_offset - 1] < reverse[k2_offset + 1]):
+                x2 = reverse[k2_offset + 1]
+            else:
+                x2 = reverse[k2_offset - 1] + 1
+            y2 = x2 - k2
+            while x2 < n and y2 < m and a[n - x2 - 1] == b[m - y2 - 1]:
+                x2 += 1
+                y2 += 1
+            reverse[k2_offset] = x2
+            if x2 > n:
+                k2_end += 2
+            elif y2 > m:
+                k2_start += 2
+            elif not front:
+                k1_offset = offset + delta - k2
+                if 0 <= k1_offset < v_length and forward[k1_offset] != -1:
+                    x1 = forward[k1_offset]
+                    y1 = offset + x1 - k1_offset
+                    if x1 >= n - x2:
+                        return _split(a, b, x1, y1)
+
+    # No commonality at all
+    return [(DELETE, n), (INSERT, m)]
+
+
+def _split(a: Sequence[int], b: Sequence[int], x: int, y: int) -> Runs:
+    runs = _diff(a[:x], b[:y])
+    _extend(runs, _diff(a[x:], b[y:]))
+    return runs
+
+
+def diff_tokens(old: Sequence[str], new: Sequence[str]) -> Runs:
+    """Edit script between two token sequences"""
+    a, b = _intern(old, new)
+    return _diff(a, b)
+
+
+def _opcodes(runs: Runs) -> List[Tuple[str, int, int, int, int]]:
+    """(op, old_from, old_to, new_from, new_to) for each run"""
+    opcodes = []
+    i = j = 0
+    for op, count in runs:
+        di = count if op != INSERT else 0
+        dj = count if op != DELETE else 0
+        opcodes.append((op, i, i + di, j, j + dj))
+        i += di
+        j += dj
+    return opcodes
+
+
+def _group(opcodes, context: int):
+    """Split opcodes into hunks, keeping ``context`` equal tokens around changes"""
+    groups = []
+    group = []
+    last = len(opcodes) - 1
+    for index, (op, i1, i2, j1, j2) in enumerate(opcodes):
+        if op != EQUAL:
+            if not group and index > 0:
+                # Leading context from the tail of the preceding equal run
+                _, p1, p2, q1, q2 = opcodes[index - 1]
+                group.append((EQUAL, max(p1, p2 - context), p2, max(q1, q2 - context), q2))
+            group.append((op, i1, i2, j1, j2))
+        elif group:
+            if index == last or i2 - i1 > 2 * context:
+                group.append((EQUAL, i1, min(i2, i1 + context), j1, min(j2, j1 + context)))
+                groups.append(group)
+                group = []
+            else:
+                group.append((op, i1, i2, j1, j2))
+    if group:
+        groups.append(group)
+    return groups
+
+
+def diff_lines(old: str, new: str, context: int = 3) -> LineDiff:
+    """
+    Line diff as unified-style hunks with ``context`` lines around changes
+
+    ``old_start``/``new_start`` are 1-based line numbers of the first line
+    the hunk covers; for an empty range they name the line after which the
+    hunk applies (0 for the start), as in ``diff -u``.
+    """
+    old_lines = old.splitlines()
+    new_lines = new.splitlines()
+    runs = diff_tokens(old_lines, new_lines)
+
+    hunks = []
+    for group in _group(_opcodes(runs), context):
+        lines: List[str] = []
+        for op, i1, i2, j1, j2 in group:
+            if op == INSERT:
+                lines.extend("+" + line for line in new_lines[j1:j2])
+            else:
+                prefix = " " if op == EQUAL else "-"
+                lines.extend(prefix + line for line in old_lines[i1:i2])
+        first, last = group[0], group[-1]
+        old_count, new_count = last[2] - first[1], last[4] - first[3]
+        hunks.append(Hunk(
+            old_start=first[1] + (1 if old_count else 0), old_lines=old_count,
+            new_start=first[3] + (1 if new_count else 0), new_lines=new_count,
+            lines=lines
+        ))
+    return LineDiff(
+        hunks=hunks,
+        added=sum(count for op, count in runs if op == INSERT),
+        removed=sum(count for op, count in runs if op == DELETE)
+    )
+
+
+def diff_words(old: str, new: str) -> WordDiff:
+    """Word diff as replacements at character offsets; whitespace and punctuation are tokens"""
+    old_tokens = _WORD_TOKEN_RE.findall(old)
+    new_tokens = _WORD_TOKEN_RE.findall(new)
+    runs = diff_tokens(old_tokens, new_tokens)
+
+    changes: List[WordChange] = []
+    i = j = 0                   # token indices
+    old_offset = new_offset = 0  # character offsets
+    pending = None              # [old_offset, old_parts, new_offset, new_parts]
+    added = removed = 0
+    for op, count in runs:
+        if op == EQUAL:
+            if pending:
+                changes.append(WordChange(pending[0], "".join(pending[1]), pending[2], "".join(pending[3])))
+                pending = None
+            old_offset += sum(map(len, old_tokens[i:i + count]))
+            new_offset += sum(map(len, new_tokens[j:j + count]))
+            i += count
+            j += count
+            continue
+        if pending is None:
+            pending = [old_offset, [], new_offset, []]
+        if op == DELETE:
+            tokens = old_tokens[i:i + count]
+            pending[1].extend(tokens)
+            old_offset += sum(map(len, tokens))
+            removed += sum(1 for t in tokens if not t.isspace())
+            i += count
+        else:
+            tokens = new_tokens[j:j + count]
+            pending[3].extend(tokens)
+            new_offset += sum(map(len, tokens))
+            added += sum(1 for t in tokens if not t.isspace())
+            j += count
+    if pending:
+        changes.append(WordChange(pending[0], "".join(pending[1]), pending[2], "".join(pending[3])))
+    return WordDiff(changes=changes, added=added, removed=removed)
@@ -0,0 +1,280 @@
+"""
+Text Metrics
+Readability and style statistics computed in one vectorized pass
+
+Words are tokenized once; every per-word quantity (length, syllables,
+function-word flag, contraction flag, sentence index) is then derived with
+NumPy array operations instead of per-word Python loops:
+
+- syllables: vowel groups counted on the character array of all words
+- sentences: word offsets mapped onto sentence ends with ``searchsorted``
+- lexical density / type-token ratio: ``np.unique`` over the word array
+
+Results for recently seen texts are memoized by content digest, and article
+versions store their metrics when written, so repeated analysis of the same
+content is free.
+"""
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+from collections import OrderedDict
+import hashlib
+import re
+import threading
+
+import numpy as np
+
+from models.article import TextMetrics
+from services.sentence_segmenter import iter_sentences
+
+
+_WORD_RE = re.compile(r"[A-Za-z]+(?:['’][A-Za-z]+)*")
+
+# Passive voice: form of "to be" followed by a past participle
+_IRREGULAR_PARTICIPLES = (
+    "shown", "given", "taken", "seen", "written", "known", "chosen", "driven", "drawn",
+    "grown", "proven", "broken", "hidden", "begun", "done", "made", "built", "found",
+    "held", "kept", "left", "set", "put", "run", "thought", "brought", "taught",
+    "caught", "sent", "spent", "lost", "paid", "said", "told", "sold", "meant", "split",
+)
+_PASSIVE_RE = re.compile(
+    r"\b(?:am|is|are|was|were|be|been|being)\s+(?:[a-z]+ly\s+)?"
+    r"(?:[a-z]+ed|" + "|".join(_IRREGULAR_PARTICIPLES) + r")\b",
+    re.IGNORECASE
+)
+
+FUNCTION_WORDS = frozenset("""
+a about above after again against all am an and any are as at be because been before
+being below between both but by can could did do does doing down during each either
+few for from further had has have having he her here hers herself him himself his how
+i if in into is it its itself just may me might more most must my myself neither no nor
+not of off on once only or other our ours ourselves out over own per same shall she
+should so some such than that the their theirs them themselves then there these they
+this those through thus to too under until up upon us very via was we were what when
+where whether which while who whom whose why will with within without would yet you
+your yours yourself yourselves
+""".split())
+
+_VOWELS = np.frombuffer(b"aeiouy", dtype=np.uint8)
+_SPACE = ord(" ")
+_APOSTROPHE = ord("'")
+_HISTOGRAM_EDGES = np.array([1, 11, 21, 31, 41])
+_HISTOGRAM_LABELS = ("1-10", "11-20", "21-30", "31-40", "41+")
+
+
+def _syllables(chars: np.ndarray, word_ids: np.ndarray, word_count: int) -> np.ndarray:
+    """Vowel-group syllable estimate per word, with a silent-e correction"""
+    vowel = np.isin(chars, _VOWELS)
+    group_start = vowel & ~np.concatenate(([False], vowel[:-1]))
+    syllables = np.bincount(word_ids[group_start], minlength=word_count)
+
+    # Last character of each word: before each separator, plus the final one
+    last = np.concatenate((np.flatnonzero(chars == _SPACE) - 1, [len(chars) - 1]))
+    before_last = np.maximum(last - 1, 0)
+    silent_e = (chars[last] == ord("e")) & (chars[before_last] != ord("l")) & (syllables > 1)
+    return np.maximum(syllables - silent_e, 1)
+
+
+def _formality(lexical_density, long_word_ratio, contraction_ratio):
+    """Heuristic 0-1 formality: dense, polysyllabic and contraction-free text scores high"""
+    return np.clip(0.35 + 0.5 * lexical_density + 0.4 * long_word_ratio - 2.0 * contraction_ratio, 0.0, 1.0)
+
+
+def _clarity(avg_sentence_length, passive_ratio, fog):
+    """Heuristic 0-1 clarity: penalizes long sentences, passive voice and high fog index"""
+    return np.clip(
+        1.0
+        - np.maximum(0.0, avg_sentence_length - 25) / 50
+        - 0.25 * passive_ratio
+        - np.maximum(0.0, fog - 18) / 40,
+        0.0, 1.0
+    )
+
+
+class _WordFeatures(NamedTuple):
+    """Per-word arrays for one text"""
+    starts: np.ndarray
+    lengths: np.ndarray
+    syllables: np.ndarray
+    is_function: np.ndarray
+    is_contraction: np.ndarray
+    vocabulary_size: int
+
+
+def _word_features(text: str) -> Optional[_WordFeatures]:
+    matches = list(_WORD_RE.finditer(text))
+    word_count = len(matches)
+    if not word_count:
+        return None
+
+    words = [m.group().lower().replace("’", "'") for m in matches]
+    starts = np.fromiter((m.start() for m in matches), dtype=np.int64, count=word_count)
+
+    # Character array of all words separated by single spaces; word id per character
+    chars = np.frombuffer(" ".join(words).encode("ascii"), dtype=np.uint8)
+    word_ids = np.cumsum(chars == _SPACE)
+    is_contraction = np.zeros(word_count, dtype=bool)
+    is_contraction[word_ids[chars == _APOSTROPHE]] = True
+
+    vocabulary, inverse = np.unique(np.array(words), return_inverse=True)
+    function_vocabulary = np.fromiter(
+        (w in FUNCTION_WORDS for w in vocabulary), dtype=bool, count=vocabulary.size
+    )
+    return _WordFeatures(
+        starts=starts,
+        lengths=np.bincount(word_ids[chars != _SPACE], minlength=word_count),
+        syllables=_syllables(chars, word_ids, word_count),
+        is_function=function_vocabulary[inverse.reshape(-1)],
+        is_contraction=is_contraction,
+        vocabulary_size=int(vocabulary.size),
+    )
+
+
+def _passive_positions(text: str) -> np.ndarray:
+    return np.fromiter((m.start() for m in _PASSIVE_RE.finditer(text)), dtype=np.int64)
+
+
+def compute_metrics(text: str) -> TextMetrics:
+    """Readability, sentence-length distribution and style ratios for ``text``"""
+    features = _word_features(text)
+    if features is None:
+        return TextMetrics()
+    word_count = len(features.starts)
+
+    # Sentence of each word; sentences without words (e.g. "3.5.") are ignored
+    sentence_ends = np.fromiter((s.end for s in iter_sentences(text)), dtype=np.int64)
+    sentence_of_word = np.searchsorted(sentence_ends, features.starts, side="right")
+    sentence_lengths = np.bincount(sentence_of_word)
+    sentence_lengths = sentence_lengths[sentence_lengths > 0]
+    sentence_count = int(sentence_lengths.size)
+
+    passive_sentences = np.unique(
+        np.searchsorted(sentence_ends, _passive_positions(text), side="right")
+    ).size
+
+    total_syllables = int(features.syllables.sum())
+    long_words = int(np.count_nonzero(features.syllables >= 3))
+    words_per_sentence = word_count / sentence_count
+    syllables_per_word = total_syllables / word_count
+
+    flesch = 206.835 - 1.015 * words_per_sentence - 84.6 * syllables_per_word
+    grade = 0.39 * words_per_sentence + 11.8 * syllables_per_word - 15.59
+    fog = 0.4 * (words_per_sentence + 100 * long_words / word_count)
+
+    lexical_density = np.count_nonzero(~features.is_function) / word_count
+    long_word_ratio = long_words / word_count
+    contraction_ratio = np.count_nonzero(features.is_contraction) / word_count
+    passive_ratio = min(passive_sentences / sentence_count, 1.0)
+
+    percentiles = np.percentile(sentence_lengths, [25, 50, 75, 90])
+    histogram = np.bincount(
+        np.digitize(sentence_lengths, _HISTOGRAM_EDGES) - 1, minlength=len(_HISTOGRAM_LABELS)
+    )
+
+    return TextMetrics(
+        word_count=word_count,
+        sentence_count=sentence_count,
+        syllable_count=total_syllables,
+        avg_word_length=round(float(features.lengths.mean()), 4),
+        avg_sentence_length=round(words_per_sentence, 4),
+        sentence_length_std=round(float(sentence_lengths.std()), 4),
+        sentence_length_percentiles={
+            f"p{p}": round(float(v), 2) for p, v in zip((25, 50, 75, 90), percentiles)
+        },
+        sentence_length_histogram={
+            label: int(count) for label, count in zip(_HISTOGRAM_LABELS, histogram)
+        },
+        flesch_reading_ease=round(flesch, 2),
+        flesch_kincaid_grade=round(grade, 2),
+        gunning_fog=round(fog, 2),
+        passive_ratio=round(passive_ratio, 4),
+        lexical_density=round(lexical_density, 4),
+        type_token_ratio=round(features.vocabulary_size / word_count, 4),
+        long_word_ratio=round(long_word_ratio, 4),
+        contraction_ratio=round(contraction_ratio, 4),
+        formality_score=round(float(_formality(lexical_density, long_word_ratio, contraction_ratio)), 4),
+        clarity_score=round(float(_clarity(words_per_sentence, passive_ratio, fog)), 4),
+    )
+
+
+def style_scores(segments: Sequence[str]) -> List[Tuple[float, float]]:
+    """
+    (formality, clarity) for each of many short texts in one vectorized pass
+
+    The segments are scored together, with per-segment totals gathered by
+    ``bincount``, so scoring every sentence of a paragraph costs about the
+    same as scoring the paragraph once.
+    """
+    if not segments:
+        return []
+    # Blank lines between segments force a sentence boundary
+    text = "\n\n".join(segments)
+    features = _word_features(text)
+    if features is None:
+        return [(0.0, 0.0)] * len(segments)
+    count = len(segments)
+    segment_starts = np.cumsum([0] + [len(s) + 2 for s in segments[:-1]])
+
+    def per_segment(positions: np.ndarray, weights: Optional[np.ndarray] = None) -> np.ndarray:
+        index = np.searchsorted(segment_starts, positions, side="right") - 1
+        return np.bincount(index, weights=weights, minlength=count).astype(float)
+
+    words = per_segment(features.starts)
+    content = per_segment(features.starts, ~features.is_function)
+    long_words = per_segment(features.starts, features.syllables >= 3)
+    contractions = per_segment(features.starts, features.is_contraction)
+
+    spans = np.array([(s.start, s.end) for s in iter_sentences(text)], dtype=np.int64).reshape(-1, 2)
+    sentence_starts, sentence_ends = spans[:, 0], spans[:, 1]
+    sentences = np.maximum(per_segment(sentence_starts), 1)
+    passive_sentences = np.unique(np.searchsorted(sentence_ends, _passive_positions(text), side="right"))
+    passive = per_segment(sentence_starts[passive_sentences[passive_sentences < len(sentence_starts)]])
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        safe_words = np.maximum(words, 1)
+        words_per_sentence = words / sentences
+        formality = _formality(content / safe_words, long_words / safe_words, contractions / safe_words)
+        clarity = _clarity(
+            words_per_sentence,
+            np.minimum(passive / sentences, 1.0),
+            0.4 * (words_per_sentence + 100 * long_words / safe_words)
+        )
+    formality = np.where(words > 0, formality, 0.0)
+    clarity = np.where(words > 0, clarity, 0.0)
+    return [(round(float(f), 4), round(float(c), 4)) for f, c in zip(formality, clarity)]
+
+
+class MetricsCache:
+    """Small LRU of metrics keyed by content digest"""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, TextMetrics]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(text: str) -> str:
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+    def get(self, text: str) -> Optional[TextMetrics]:
+        key = self.key(text)
+        with self._lock:
+            metrics = self._entries.get(key)
+            if metrics is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+            return metrics
+
+    def put(self, text: str, metrics: TextMetrics):
+        key = self.key(text)
+        with self._lock:
+            self._entries[key] = metrics
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+# Global cache instance
+metrics_cache = MetricsCache()
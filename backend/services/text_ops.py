@@ -0,0 +1,174 @@
+"""
+Text Operations
+Apply, convert and rebase edit operations on documents
+
+Used by live editing sessions and by partial (PATCH) article updates, so
+an edit costs time and bandwidth proportional to its size rather than to
+the document's.
+
+Rebasing is a three-way merge at word granularity: the server's changes
+(base -> current) and the client's changes (base -> edited) are both
+expressed as replacements in base coordinates; if no two of them touch
+the same range they are applied together, otherwise the edit conflicts.
+"""
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+import re
+
+from models.article import EditOperation
+from services.text_diff import WordChange, diff_words
+
+
+_HUNK_HEADER_RE = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+class EditError(ValueError):
+    """An edit that cannot be applied to the current document"""
+
+
+class EditConflict(EditError):
+    """An edit overlaps changes made since its base version"""
+
+
+class Replacement(NamedTuple):
+    """Replace text[start:end] with ``text``"""
+    start: int
+    end: int
+    text: str
+
+
+def resolve(text_length: int, operation: EditOperation) -> Replacement:
+    """Replacement for one operation against a document of ``text_length`` characters"""
+    if operation.op == "set":
+        return Replacement(0, text_length, operation.text)
+    start = operation.position
+    end = start + (operation.length if operation.op != "insert" else 0)
+    if start < 0 or operation.length < 0 or end > text_length:
+        raise EditError(
+            f"Edit {operation.op} at {start}+{operation.length} is outside "
+            f"the document (length {text_length})"
+        )
+    return Replacement(start, end, operation.text if operation.op != "delete" else "")
+
+
+def apply_operations(text: str, operations: Sequence[EditOperation], max_chars: Optional[int] = None) -> str:
+    """
+    Apply operations in order
+
+    Raises:
+        EditError: if an operation is out of range or the result would exceed ``max_chars``
+    """
+    for operation in operations:
+        start, end, insert = resolve(len(text), operation)
+        if max_chars is not None and len(text) - (end - start) + len(insert) > max_chars:
+            raise EditError(f"Document would exceed {max_chars} characters")
+        text = text[:start] + insert + text[end:]
+    return text
+
+
+def operations_from_patch(text: str, patch: str) -> List[EditOperation]:
+    """
+    Replace operations equivalent to a unified diff against ``text``
+
+    Context and removed lines must match ``text`` exactly. Operations are
+    returned last-first, so applying them in order needs no offset shifting.
+
+    Raises:
+        EditError: on a malformed patch or lines that do not match
+    """
+    lines = text.splitlines(keepends=True)
+    offsets = [0]
+    for line in lines:
+        offsets.append(offsets[-1] + len(line))
+
+    # (first base line, old lines, new lines, new side ends without newline)
+    hunks: List[list] = []
+    current = None
+    previous = ""
+    for raw in patch.splitlines():
+        header = _HUNK_HEADER_RE.match(raw)
+        if header:
+            old_start, old_count = int(header.group(1)), int(header.group(2) or 1)
+            # An empty old range names the line *after which* to insert
+            current = [old_start if old_count == 0 else old_start - 1, [], [], False]
+            hunks.append(current)
+        elif current is None or raw.startswith(("---", "+++")):
+            continue
+        elif raw.startswith("\\"):
+            # "\ No newline at end of file" refers to the line before it
+            if previous in (" ", "+"):
+                current[3] = True
+        elif raw[:1] in (" ", ""):
+            current[1].append(raw[1:])
+            current[2].append(raw[1:])
+        elif raw[0] == "-":
+            current[1].append(raw[1:])
+        elif raw[0] == "+":
+            current[2].append(raw[1:])
+        else:
+            raise EditError(f"Malformed patch line: {raw[:40]!r}")
+        previous = raw[:1] or " "
+    if not hunks:
+        raise EditError("Patch contains no hunks")
+
+    operations = []
+    previous_end = -1
+    for first, old, new, unterminated in hunks:
+        last = first + len(old)
+        if first < previous_end or last > len(lines):
+            raise EditError(f"Hunk at line {first + 1} is out of order or beyond the document")
+        if [line.rstrip("\r\n") for line in lines[first:last]] != old:
+            raise EditError(f"Hunk at line {first + 1} does not match the base version")
+        previous_end = last
+
+        start, end = offsets[first], offsets[last]
+        replacement = "".join(line + "\n" for line in new)
+        if unterminated:
+            replacement = replacement[:-1]
+        if new and first == len(lines) and lines and not lines[-1].endswith(("\n", "\r")):
+            # Appending after an unterminated last line
+            replacement = "\n" + replacement
+        operations.append(EditOperation(op="replace", position=start, length=end - start, text=replacement))
+    operations.reverse()
+    return operations
+
+
+def _overlaps(a: WordChange, b: WordChange) -> bool:
+    a_end = a.old_offset + len(a.old_text)
+    b_end = b.old_offset + len(b.old_text)
+    if a.old_offset == b.old_offset:
+        return True
+    return a.old_offset < b_end and b.old_offset < a_end
+
+
+def rebase(base: str, current: str, edited: str) -> Tuple[str, List[EditOperation]]:
+    """
+    Merge the edit ``base -> edited`` onto ``current``
+
+    Returns the merged text and the operations turning ``current`` into it
+    (last-first, so they apply without shifting).
+
+    Raises:
+        EditConflict: if the edit touches a range that changed since ``base``
+    """
+    ours = diff_words(base, edited).changes
+    theirs = diff_words(base, current).changes
+
+    # Both lists are sorted by base offset: walk them together
+    operations: List[EditOperation] = []
+    shift = 0  # current-minus-base offset before the next client change
+    t = 0
+    for change in ours:
+        while t < len(theirs) and theirs[t].old_offset + len(theirs[t].old_text) <= change.old_offset \
+                and not _overlaps(theirs[t], change):
+            shift += len(theirs[t].new_text) - len(theirs[t].old_text)
+            t += 1
+        if t < len(theirs) and _overlaps(theirs[t], change):
+            raise EditConflict(
+                f"Edit at offset {change.old_offset} overlaps a change made since the base version"
+            )
+        operations.append(EditOperation(
+            op="replace", position=change.old_offset + shift,
+            length=len(change.old_text), text=change.new_text
+        ))
+    operations.reverse()
+    return apply_operations(current, operations), operations
@@ -0,0 +1,50 @@
+import asyncio
+
+from models.article import ArticleCreate, ArticleUpdate
+from services.article_search import _escape_headline, headline, stem
+from services.article_service import ArticleService
+
+
+def test_headline_escapes_article_text():
+    text = 'Climate <script>alert("x")</script> & models'
+    snippet = headline(text, {stem("climate"), stem("models")})
+    assert "<script>" not in snippet
+    assert snippet == (
+        "<b>Climate</b> &lt;script&gt;alert(&quot;x&quot;)&lt;/script&gt; &amp; <b>models</b>"
+    )
+
+
+def test_postgres_headline_escapes_text_but_keeps_highlights():
+    assert _escape_headline("<i>\x02sea\x03</i> & level") == "&lt;i&gt;<b>sea</b>&lt;/i&gt; &amp; level"
+
+
+def _search_service():
+    service = ArticleService()
+    created = {}
+    for title, content in [
+        ("Climate models", "Regional climate models predict warming."),
+        ("Ocean currents", "Sea level rise and climate feedbacks."),
+        ("Protein folding", "Folding pathways of small proteins."),
+    ]:
+        article = asyncio.run(service.create_article(ArticleCreate(title=title, content=content), "alice"))
+        created[title] = article.article_id
+    return service, created
+
+
+def test_in_memory_search_ranks_and_filters():
+    service, created = _search_service()
+    results = asyncio.run(service.search_articles("climate"))
+    assert [hit.article_id for hit in results.hits] == [created["Climate models"], created["Ocean currents"]]
+    assert results.total == 2 and "<b>climate</b>" in results.hits[0].snippet
+
+    assert asyncio.run(service.search_articles("climate -ocean")).total == 1
+    assert asyncio.run(service.search_articles("protein or ocean")).total == 2
+    assert asyncio.run(service.search_articles("climate", limit=1, offset=1)).hits[0].title == "Ocean currents"
+
+
+def test_in_memory_search_sees_updates_and_deletes():
+    service, created = _search_service()
+    asyncio.run(service.update_article(created["Protein folding"], ArticleUpdate(title="Climate proteins"), "alice"))
+    assert asyncio.run(service.search_articles("climate")).total == 3
+    asyncio.run(service.delete_article(created["Climate models"]))
+    assert asyncio.run(service.search_articles("climate")).total == 2
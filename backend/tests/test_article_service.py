@@ -0,0 +1,132 @@
+"""
+Article service regression tests
+"""
+import asyncio
+
+import pytest
+
+from models.article import ArticleCreate, ArticlePatch, EditOperation
+from services.article_service import ArticleService, PreconditionFailed, article_etag
+from services.text_ops import EditConflict
+
+
+TEXT = "One two three four."
+
+
+def _setup():
+    service = ArticleService(autosave_window=30)
+    article = asyncio.run(service.create_article(ArticleCreate(title="T", content=TEXT), "alice"))
+    # Alice's autosave stays pending: the article shows it, no version stores it
+    asyncio.run(service.patch_article(
+        article.article_id,
+        ArticlePatch(base_version=1, operations=[EditOperation(op="insert", position=0, text="Zero. ")]),
+        "alice"
+    ))
+    return service, article
+
+
+def test_other_author_patch_against_pending_text_applies_to_what_they_read():
+    service, article = _setup()
+    seen = article.content
+    assert seen == "Zero. One two three four." and article.current_version == 1
+
+    position = seen.index("two")
+    patch = ArticlePatch(base_version=1, operations=[EditOperation(op="replace", position=position, length=3, text="TWO")])
+    asyncio.run(service.patch_article(article.article_id, patch, "bob", [article_etag(article)]))
+
+    assert article.content == "Zero. One TWO three four."
+    # Alice's pending text became its own version before Bob's edit
+    assert [v.content for v in article.versions][1] == seen
+    assert article.versions[1].author == "alice"
+
+
+def test_other_author_append_against_pending_text():
+    service, article = _setup()
+    seen = article.content
+    patch = ArticlePatch(base_version=1, operations=[EditOperation(op="insert", position=len(seen), text=" Five.")])
+    asyncio.run(service.patch_article(article.article_id, patch, "bob", [article_etag(article)]))
+    assert article.content == seen + " Five."
+
+
+def test_other_author_patch_without_if_match_is_rejected_while_pending():
+    service, article = _setup()
+    patch = ArticlePatch(base_version=1, operations=[EditOperation(op="insert", position=0, text="x")])
+    with pytest.raises(EditConflict):
+        asyncio.run(service.patch_article(article.article_id, patch, "bob"))
+    assert article.content == "Zero. One two three four."
+    assert article.current_version == 1
+
+
+def test_other_author_patch_with_stale_etag_fails_precondition():
+    service, article = _setup()
+    stale = article_etag(article)
+    asyncio.run(service.patch_article(
+        article.article_id,
+        ArticlePatch(base_version=1, operations=[EditOperation(op="insert", position=0, text="A ")]),
+        "alice"
+    ))
+    patch = ArticlePatch(base_version=1, operations=[EditOperation(op="insert", position=0, text="x")])
+    with pytest.raises(PreconditionFailed):
+        asyncio.run(service.patch_article(article.article_id, patch, "bob", [stale]))
+
+
+def test_autosaves_coalesce_into_one_version_per_window():
+    service, article = _setup()
+    for text in ("A ", "B "):
+        asyncio.run(service.patch_article(
+            article.article_id,
+            ArticlePatch(base_version=1, operations=[EditOperation(op="insert", position=0, text=text)]),
+            "alice"
+        ))
+    assert article.current_version == 1
+    assert service.autosave_stats()["coalesced_saves"] == 2
+
+    version = asyncio.run(service.flush_article(article.article_id))
+    assert version.version_number == 2 and version.content == "B A Zero. One two three four."
+    assert version.base_version == 1 and len(version.delta) == 3
+    assert asyncio.run(service.flush_article(article.article_id)) is None
+
+
+def test_flushed_version_is_readable_only_with_its_metrics():
+    service, article = _setup()
+    measure = service._measure
+    seen = []
+
+    async def observe(content):
+        # A reader during measurement must not see the new version yet
+        seen.append(len(article.versions))
+        await asyncio.sleep(0)
+        return await measure(content)
+
+    service._measure = observe
+    version = asyncio.run(service.flush_article(article.article_id))
+    assert seen == [1]
+    assert version.metrics is not None
+
+
+def test_version_metrics_read_does_not_modify_the_version():
+    service, article = _setup()
+    version = article.versions[0]
+    version.metrics = None
+    metrics = asyncio.run(service.get_version_metrics(article.article_id, 1))
+    assert metrics is not None
+    assert version.metrics is None
+
+
+def test_patch_against_stale_base_is_rebased_and_stored_as_delta():
+    service = ArticleService()
+    article = asyncio.run(service.create_article(ArticleCreate(title="T", content="The cat sat on the mat."), "alice"))
+    patch = "@@ -1 +1 @@\n-The cat sat on the mat.\n+The black cat sat on the mat.\n"
+    asyncio.run(service.patch_article(article.article_id, ArticlePatch(base_version=1, patch=patch), "alice"))
+    assert article.content == "The black cat sat on the mat.\n" and article.current_version == 2
+
+    stale = ArticlePatch(base_version=1, operations=[EditOperation(op="replace", position=19, length=3, text="rug")])
+    asyncio.run(service.patch_article(article.article_id, stale, "bob"))
+    assert article.content == "The black cat sat on the rug.\n"
+    version = article.versions[-1]
+    assert version.base_version == 2 and version.delta
+
+    with pytest.raises(EditConflict):
+        asyncio.run(service.patch_article(
+            article.article_id, ArticlePatch(base_version=1, operations=stale.operations, rebase=False), "bob"
+        ))
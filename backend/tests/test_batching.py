@@ -0,0 +1,49 @@
+import asyncio
+
+import pytest
+
+from middleware.batching import MicroBatcher
+
+
+def test_concurrent_submits_share_batches_and_keep_their_results():
+    calls = []
+
+    def double(inputs):
+        calls.append(list(inputs))
+        return [x * 2 for x in inputs]
+
+    async def run():
+        batcher = MicroBatcher(double, max_batch_size=4, max_latency_ms=50)
+        try:
+            return await asyncio.gather(*(batcher.submit(i) for i in range(10))), batcher.stats.as_dict()
+        finally:
+            await batcher.close()
+
+    results, stats = asyncio.run(run())
+    assert results == [i * 2 for i in range(10)]
+    assert [len(c) for c in calls] == [4, 4, 2]
+    assert stats["batches"] == 3 and stats["max_batch_size"] == 4
+
+
+def test_partial_batch_flushes_after_max_latency():
+    async def run():
+        batcher = MicroBatcher(lambda xs: xs, max_batch_size=100, max_latency_ms=20)
+        try:
+            return await asyncio.wait_for(batcher.submit("x"), 1)
+        finally:
+            await batcher.close()
+
+    assert asyncio.run(run()) == "x"
+
+
+@pytest.mark.parametrize("model_fn", [lambda xs: 1 / 0, lambda xs: xs[:-1]])
+def test_batch_failures_reach_every_caller(model_fn):
+    async def run():
+        batcher = MicroBatcher(model_fn, max_batch_size=2, max_latency_ms=10)
+        try:
+            return await asyncio.gather(batcher.submit(1), batcher.submit(2), return_exceptions=True)
+        finally:
+            await batcher.close()
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, Exception) for r in results)
@@ -0,0 +1,38 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from services.citation_formatter import CitationFormatter, CitationStyle, _apa_authors
+
+
+class Paper:
+    def __init__(self, paper_id, authors):
+        self.paper_id = paper_id
+        self.title = f"Paper {paper_id}"
+        self.authors = authors
+        self.year = 2020
+        self.venue = "Journal"
+        self.doi = None
+        self.url = None
+
+
+def test_apa_without_authors():
+    assert _apa_authors([]) == ""
+    formatter = CitationFormatter()
+    assert "Paper p1" in formatter.format(Paper("p1", []), CitationStyle.APA)
+
+
+def test_concurrent_format_keeps_cache_bounded():
+    formatter = CitationFormatter(cache_size=50)
+    papers = [Paper(f"p{i}", ["Ada Lovelace"]) for i in range(200)]
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda p: formatter.format(p, CitationStyle.APA), papers * 5))
+    stats = formatter.stats()
+    assert stats["entries"] <= 50
+    assert stats["hits"] + stats["misses"] == 1000
+
+
+def test_join_matches_render():
+    formatter = CitationFormatter()
+    papers = [Paper("a", ["Ada Lovelace"]), Paper("b", ["Alan Turing"])]
+    entries = formatter.format_many(papers, CitationStyle.IEEE)
+    assert formatter.join(entries, CitationStyle.IEEE) == formatter.render(papers, CitationStyle.IEEE)
+    assert formatter.join(entries, CitationStyle.IEEE).startswith("[1] ")
@@ -0,0 +1,24 @@
+"""
+Citation scanner regression tests
+"""
+import time
+
+from services.citation_scanner import scan, validate
+
+
+def test_unclosed_parenthesis_scans_in_linear_time():
+    # One "(" that never closes used to make the author-year pattern backtrack quadratically
+    text = "(" + "in 2020 we " * 8000
+    started = time.perf_counter()
+    scan(text)
+    assert time.perf_counter() - started < 0.25
+
+
+def test_numeric_citation_inside_parentheses_is_found():
+    citations = scan("as shown (see [3]) and (Smith, 2020)")
+    assert [(c.text, c.keys) for c in citations] == [("[3]", (3,)), ("(Smith, 2020)", (("smith", "2020"),))]
+
+
+def test_one_early_citation_is_reported_once():
+    report = validate("[3] then [1] [2] [4] [5]", [f"Reference {i}" for i in range(1, 6)])
+    assert [(item["citation"], item["expected"]) for item in report.out_of_order] == [(3, 1)]
@@ -0,0 +1,59 @@
+"""
+ETag / If-None-Match on article, history and version reads
+"""
+from fastapi.testclient import TestClient
+
+import main
+from services.article_service import VERSION_CACHE_CONTROL
+
+
+client = TestClient(main.app)
+
+
+def _create():
+    response = client.post("/api/articles/", json={"title": "T", "content": "Line one.\nLine two.\n"})
+    return response.json()["article_id"]
+
+
+def test_article_revalidates_until_it_changes():
+    article_id = _create()
+    url = f"/api/articles/{article_id}"
+    first = client.get(url)
+    etag = first.headers["ETag"]
+    assert first.status_code == 200 and first.headers["Cache-Control"] == "no-cache"
+
+    cached = client.get(url, headers={"If-None-Match": etag})
+    assert cached.status_code == 304 and cached.headers["ETag"] == etag and not cached.content
+    assert client.get(url, headers={"If-None-Match": f'W/{etag}'}).status_code == 304
+
+    client.put(url, json={"title": "Renamed"})
+    changed = client.get(url, headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["ETag"] != etag
+    assert changed.json()["title"] == "Renamed"
+
+
+def test_history_etag_changes_only_with_new_versions():
+    article_id = _create()
+    url = f"/api/articles/{article_id}/versions"
+    etag = client.get(url).headers["ETag"]
+
+    client.put(f"/api/articles/{article_id}", json={"title": "Renamed"})
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+    client.put(f"/api/articles/{article_id}", json={"content": "New text\n", "checkpoint": True})
+    after = client.get(url, headers={"If-None-Match": etag})
+    assert after.status_code == 200 and len(after.json()) == 2
+
+
+def test_versions_and_diffs_are_immutable():
+    article_id = _create()
+    client.put(f"/api/articles/{article_id}", json={"content": "Line one.\nLine 2.\n", "checkpoint": True})
+
+    for url in (f"/api/articles/{article_id}/versions/1", f"/api/articles/{article_id}/versions/1/diff/2"):
+        response = client.get(url)
+        assert response.status_code == 200
+        assert response.headers["Cache-Control"] == VERSION_CACHE_CONTROL
+        assert client.get(url, headers={"If-None-Match": response.headers["ETag"]}).status_code == 304
+
+    assert client.get(f"/api/articles/{article_id}/versions/3").status_code == 404
+    assert client.get(f"/api/articles/{article_id}/versions/1", headers={"If-None-Match": "*"}).status_code == 304
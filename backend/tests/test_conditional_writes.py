@@ -0,0 +1,79 @@
+"""
+Preconditions on article writes: expected_version, If-Match and per-article locking
+"""
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from api.conditional import etag_matches, if_match_etags
+from models.article import ArticleCreate, ArticleUpdate
+from services.article_service import ArticleService, PreconditionFailed, article_service
+
+
+client = TestClient(main.app)
+
+
+def _create(content="First draft."):
+    response = client.post("/api/articles/", params={"author": "alice"}, json={"title": "T", "content": content})
+    assert response.status_code == 201
+    return response.json()["article_id"]
+
+
+def test_if_match_helpers():
+    assert if_match_etags(None) is None
+    assert if_match_etags("*") == ["*"]
+    assert if_match_etags('"a", W/"b", "c"') == ['"a"', '"c"']
+    assert etag_matches('W/"a", "b"', '"a"')
+    assert not etag_matches('"b"', '"a"')
+
+
+def test_stale_if_match_is_rejected_with_the_current_etag():
+    article_id = _create()
+    etag = client.get(f"/api/articles/{article_id}").headers["ETag"]
+    first = client.put(f"/api/articles/{article_id}", headers={"If-Match": etag}, json={"title": "New"})
+    assert first.status_code == 200 and first.headers["ETag"] != etag
+
+    second = client.put(f"/api/articles/{article_id}", headers={"If-Match": etag}, json={"title": "Other"})
+    assert second.status_code == 412
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert client.get(f"/api/articles/{article_id}").json()["title"] == "New"
+
+
+def test_expected_version_mismatch_is_rejected():
+    article_id = _create()
+    response = client.put(f"/api/articles/{article_id}", json={"title": "New", "expected_version": 2})
+    assert response.status_code == 412
+
+
+def test_if_match_star_overwrites_another_authors_pending_autosave():
+    article_id = _create()
+    client.put(f"/api/articles/{article_id}", params={"author": "alice"}, json={"content": "Alice typing"})
+    assert article_id in article_service.pending
+
+    update = {"content": "Bob's text"}
+    blind = client.put(f"/api/articles/{article_id}", params={"author": "bob"}, json=update)
+    assert blind.status_code == 409
+
+    star = client.put(f"/api/articles/{article_id}", params={"author": "bob"}, headers={"If-Match": "*"}, json=update)
+    assert star.status_code == 200
+    versions = client.get(f"/api/articles/{article_id}/versions").json()
+    assert [v["author"] for v in versions] == ["alice", "alice"]
+    assert versions[-1]["content"] == "Alice typing"
+    assert article_service.pending[article_id].author == "bob"
+
+
+def test_concurrent_writes_at_one_version_let_exactly_one_through():
+    async def run():
+        service = ArticleService()
+        article = await service.create_article(ArticleCreate(title="T", content="Base"), "alice")
+        writes = [
+            service.update_article(article.article_id, ArticleUpdate(content=f"Edit {i}", expected_version=1), f"u{i}")
+            for i in range(5)
+        ]
+        return article, await asyncio.gather(*writes, return_exceptions=True)
+
+    article, results = asyncio.run(run())
+    assert sum(isinstance(r, PreconditionFailed) for r in results) == 4
+    assert article.current_version == 2
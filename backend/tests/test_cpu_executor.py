@@ -0,0 +1,63 @@
+import asyncio
+import os
+import threading
+
+import pytest
+
+from middleware.cpu_executor import CPUExecutor, PoolKind
+
+
+def _worker_pid(_):
+    return os.getpid()
+
+
+def _fail(_):
+    raise ValueError("bad input")
+
+
+def test_small_inputs_run_inline_and_large_ones_are_offloaded():
+    executor = CPUExecutor(threshold=100)
+
+    async def run():
+        inline = await executor.run(_worker_pid, None, size=10)
+        offloaded = await executor.run(_worker_pid, None, size=100)
+        forced = await executor.run(_worker_pid, None, size=1, offload=True)
+        return inline, offloaded, forced
+
+    try:
+        inline, offloaded, forced = asyncio.run(run())
+    finally:
+        executor.shutdown()
+    assert inline == os.getpid()
+    assert offloaded != os.getpid() and forced != os.getpid()
+    stats = executor.stats()
+    assert stats["inline_calls"] == 1 and stats[PoolKind.PROCESS]["completed"] == 2
+
+
+def test_thread_pool_keeps_the_event_loop_free():
+    executor = CPUExecutor(threshold=0)
+    release = threading.Event()
+
+    async def run():
+        work = asyncio.ensure_future(executor.run(release.wait, 5, kind=PoolKind.THREAD))
+        await asyncio.sleep(0.01)
+        # The loop is still running while the worker blocks
+        assert not work.done()
+        release.set()
+        return await work
+
+    try:
+        assert asyncio.run(run()) is True
+    finally:
+        executor.shutdown()
+    assert executor.stats()[PoolKind.THREAD]["completed"] == 1
+
+
+def test_worker_errors_propagate_and_are_counted():
+    executor = CPUExecutor(threshold=0)
+    try:
+        with pytest.raises(ValueError):
+            asyncio.run(executor.run(_fail, None, kind=PoolKind.THREAD))
+    finally:
+        executor.shutdown()
+    assert executor.stats()[PoolKind.THREAD]["errors"] == 1
@@ -0,0 +1,23 @@
+from services.formatting_rules import get_formatting_engine, title_case, to_roman
+
+
+IEEE_DRAFT = "Abstract\nshort abstract here.\n\nIndex Terms: zeta, alpha\n\n1. introduction\n\nText.\n\nII. Methods\n"
+
+
+def test_ieee_checks_in_one_pass():
+    issues = {issue.rule: issue for issue in get_formatting_engine("IEEE").check(IEEE_DRAFT)}
+    assert set(issues) == {"abstract_length", "keyword_count", "keyword_order", "section_heading"}
+    assert issues["keyword_order"].suggestion == "alpha, zeta"
+    heading = issues["section_heading"]
+    assert heading.suggestion == "I. Introduction"
+    assert IEEE_DRAFT[heading.position:heading.position + heading.length] == heading.original
+
+
+def test_well_formed_sections_pass():
+    text = "I. Introduction\n\nText.\n\nII. Related Work\n\nMore.\n\nReferences\n"
+    assert get_formatting_engine("IEEE").check(text) == []
+
+
+def test_helpers():
+    assert [to_roman(n) for n in (1, 4, 9, 14, 40)] == ["I", "IV", "IX", "XIV", "XL"]
+    assert title_case("results and discussion of the model") == "Results and Discussion of the Model"
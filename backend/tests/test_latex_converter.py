@@ -0,0 +1,29 @@
+from services.latex_converter import convert_inline, iter_body
+
+
+def body(text):
+    return "".join(iter_body(text))
+
+
+def test_fenced_code_is_passed_through():
+    text = "```c\n# include <stdio.h>\n    int x;\n- y\n> z\nALLCAPS\n\n```\nAfter"
+    assert body(text) == (
+        "\\begin{verbatim}\n# include <stdio.h>\n    int x;\n- y\n> z\nALLCAPS\n\n\\end{verbatim}\n\n"
+        "After\n\n"
+    )
+
+
+def test_display_math_is_passed_through():
+    assert body("$$\n- a + b\n# c\n$$") == "\\begin{equation*}\n- a + b\n# c\n\\end{equation*}\n\n"
+
+
+def test_markdown_outside_fences():
+    assert body("# Intro\n- one\n- two") == (
+        "\\section{Intro}\n\n\\begin{itemize}\n  \\item one\n  \\item two\n\\end{itemize}\n\n"
+    )
+
+
+def test_inline_math_needs_tight_dollars():
+    assert convert_inline("Costs $5 and $10") == "Costs \\$5 and \\$10"
+    assert convert_inline("Let $x_1$ and $a + b$ hold") == "Let $x_1$ and $a + b$ hold"
+    assert convert_inline("$ x $") == "\\$ x \\$"
@@ -0,0 +1,25 @@
+from services.latex_templates import get_latex_template, render_manuscript
+
+
+def test_manuscript_uses_the_template_class_and_escapes_metadata():
+    latex = render_manuscript(
+        "# Intro\nBody text.", "IEEE",
+        title="Costs & Benefits", authors=["Ada Lovelace", "A_B"], abstract="We study 50% cases.",
+        keywords=["x", "y"], references=["Smith, J. (2020). R&D."]
+    )
+    assert latex.startswith("\\documentclass[conference]{IEEEtran}\n")
+    assert "Costs \\& Benefits" in latex and "A\\_B" in latex and "50\\%" in latex
+    assert "\\section{Intro}" in latex
+    assert "\\bibitem{ref1} Smith, J. (2020). R\\&D." in latex
+    assert latex.endswith("\\end{document}\n")
+
+
+def test_front_matter_is_omitted_without_a_title():
+    latex = render_manuscript("Body.", "ACM")
+    assert latex.startswith("\\documentclass[sigconf]{acmart}\n")
+    assert "\\maketitle" not in latex and "thebibliography" not in latex
+
+
+def test_templates_are_compiled_once_and_unknown_names_fall_back():
+    assert get_latex_template("IEEE") is get_latex_template("IEEE")
+    assert get_latex_template("Unknown").name == "Generic"
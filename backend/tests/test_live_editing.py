@@ -0,0 +1,15 @@
+from fastapi.testclient import TestClient
+
+import main
+
+
+def test_malformed_frames_do_not_close_the_socket():
+    client = TestClient(main.app)
+    with client.websocket_connect("/api/editor/live") as websocket:
+        assert websocket.receive_json()["type"] == "ready"
+        websocket.send_text("{not json")
+        assert websocket.receive_json()["type"] == "error"
+        websocket.send_bytes(b"\x00\x01")
+        assert websocket.receive_json()["type"] == "error"
+        websocket.send_json({"type": "ping"})
+        assert websocket.receive_json() == {"type": "pong"}
@@ -0,0 +1,119 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from middleware.llm_client import LLMClient, LLMError, ProviderConfig
+
+
+class SlowClient(LLMClient):
+    """Upstream stub: every call waits on ``release``"""
+
+    def __init__(self):
+        super().__init__()
+        self.register_provider(ProviderConfig(name="stub", base_url="http://stub", max_retries=0))
+        self.release = asyncio.Event()
+        self.upstream_cancelled = False
+
+    async def _post(self, config, messages, params):
+        self.stats["upstream_calls"] += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.upstream_cancelled = True
+            raise
+        return "reply"
+
+
+def test_cancelled_leader_does_not_cancel_coalesced_callers():
+    async def run():
+        client = SlowClient()
+        leader = asyncio.ensure_future(client.complete("hi", provider="stub"))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(client.complete("hi", provider="stub"))
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        client.release.set()
+        assert await follower == "reply"
+        assert leader.cancelled() and not client.upstream_cancelled
+        assert client.stats["upstream_calls"] == 1 and client.stats["coalesced"] == 1
+
+    asyncio.run(run())
+
+
+def test_upstream_call_is_cancelled_with_its_last_caller():
+    async def run():
+        client = SlowClient()
+        callers = [asyncio.ensure_future(client.complete("hi", provider="stub")) for _ in range(2)]
+        await asyncio.sleep(0)
+        for caller in callers:
+            caller.cancel()
+        await asyncio.sleep(0.01)
+        assert client.upstream_cancelled and not client._in_flight
+
+    asyncio.run(run())
+
+
+def _serve(handler):
+    async def start():
+        app = web.Application()
+        app.router.add_post("/chat/completions", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return runner, f"http://127.0.0.1:{port}"
+    return start
+
+
+@pytest.mark.parametrize("handler", [
+    lambda request: web.Response(text="<html>busy</html>", content_type="text/html"),
+    lambda request: web.Response(text="{not json", content_type="application/json"),
+])
+def test_undecodable_responses_raise_llm_error(handler):
+    async def serve(request):
+        return handler(request)
+
+    async def run():
+        runner, url = await _serve(serve)()
+        client = LLMClient()
+        client.register_provider(ProviderConfig(name="stub", base_url=url, max_retries=0))
+        try:
+            with pytest.raises(LLMError):
+                await client.complete("hi", provider="stub")
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+    asyncio.run(run())
+
+
+def test_truncated_body_is_retried_then_raises_llm_error():
+    async def run():
+        calls = []
+
+        async def truncated(reader, writer):
+            calls.append(1)
+            await reader.readuntil(b"\r\n\r\n")
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                b"Content-Length: 100\r\n\r\n{\"choices\""
+            )
+            await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_server(truncated, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        client = LLMClient(backoff_base=0.001)
+        client.register_provider(ProviderConfig(name="stub", base_url=f"http://127.0.0.1:{port}", max_retries=1))
+        try:
+            with pytest.raises(LLMError):
+                await client.complete("hi", provider="stub")
+        finally:
+            await client.close()
+            server.close()
+        assert len(calls) == 2 and client.stats["retries"] == 1
+
+    asyncio.run(run())
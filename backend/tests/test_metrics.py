@@ -0,0 +1,52 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+import main
+from middleware import metrics
+
+
+client = TestClient(main.app)
+
+
+def _sample(text, name, **labels):
+    """Value of one sample line in a Prometheus exposition"""
+    wanted = [f'{k}="{v}"' for k, v in labels.items()]
+    for line in text.splitlines():
+        if line.startswith(f"{metrics.NAMESPACE}_{name}{{") and all(w in line for w in wanted):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+
+def test_requests_are_labelled_with_the_route_template():
+    before = _sample(client.get("/metrics").text, "http_requests_total",
+                     method="GET", route="/api/articles/{article_id}", status="404")
+    client.get("/api/articles/does-not-exist")
+    client.get("/api/articles/also-missing")
+    text = client.get("/metrics").text
+    assert _sample(text, "http_requests_total",
+                   method="GET", route="/api/articles/{article_id}", status="404") == before + 2
+    assert "does-not-exist" not in text
+    assert _sample(text, "http_request_duration_seconds_count", method="GET", route="/api/articles/{article_id}") > 0
+
+
+def test_timed_and_stage_record_service_latency():
+    @metrics.timed("test_service", "work")
+    async def work():
+        with metrics.stage("test_service", "work", "inner"):
+            return 42
+
+    assert asyncio.run(work()) == 42
+    text = client.get("/metrics").text
+    for stage in ("total", "inner"):
+        assert _sample(text, "service_duration_seconds_count",
+                       service="test_service", method="work", stage=stage) == 1
+
+
+def test_runtime_sources_and_caches_are_exported():
+    metrics.register_source("test_source", lambda: {"queue": {"depth": 3}, "enabled": True})
+    metrics.register_cache("test_cache", lambda: (3, 1))
+    text = client.get("/metrics").text
+    assert _sample(text, "runtime_stat", source="test_source", stat="queue_depth") == 3
+    assert _sample(text, "runtime_stat", source="test_source", stat="enabled") == 1
+    assert _sample(text, "cache_hit_ratio", cache="test_cache") == 0.75
@@ -0,0 +1,75 @@
+import asyncio
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from middleware.model_registry import ModelRegistry, ModelState
+
+
+def test_importing_the_app_loads_no_heavy_dependencies():
+    code = (
+        "import sys, main; "
+        "print(','.join(m for m in ('torch', 'transformers', 'sentence_transformers', 'spacy') if m in sys.modules))"
+    )
+    backend = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, "-c", code], cwd=backend, capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ""
+
+
+def test_concurrent_callers_share_one_load():
+    loads = []
+
+    def loader():
+        loads.append(threading.get_ident())
+        time.sleep(0.05)
+        return object()
+
+    registry = ModelRegistry()
+    registry.register("m", loader)
+
+    async def run():
+        try:
+            return await asyncio.gather(*(registry.get("m") for _ in range(5)))
+        finally:
+            await registry.close()
+
+    models = asyncio.run(run())
+    assert len(loads) == 1 and len({id(m) for m in models}) == 1
+    assert registry.is_loaded("m") and registry.status()["m"]["state"] == ModelState.READY
+
+
+def test_failed_load_is_recorded_and_retried():
+    attempts = []
+
+    def loader():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ImportError("no weights")
+        return "model"
+
+    registry = ModelRegistry()
+    registry.register("m", loader)
+    with pytest.raises(ImportError):
+        registry.get_sync("m")
+    assert registry.status()["m"] == {
+        "state": ModelState.FAILED, "load_seconds": None, "preforked": False, "error": "ImportError: no weights"
+    }
+    assert registry.get_sync("m") == "model"
+
+    with pytest.raises(KeyError):
+        registry.get_sync("unknown")
+
+
+def test_preload_marks_models_preforked_without_raising():
+    registry = ModelRegistry()
+    registry.register("ok", lambda: "model")
+    registry.register("broken", lambda: 1 / 0)
+    registry.preload(["ok", "broken"], freeze=False)
+    status = registry.status()
+    assert status["ok"]["preforked"] and status["ok"]["state"] == ModelState.READY
+    assert status["broken"]["state"] == ModelState.FAILED
@@ -0,0 +1,17 @@
+import asyncio
+
+from middleware.cpu_executor import PoolKind, cpu_executor
+from services.recommendation_service import RecommendationService
+
+
+def test_short_paragraphs_are_offloaded():
+    text = "\n\n".join(f"We got a lot of results in test {i}." for i in range(6))
+
+    async def collect():
+        return [event async for event in RecommendationService().optimize_document(text, concurrency=3)]
+
+    before = cpu_executor.stats()[PoolKind.PROCESS]["completed"]
+    events = asyncio.run(collect())
+    assert sorted(e["index"] for e in events if e["event"] == "paragraph") == list(range(6))
+    assert events[-1]["event"] == "done"
+    assert cpu_executor.stats()[PoolKind.PROCESS]["completed"] - before == 6
@@ -0,0 +1,34 @@
+import pytest
+
+from services.phrase_rewriter import PhraseRewriter, available_disciplines, get_rewriter
+
+
+REWRITER = PhraseRewriter({"a lot": "substantial", "a lot of": "a great deal of", "get": "obtain", "use": "utilize"})
+
+
+def test_longest_phrase_wins_in_one_pass():
+    result = REWRITER.rewrite("We use a lot of data to get a lot.")
+    assert result.text == "We utilize a great deal of data to obtain substantial."
+    assert [c.rule for c in result.changes] == ["use", "a lot of", "get", "a lot"]
+
+
+def test_word_boundaries_case_and_whitespace():
+    result = REWRITER.rewrite("Use\tA  LOT OF targets; users GET it, a Lot of them.")
+    assert result.text == "Utilize\tA GREAT DEAL OF targets; users OBTAIN it, a great deal of them."
+
+
+def test_change_spans_point_into_both_texts():
+    text = "They get results and use them."
+    result = REWRITER.rewrite(text)
+    for change in result.changes:
+        assert text[change.start:change.end] == change.original
+        assert result.text[change.output_start:change.output_end] == change.replacement
+
+
+def test_discipline_tables_extend_the_general_rules():
+    assert "general" in available_disciplines()
+    general = get_rewriter()
+    for discipline in available_disciplines():
+        assert len(get_rewriter(discipline)) >= len(general)
+    with pytest.raises(KeyError):
+        get_rewriter("../general")
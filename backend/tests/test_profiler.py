@@ -0,0 +1,55 @@
+import time
+
+from fastapi import FastAPI
+
+from middleware import metrics
+from middleware.profiler import SamplingProfiler
+
+
+def _app():
+    app = FastAPI()
+
+    @metrics.timed("demo")
+    def crunch(seconds):
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            pass
+
+    @app.get("/slow/{n}")
+    async def slow(n: int):
+        crunch(0.4)
+        return {"n": n}
+
+    app.add_middleware(metrics.MetricsMiddleware, router=app.router)
+    return app
+
+
+def test_watchdog_profiles_the_slow_request_while_it_runs():
+    from fastapi.testclient import TestClient
+
+    profiler = SamplingProfiler(slow_request_ms=100, auto_seconds=0.2, auto_cooldown=60)
+    profiler.start_watchdog()
+    try:
+        started = time.time()
+        response = TestClient(_app()).get("/slow/1")
+        finished = time.time()
+    finally:
+        profiler.stop_watchdog()
+    assert response.status_code == 200
+
+    profile, = [profiler.get(p["profile_id"]) for p in profiler.list()]
+    assert started < profile.started_at < finished
+    assert profile.done.wait(2)
+    assert profile.reason.startswith("slow GET /slow/{n}")
+    assert any(
+        stack.startswith("route:/slow/{n};") and "service:" in stack and "crunch" in stack
+        for stack in profile.stacks
+    )
+    assert not metrics.active_requests()
+
+
+def test_no_profile_below_threshold_or_when_disabled():
+    profiler = SamplingProfiler(slow_request_ms=0)
+    profiler.start_watchdog()
+    assert profiler._watchdog is None
+    assert SamplingProfiler(slow_request_ms=10_000).check_requests() is None
@@ -0,0 +1,33 @@
+import asyncio
+import json
+from typing import List
+
+from pydantic import TypeAdapter
+
+from api.responses import FastJSONResponse, dumps
+from models.article import ArticleCreate, ArticleStatus, ArticleVersion
+from services.article_service import ArticleService
+
+
+def _article():
+    service = ArticleService()
+    article = asyncio.run(service.create_article(
+        ArticleCreate(title="T", content="Some text. More text.", keywords=["a"]), "alice"
+    ))
+    article.status = ArticleStatus.IN_REVIEW
+    return article
+
+
+def test_article_encoding_matches_pydantic():
+    article = _article()
+    assert article.versions[0].metrics is not None
+    assert dumps(article) == article.model_dump_json().encode()
+    assert dumps(article.versions) == TypeAdapter(List[ArticleVersion]).dump_json(article.versions)
+
+
+def test_response_carries_json_and_headers():
+    article = _article()
+    response = FastJSONResponse([article], headers={"ETag": '"x"'})
+    assert response.headers["content-type"] == "application/json"
+    assert response.headers["etag"] == '"x"'
+    assert json.loads(response.body)[0]["status"] == "in_review"
@@ -0,0 +1,28 @@
+import pytest
+
+from services.sentence_segmenter import iter_paragraphs, segment
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("First one. Second one! Third?", ["First one.", "Second one!", "Third?"]),
+    ("See Fig. 3 for details. Results follow.", ["See Fig. 3 for details.", "Results follow."]),
+    ("Smith et al. Showed this, e.g. Large gains.", ["Smith et al. Showed this, e.g. Large gains."]),
+    ("J. Smith wrote it. It was 3.14 long.", ["J. Smith wrote it.", "It was 3.14 long."]),
+    ("Apples, pears, etc. Then more.", ["Apples, pears, etc.", "Then more."]),
+    ('He said "stop." Then left.', ['He said "stop."', "Then left."]),
+    ("A heading\n\nBody text", ["A heading", "Body text"]),
+    ("See doi.org/10.1000/x.y now.", ["See doi.org/10.1000/x.y now."]),
+])
+def test_sentence_boundaries(text, expected):
+    assert [s.text for s in segment(text)] == expected
+
+
+def test_offsets_are_exact():
+    text = "  One here.   Two there.\n\n Three. "
+    for span in segment(text):
+        assert text[span.start:span.end] == span.text
+
+
+def test_paragraphs_are_blank_line_separated():
+    text = "Para one.\nStill one.\n \nPara two.\n\n\n"
+    assert [p.text for p in iter_paragraphs(text)] == ["Para one.\nStill one.", "Para two."]
@@ -0,0 +1,42 @@
+import dataclasses
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from models.article import TemplateType
+from services.template_registry import RULES_CACHE_CONTROL, template_registry
+
+
+def test_every_template_type_is_loaded():
+    assert set(template_registry) == {t.value for t in TemplateType}
+    assert template_registry.get("ieee") is template_registry["IEEE"]
+    assert template_registry.get("Nope") is None
+    with pytest.raises(KeyError):
+        template_registry["Nope"]
+
+
+def test_specs_are_read_only():
+    spec = template_registry["IEEE"]
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        spec.name = "Other"
+    with pytest.raises(TypeError):
+        spec.data["template"] = "Other"
+    structure = spec.structure()
+    structure["sections"].append("Mutated")
+    assert "Mutated" not in template_registry["IEEE"].structure()["sections"]
+
+
+def test_rules_are_served_preserialized_with_etag():
+    client = TestClient(main.app)
+    spec = template_registry["ACM"]
+    response = client.get("/api/editor/templates/ACM/rules")
+    assert response.status_code == 200
+    assert response.content == spec.rules_json and json.loads(response.content) == [dict(r) for r in spec.rules]
+    assert response.headers["ETag"] == spec.rules_etag
+    assert response.headers["Cache-Control"] == RULES_CACHE_CONTROL
+
+    cached = client.get("/api/editor/templates/ACM/rules", headers={"If-None-Match": spec.rules_etag})
+    assert cached.status_code == 304
+    assert client.get("/api/editor/templates/Nope/rules").status_code == 404
@@ -0,0 +1,43 @@
+import pytest
+
+from services.text_diff import diff_lines, diff_words
+from services.text_ops import apply_operations, operations_from_patch
+
+
+def unified(diff):
+    out = []
+    for h in diff.hunks:
+        out.append(f"@@ -{h.old_start},{h.old_lines} +{h.new_start},{h.new_lines} @@")
+        out.extend(h.lines)
+    return "\n".join(out) + "\n"
+
+
+def test_pure_insertion_names_the_preceding_line():
+    hunk, = diff_lines("a\nb\nc\n", "a\nb\nx\nc\n", context=0).hunks
+    assert (hunk.old_start, hunk.old_lines, hunk.new_start, hunk.new_lines) == (2, 0, 3, 1)
+
+
+def test_pure_deletion_names_the_preceding_line():
+    hunk, = diff_lines("a\nb\nc\n", "a\nc\n", context=0).hunks
+    assert (hunk.old_start, hunk.old_lines, hunk.new_start, hunk.new_lines) == (2, 1, 1, 0)
+
+
+@pytest.mark.parametrize("old, new", [
+    ("a\nb\nc\n", "a\nb\nx\nc\n"),
+    ("a\nb\nc\n", "x\na\nb\nc\n"),
+    ("a\nb\nc\n", "a\nb\nc\nx\n"),
+    ("a\nb\nc\n", "a\nc\n"),
+    ("one\ntwo\nthree\nfour\nfive\nsix\nseven\neight\n", "one\nTWO\nthree\nfour\nfive\nsix\nseven\n8\nnine\n"),
+])
+@pytest.mark.parametrize("context", [0, 1, 3])
+def test_hunks_round_trip_through_patch(old, new, context):
+    diff = diff_lines(old, new, context)
+    assert apply_operations(old, operations_from_patch(old, unified(diff))) == new
+
+
+def test_word_changes_are_offsets_into_both_texts():
+    old, new = "The quick brown fox", "The slow brown fox jumps"
+    result = diff_words(old, new)
+    for change in result.changes:
+        assert old[change.old_offset:change.old_offset + len(change.old_text)] == change.old_text
+        assert new[change.new_offset:change.new_offset + len(change.new_text)] == change.new_text
@@ -0,0 +1,38 @@
+import pytest
+
+from models.article import TextMetrics
+from services.text_metrics import MetricsCache, compute_metrics, style_scores
+
+
+TEXT = "The model was trained on data. We evaluate it carefully. Results don't lie."
+
+
+def test_counts_and_ratios():
+    metrics = compute_metrics(TEXT)
+    assert metrics.word_count == 13 and metrics.sentence_count == 3
+    assert metrics.passive_ratio == pytest.approx(1 / 3, abs=1e-4)
+    assert metrics.contraction_ratio > 0
+    assert sum(metrics.sentence_length_histogram.values()) == 3
+    assert set(metrics.sentence_length_percentiles) == {"p25", "p50", "p75", "p90"}
+
+
+def test_empty_text_has_zero_metrics():
+    assert compute_metrics("   ") == TextMetrics()
+
+
+def test_batched_style_scores_match_scoring_each_segment_alone():
+    segments = ["We got lots of stuff done.", "The methodology was rigorously validated.", ""]
+    batched = style_scores(segments)
+    assert batched == [style_scores([s])[0] for s in segments]
+    assert batched[2] == (0.0, 0.0)
+    assert batched[1][0] > batched[0][0]
+
+
+def test_metrics_cache_is_bounded_lru():
+    cache = MetricsCache(max_entries=2)
+    for text in ("a", "b"):
+        cache.put(text, compute_metrics(text))
+    assert cache.get("a") is not None
+    cache.put("c", compute_metrics("c"))
+    assert cache.get("b") is None and cache.get("a") is not None
+    assert (cache.hits, cache.misses) == (2, 1)
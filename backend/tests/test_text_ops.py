@@ -0,0 +1,61 @@
+import pytest
+
+from models.article import EditOperation
+from services.text_ops import EditConflict, EditError, apply_operations, operations_from_patch, rebase
+
+
+def op(kind, position=0, length=0, text=""):
+    return EditOperation(op=kind, position=position, length=length, text=text)
+
+
+def test_operations_apply_in_order():
+    text = apply_operations("Hello world", [
+        op("replace", 6, 5, "there"),
+        op("insert", 0, text=">> "),
+        op("delete", 8, 1),
+    ])
+    assert text == ">> Hellothere"
+    assert apply_operations("anything", [op("set", text="new")]) == "new"
+
+
+@pytest.mark.parametrize("bad", [op("delete", 3, 10), op("insert", -1, text="x"), op("replace", 12, 0, "x")])
+def test_out_of_range_operations_raise(bad):
+    with pytest.raises(EditError):
+        apply_operations("Hello world", [bad])
+
+
+def test_max_chars_is_enforced():
+    with pytest.raises(EditError):
+        apply_operations("abc", [op("insert", 3, text="defg")], max_chars=5)
+
+
+def test_unified_patch_to_operations():
+    base = "alpha\nbeta\ngamma\n"
+    patch = "--- a\n+++ b\n@@ -2,1 +2,2 @@\n-beta\n+BETA\n+delta\n"
+    assert apply_operations(base, operations_from_patch(base, patch)) == "alpha\nBETA\ndelta\ngamma\n"
+
+
+def test_patch_without_trailing_newline():
+    base = "alpha\nbeta"
+    patch = "@@ -2 +2 @@\n-beta\n\\ No newline at end of file\n+BETA\n\\ No newline at end of file\n"
+    assert apply_operations(base, operations_from_patch(base, patch)) == "alpha\nBETA"
+
+
+@pytest.mark.parametrize("patch", ["no hunks here", "@@ -1,1 +1,1 @@\n-zeta\n+eta\n", "@@ -1 +1 @@\n?x\n"])
+def test_bad_patches_raise(patch):
+    with pytest.raises(EditError):
+        operations_from_patch("alpha\nbeta\n", patch)
+
+
+def test_rebase_merges_disjoint_edits():
+    base = "The cat sat on the mat."
+    current = "The black cat sat on the mat."
+    edited = "The cat sat on the rug."
+    merged, operations = rebase(base, current, edited)
+    assert merged == "The black cat sat on the rug."
+    assert apply_operations(current, operations) == merged
+
+
+def test_rebase_rejects_overlapping_edits():
+    with pytest.raises(EditConflict):
+        rebase("The cat sat.", "The dog sat.", "The bird sat.")
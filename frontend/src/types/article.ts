@@ -67,4 +67,6 @@ export interface ArticleUpdate {
   keywords?: string[];
   references?: string[];
   changes_summary?: string;
+  checkpoint?: boolean;
+  expected_version?: number;
 }